@@ -0,0 +1,98 @@
+"""Accuracy/speed trade-off of ScoringCfg.analysis_max_side.
+
+Scores the same sampled frames at full resolution and at each requested
+analysis size, and reports per-frame deviation from full resolution next to
+the speedup of the scoring stage (decode time is excluded; it does not depend
+on the analysis size).
+
+    python -m benchmarks.analysis_scale --video clip.mp4 --max_sides 960 640 320
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from itertools import islice
+
+import numpy as np
+
+from src.vdt_scoring.config import load_config
+from src.vdt_scoring.scoring.calibration import calibrate
+from src.vdt_scoring.scoring.features import FeatureEngine
+from src.vdt_scoring.scoring.heuristics import HEURISTICS, combine_scores
+from src.vdt_scoring.utils.video_io import read_frames
+
+METRICS = ("score", "edge", "blur", "motion")
+
+
+def score_video(video, cfg, max_side):
+    engine = FeatureEngine(HEURISTICS, max_side=max_side)
+    bs = max(1, cfg.scoring.batch_size)
+    frames = read_frames(video, cfg.sampler.every_nth, cfg.sampler.max_frames, cfg.sampler.mode, bs)
+    cols = {m: [] for m in METRICS}
+    seconds = 0.0
+    while True:
+        batch = [f for _, f in islice(frames, bs)]
+        if not batch:
+            break
+        t0 = time.perf_counter()
+        _, values = engine.process_batch(batch)
+        score = calibrate(combine_scores(values["edge"], values["motion"], values["blur"], cfg.scoring))
+        seconds += time.perf_counter() - t0
+        for m in METRICS[1:]:
+            cols[m].append(values[m])
+        cols["score"].append(score)
+    return {m: np.concatenate(v) if v else np.empty(0) for m, v in cols.items()}, seconds
+
+
+def deviation(ref, other):
+    out = {}
+    for m in METRICS:
+        d = np.abs(other[m] - ref[m])
+        out[m] = {
+            "mean_abs_dev": float(d.mean()) if d.size else 0.0,
+            "max_abs_dev": float(d.max()) if d.size else 0.0,
+        }
+    if ref["score"].size > 1 and ref["score"].std() > 0 and other["score"].std() > 0:
+        out["score"]["pearson_r"] = float(np.corrcoef(ref["score"], other["score"])[0, 1])
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare reduced-resolution scoring against full resolution.")
+    ap.add_argument("--video", default=None, help="Input video (default: synthetic 1080p clip)")
+    ap.add_argument("--config", default="configs/default.yaml")
+    ap.add_argument("--max_sides", type=int, nargs="+", default=[1280, 960, 640, 480, 320])
+    ap.add_argument("--out", default=None, help="Optional JSON output path")
+    args = ap.parse_args()
+
+    cfg = load_config(args.config if os.path.exists(args.config) else None)
+    video = args.video
+    if video is None:
+        from examples.make_synthetic_video import write_synthetic_video
+
+        video = write_synthetic_video(
+            os.path.join(tempfile.mkdtemp(), "scale_1080p.mp4"), frames=240, w=1920, h=1080
+        )
+
+    ref, ref_s = score_video(video, cfg, 0)
+    rows = [{"analysis_max_side": 0, "scoring_seconds": round(ref_s, 4), "speedup": 1.0}]
+    for side in args.max_sides:
+        vals, secs = score_video(video, cfg, side)
+        rows.append({
+            "analysis_max_side": side,
+            "scoring_seconds": round(secs, 4),
+            "speedup": round(ref_s / secs, 2) if secs > 0 else None,
+            "deviation": deviation(ref, vals),
+        })
+
+    report = {"video": video, "frames": int(ref["score"].size), "results": rows}
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Decode throughput of each read_frames sampling strategy.
+
+Run from the repo root:
+    python -m benchmarks.bench_read_frames --video path.mp4 --every_nth 5 10 30
+Without --video a synthetic 1080p clip is generated in a temp directory.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from src.vdt_scoring.utils.video_io import READ_MODES, read_frames
+
+
+def bench_mode(video: str, every_nth: int, mode: str, max_frames: int) -> dict:
+    t0 = time.perf_counter()
+    n = 0
+    last = -1
+    for idx, _ in read_frames(video, every_nth, max_frames, mode):
+        n += 1
+        last = idx
+    dt = time.perf_counter() - t0
+    return {
+        "mode": mode,
+        "every_nth": every_nth,
+        "frames_yielded": n,
+        "last_index": last,
+        "seconds": round(dt, 4),
+        "frames_per_s": round(n / dt, 2) if dt > 0 else None,
+        # source frames covered per second of wall time
+        "source_frames_per_s": round((last + 1) / dt, 2) if dt > 0 else None,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark read_frames sampling strategies.")
+    ap.add_argument("--video", default=None, help="Input video (default: synthetic 1080p clip)")
+    ap.add_argument("--every_nth", type=int, nargs="+", default=[1, 5, 30])
+    ap.add_argument("--modes", nargs="+", default=list(READ_MODES), choices=READ_MODES)
+    ap.add_argument("--max_frames", type=int, default=10**9)
+    ap.add_argument("--out", default=None, help="Optional JSON output path")
+    args = ap.parse_args()
+
+    video = args.video
+    if video is None:
+        from examples.make_synthetic_video import write_synthetic_video
+
+        video = write_synthetic_video(
+            os.path.join(tempfile.mkdtemp(), "bench_1080p.mp4"), frames=300, w=1920, h=1080
+        )
+
+    rows = []
+    for every_nth in args.every_nth:
+        for mode in args.modes:
+            try:
+                rows.append(bench_mode(video, every_nth, mode, args.max_frames))
+            except ImportError as e:
+                rows.append({"mode": mode, "every_nth": every_nth, "skipped": str(e)})
+
+    report = {"video": video, "results": rows}
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
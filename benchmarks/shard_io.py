@@ -0,0 +1,111 @@
+"""Samples/s of loose JPEG + label files vs packed tar shards.
+
+Run from the repo root:
+    python -m benchmarks.shard_io --samples 20000 --decode
+Builds a synthetic unified/train split (224x224 JPEGs with .txt labels) in a
+temp directory unless --unified is given, packs it, then reads every sample
+in random order and by streaming. With --drop_caches (root, Linux) the page
+cache is dropped before each case so reads hit the disk.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from src.vdt_scoring.pipeline.shards import ShardDataset, decode_image, pack_split, samples_from_unified
+
+
+def make_unified(root, n, size=224):
+    img_dir = os.path.join(root, "train", "images")
+    lbl_dir = os.path.join(root, "train", "labels")
+    os.makedirs(img_dir, exist_ok=True)
+    os.makedirs(lbl_dir, exist_ok=True)
+    rng = np.random.default_rng(0)
+    base = cv2.resize(rng.integers(0, 255, (28, 28, 3), dtype=np.uint8), (size, size))
+    for i in range(n):
+        name = f"video{i // 100:04d}__frame_{i % 100:05d}"
+        cv2.imwrite(os.path.join(img_dir, name + ".jpg"), np.roll(base, i, axis=1), [cv2.IMWRITE_JPEG_QUALITY, 90])
+        with open(os.path.join(lbl_dir, name + ".txt"), "w") as f:
+            f.write(str(i % 2))
+
+
+def drop_caches():
+    subprocess.run("sync; echo 3 > /proc/sys/vm/drop_caches", shell=True, check=False,
+                   stderr=subprocess.DEVNULL)
+
+
+def timed(name, it, decode):
+    t0 = time.perf_counter()
+    n = 0
+    for data, _ in it:
+        if decode and not isinstance(data, np.ndarray):
+            decode_image(data)
+        n += 1
+    dt = time.perf_counter() - t0
+    return {"case": name, "samples": n, "seconds": round(dt, 4), "samples_per_s": round(n / dt, 1) if dt > 0 else None}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark loose files vs packed shards.")
+    ap.add_argument("--unified", default=None, help="Existing unified dataset root (default: synthetic)")
+    ap.add_argument("--samples", type=int, default=20000)
+    ap.add_argument("--workers", type=int, default=4, help="Reader threads for parallel_stream")
+    ap.add_argument("--decode", action="store_true", help="Also decode each image")
+    ap.add_argument("--drop_caches", action="store_true")
+    ap.add_argument("--out", default=None, help="Optional JSON output path")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    unified = args.unified
+    if unified is None:
+        unified = os.path.join(tmp, "unified")
+        make_unified(unified, args.samples)
+    samples = samples_from_unified(unified, "train")
+    t0 = time.perf_counter()
+    info = pack_split(samples, os.path.join(tmp, "packed"), "train")
+    pack_s = time.perf_counter() - t0
+    ds = ShardDataset(os.path.join(tmp, "packed"), "train")
+    order = list(range(len(samples)))
+    random.Random(0).shuffle(order)
+
+    def loose(ids):
+        img_dir = os.path.join(unified, "train", "images")
+        lbl_dir = os.path.join(unified, "train", "labels")
+        for i in ids:
+            name = samples[i][0]
+            with open(os.path.join(img_dir, name), "rb") as f:
+                data = f.read()
+            with open(os.path.join(lbl_dir, os.path.splitext(name)[0] + ".txt")) as f:
+                label = int(f.read())
+            yield data, label
+
+    cases = [
+        ("loose_random", lambda: loose(order)),
+        ("loose_listdir_order", lambda: loose(range(len(samples)))),
+        ("shard_random", lambda: (ds[i] for i in order)),
+        ("shard_stream_shuffled", lambda: ds.stream(shuffle=True, buffer_size=1024)),
+        (f"shard_parallel_{args.workers}", lambda: ds.parallel_stream(args.workers, shuffle=True)),
+    ]
+    rows = []
+    for name, make in cases:
+        if args.drop_caches:
+            drop_caches()
+        rows.append(timed(name, make(), args.decode))
+
+    report = {"samples": len(samples), "decode": args.decode, "drop_caches": args.drop_caches,
+              "pack_seconds": round(pack_s, 3), "shards": len(info["shards"]), "results": rows}
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
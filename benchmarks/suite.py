@@ -0,0 +1,205 @@
+"""End-to-end throughput benchmark for infer_video on synthetic videos.
+
+Run a matrix of resolutions x lengths x codecs x config variants; each case
+runs in a fresh interpreter so peak RSS is per case:
+
+    python -m benchmarks.suite run --resolutions 240p 1080p --frames 240 --out bench.json
+
+Compare two reports and fail (exit 1) on regressions beyond a threshold:
+
+    python -m benchmarks.suite compare base.json bench.json --threshold 0.10
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+RESOLUTIONS = {
+    "240p": (320, 240),
+    "480p": (854, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "2160p": (3840, 2160),
+}
+
+# Named config overrides ("section.field": value) applied on top of the default config.
+VARIANTS = {
+    "default": {},
+    "no_heatmaps": {"output.save_heatmaps": False},
+    "read_all": {"sampler.mode": "read", "output.save_heatmaps": False},
+    "seek_30": {"sampler.mode": "seek", "sampler.every_nth": 30, "output.save_heatmaps": False},
+    "jsonl": {"output.format": "jsonl", "output.save_heatmaps": False},
+    "pipelined": {"runtime.pipelined": True},
+    "anonymized": {"output.anonymize_heatmaps": True},
+    "analysis_640": {"scoring.analysis_max_side": 640, "output.save_heatmaps": False},
+}
+
+# metric -> True when higher is better
+METRICS = {"frames_per_s": True, "total_s": False, "peak_rss_mb": False, "output_bytes": False}
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return kb / 1024.0 if sys.platform != "darwin" else kb / 2**20
+    except ImportError:  # Windows
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset / 2**20
+
+
+def _dir_bytes(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+
+def run_case(spec: dict) -> dict:
+    """Executed in the child interpreter."""
+    from src.vdt_scoring.config import load_config
+    from src.vdt_scoring.pipeline.infer import infer_video
+
+    cfg = load_config(spec["config"])
+    for key, value in spec["overrides"].items():
+        section, field = key.split(".")
+        setattr(getattr(cfg, section), field, value)
+
+    out_dir = tempfile.mkdtemp(prefix="vdt_bench_")
+    t0 = time.perf_counter()
+    results = infer_video(spec["video"], out_dir, cfg)
+    total_s = time.perf_counter() - t0
+
+    n = results["summary"]["frames_evaluated"]
+    stages = results["summary"]["performance"]["stages"]
+    return {
+        "frames": n,
+        "total_s": round(total_s, 4),
+        "frames_per_s": round(n / total_s, 2) if total_s > 0 else None,
+        "stages": {f"{name}_s": st["seconds"] for name, st in stages.items()},
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "output_bytes": _dir_bytes(out_dir),
+    }
+
+
+def _video_for(video_dir: str, res: str, frames: int, codec: str) -> str:
+    from examples.make_synthetic_video import CODECS, write_synthetic_video
+
+    w, h = RESOLUTIONS[res]
+    path = os.path.join(video_dir, f"synthetic_{res}_{frames}f_{codec}{CODECS[codec]}")
+    if not os.path.exists(path):
+        write_synthetic_video(path, frames=frames, w=w, h=h, codec=codec)
+    return path
+
+
+def cmd_run(args) -> int:
+    video_dir = args.video_dir or tempfile.mkdtemp(prefix="vdt_bench_videos_")
+    os.makedirs(video_dir, exist_ok=True)
+    cases = []
+    for res in args.resolutions:
+        for frames in args.frames:
+            for codec in args.codecs:
+                video = _video_for(video_dir, res, frames, codec)
+                for variant in args.variants:
+                    overrides = copy.deepcopy(VARIANTS[variant])
+                    overrides.setdefault("sampler.max_frames", frames)
+                    spec = {"video": video, "config": args.config, "overrides": overrides}
+                    case_id = f"{res}/{frames}f/{codec}/{variant}"
+                    print(f"[bench] {case_id}", file=sys.stderr)
+                    proc = subprocess.run(
+                        [sys.executable, "-m", "benchmarks.suite", "_case", json.dumps(spec)],
+                        capture_output=True, text=True,
+                    )
+                    if proc.returncode != 0:
+                        cases.append({"id": case_id, "error": proc.stderr.strip().splitlines()[-1:]})
+                        continue
+                    result = json.loads(proc.stdout.strip().splitlines()[-1])
+                    cases.append({"id": case_id, "resolution": res, "length": frames, "codec": codec,
+                                  "variant": variant, **result})
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "cases": cases,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+def compare(base: dict, new: dict, threshold: float) -> dict:
+    """Relative change per shared case and metric; regressions are changes for the worse beyond threshold."""
+    base_cases = {c["id"]: c for c in base["cases"] if "error" not in c}
+    rows, regressions = [], []
+    for case in new["cases"]:
+        old = base_cases.get(case["id"])
+        if old is None or "error" in case:
+            continue
+        for metric, higher_better in METRICS.items():
+            a, b = old.get(metric), case.get(metric)
+            if not a or b is None:
+                continue
+            change = (b - a) / a
+            worse = -change if higher_better else change
+            row = {"id": case["id"], "metric": metric, "base": a, "new": b, "change": round(change, 4)}
+            rows.append(row)
+            if worse > threshold:
+                regressions.append(row)
+    return {"threshold": threshold, "compared": rows, "regressions": regressions}
+
+
+def cmd_compare(args) -> int:
+    with open(args.base, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    result = compare(base, new, args.threshold)
+    print(json.dumps(result, indent=2))
+    for r in result["regressions"]:
+        print(f"REGRESSION {r['id']} {r['metric']}: {r['base']} -> {r['new']} ({r['change']:+.1%})",
+              file=sys.stderr)
+    return 1 if result["regressions"] else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="VDT performance benchmark suite.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="Run the benchmark matrix")
+    run.add_argument("--resolutions", nargs="+", default=["240p", "720p", "1080p"], choices=list(RESOLUTIONS))
+    run.add_argument("--frames", type=int, nargs="+", default=[240], help="Video lengths in frames")
+    run.add_argument("--codecs", nargs="+", default=["mp4v"])
+    run.add_argument("--variants", nargs="+", default=["default", "no_heatmaps", "jsonl"], choices=list(VARIANTS))
+    run.add_argument("--config", default="configs/default.yaml")
+    run.add_argument("--video_dir", default=None, help="Where synthetic videos are generated and reused")
+    run.add_argument("--out", default=None, help="JSON report path")
+
+    cmp_ = sub.add_parser("compare", help="Compare two reports and flag regressions")
+    cmp_.add_argument("base")
+    cmp_.add_argument("new")
+    cmp_.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as regression")
+
+    case = sub.add_parser("_case")  # internal: one case in a fresh interpreter
+    case.add_argument("spec")
+
+    args = ap.parse_args()
+    if args.cmd == "_case":
+        print(json.dumps(run_case(json.loads(args.spec))))
+        return 0
+    return cmd_run(args) if args.cmd == "run" else cmd_compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
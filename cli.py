@@ -1,28 +1,134 @@
-import argparse, os, json
-from src.vdt_scoring.config import load_config
-from src.vdt_scoring.pipeline.infer import infer_video
-from jsonschema import validate
-import jsonschema
-
-def main():
-    parser = argparse.ArgumentParser(description="Video Trustworthiness Scoring (baseline)")
-    parser.add_argument("--video", required=True, help="Path to input video")
-    parser.add_argument("--out", required=True, help="Output directory")
-    parser.add_argument("--config", default="configs/default.yaml", help="YAML config path")
-    args = parser.parse_args()
-
-    cfg = load_config(args.config if os.path.exists(args.config) else None)
-    results = infer_video(args.video, args.out, cfg)
-
-    # Validate output against schema
-    with open("src/vdt_scoring/schemas/results_schema.json", "r", encoding="utf-8") as f:
-        schema = json.load(f)
-    try:
-        validate(instance=results, schema=schema)
-    except jsonschema.ValidationError as e:
-        print("WARNING: Results schema validation failed:", e)
+"""`vdt` command line entry point.
+
+Only the standard library is imported at module level; each subcommand
+imports what it needs when it runs, so `vdt --help` and argument errors stay
+fast. `python cli.py --video ... --out ...` (no subcommand) still works.
+"""
+import argparse
+import importlib
+import os
+import sys
+
+# Subcommands forwarded to a script's main(argv); the script parses its own arguments.
+SCRIPT_COMMANDS = {
+    "extract": ("scripts.extract_frames", "Extract frames from a directory of videos"),
+    "tamper": ("scripts.randomized_tamper_variants", "Generate randomized tampered variants"),
+    "label": ("scripts.auto_label_tampered_videos", "Auto-label videos with an object detector"),
+    "annotate": ("scripts.auto_annotate", "Auto-annotate frame folders with a pretrained CNN"),
+    "trust": ("scripts.real_trustworthiness_inference", "ResNet + CLIP + FFT trustworthiness metadata for frame folders"),
+    "merge": ("scripts.merge_dataset_for_training", "Merge authentic/tampered frames into train/val/test"),
+    "pack": ("scripts.pack_dataset", "Pack a dataset into tar shards for training"),
+}
+
+
+def _load_cfg(args):
+    from src.vdt_scoring.config import load_config
+
+    return load_config(args.config if os.path.exists(args.config) else None)
+
+
+def run_score(args):
+    cfg = _load_cfg(args)
+    if args.cache:
+        cfg.runtime.cache_dir = args.cache
+    if args.profile:
+        cfg.runtime.profile_path = args.profile
+    if cfg.runtime.cache_dir:
+        from src.vdt_scoring.pipeline.cache import open_cache, score_with_cache
+
+        cache = open_cache(cfg.runtime.cache_dir, cfg.runtime.cache_size_mb << 20)
+        results, hit = score_with_cache(args.video, args.out, cfg, cache)
+        stats = cache.stats()
+        print(f"Cache {'hit' if hit else 'miss'} ({stats['hits']} hits / {stats['misses']} misses, "
+              f"{stats['entries']} entries, {stats['bytes'] / 2**20:.1f} MiB)")
+    else:
+        from src.vdt_scoring.pipeline.infer import infer_video
+
+        results = infer_video(args.video, args.out, cfg)
+
+    # Records and summary are validated while the results are written (runtime.validation)
+    for err in results["summary"].get("validation", {}).get("errors", []):
+        print("WARNING: Results schema validation failed:", err)
 
     print(f"Done. Results saved to {os.path.join(args.out, 'results.json')}")
 
+
+def run_batch_mode(args):
+    from src.vdt_scoring.pipeline.batch import collect_videos, run_batch
+
+    videos = collect_videos(args.batch)
+    if not videos:
+        raise SystemExit(f"No videos found for: {args.batch}")
+    config = args.config if os.path.exists(args.config) else None
+    index = run_batch(videos, args.out, config, args.workers, args.cache)
+    print(f"Scored {index['videos']} videos ({index['failed']} failed, {index['cache_hits']} cached) "
+          f"in {index['seconds']:.1f}s - {index['videos_per_s']} videos/s, {index['frames_per_s']} frames/s")
+    print(f"Index saved to {os.path.join(args.out, 'index.json')}")
+
+
+def run_train(args):
+    from src.vdt_scoring.pipeline.train import train_from_unified
+
+    metrics = train_from_unified(args.unified, args.out, args.feature_store, args.epochs, args.batch_size, args.lr, args.seed)
+    test = metrics["test"]
+    print(f"Features for {sum(metrics['samples'].values())} frames in {metrics['feature_seconds']:.1f}s; "
+          f"{len(metrics['history'])} epochs at {metrics['epoch_seconds']:.2f}s each, best epoch {metrics['best_epoch']}")
+    print(f"Test loss {test['loss']}, accuracy {test['accuracy']}")
+    print(f"Trust head saved to {args.out}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="vdt", description="Video Trustworthiness Scoring (baseline)")
+    sub = parser.add_subparsers(dest="command", metavar="command")
+
+    score = sub.add_parser("score", help="Score one video")
+    score.add_argument("--video", required=True, help="Path to input video")
+    score.add_argument("--profile", default=None, help="Write a cProfile dump of the run to this path")
+    score.set_defaults(func=run_score)
+
+    batch = sub.add_parser("batch", help="Score many videos with a process pool")
+    batch.add_argument("--batch", required=True, help="Directory, glob pattern or manifest file (one video per line)")
+    batch.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                       help="Worker processes (default: CPU count)")
+    batch.set_defaults(func=run_batch_mode)
+
+    train = sub.add_parser("train", help="Train the trust head on cached ResNet-18 features")
+    train.add_argument("--unified", required=True, help="merge output root with train/val/test splits")
+    train.add_argument("--out", required=True, help="Checkpoint path (.pt)")
+    train.add_argument("--feature_store", "--cache", default=None,
+                       help="Feature store root, the same directory as --feature_store of `vdt trust` "
+                            "(default: <unified>/.features)")
+    train.add_argument("--epochs", type=int, default=30)
+    train.add_argument("--batch_size", type=int, default=256)
+    train.add_argument("--lr", type=float, default=1e-3)
+    train.add_argument("--seed", type=int, default=0)
+    train.set_defaults(func=run_train)
+
+    for p in (score, batch):
+        p.add_argument("--out", required=True, help="Output directory")
+        p.add_argument("--config", default="configs/default.yaml", help="YAML config path")
+        p.add_argument("--cache", default=None, help="Result cache directory (overrides runtime.cache_dir)")
+
+    for name, (_, help_text) in SCRIPT_COMMANDS.items():
+        sub.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0].startswith("-") and argv[0] not in ("-h", "--help"):
+        # Pre-subcommand usage: cli.py --video ... / cli.py --batch ...
+        argv.insert(0, "batch" if "--batch" in argv else "score")
+    if argv and argv[0] in SCRIPT_COMMANDS:
+        module = importlib.import_module(SCRIPT_COMMANDS[argv[0]][0])
+        return module.main(argv[1:], prog=f"vdt {argv[0]}")
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    return args.func(args)
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
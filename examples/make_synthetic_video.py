@@ -2,30 +2,45 @@ import cv2
 import numpy as np
 import argparse
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--out", required=True)
-    ap.add_argument("--frames", type=int, default=120)
-    args = ap.parse_args()
+# Codec -> container extension that OpenCV's FFmpeg writer accepts for it.
+CODECS = {"mp4v": ".mp4", "MJPG": ".avi", "XVID": ".avi"}
 
-    w, h = 320, 240
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(args.out, fourcc, 24.0, (w, h))
+def write_synthetic_video(path: str, frames: int = 120, w: int = 320, h: int = 240, fps: float = 24.0,
+                          codec: str = "mp4v") -> str:
+    s = w / 320.0  # geometry below was laid out for 320x240
+    fourcc = cv2.VideoWriter_fourcc(*codec)
+    out = cv2.VideoWriter(path, fourcc, fps, (w, h))
+    if not out.isOpened():
+        raise RuntimeError(f"Cannot write {path} with codec {codec}")
 
-    pos = 10
-    for i in range(args.frames):
+    size = int(40 * s)
+    top = int(100 * h / 240.0)
+    pos = int(10 * s)
+    for i in range(frames):
         frame = np.zeros((h, w, 3), dtype=np.uint8)
         # moving square
-        cv2.rectangle(frame, (pos, 100), (pos+40, 140), (0, 255, 0), -1)
-        pos = (pos + 3) % (w - 40)
+        cv2.rectangle(frame, (pos, top), (pos+size, top+size), (0, 255, 0), -1)
+        pos = (pos + int(3 * s)) % (w - size)
         # inject a blur/compression-like region occasionally
         if 40 < i < 60:
             frame = cv2.GaussianBlur(frame, (15, 15), 10)
         # inject a sudden jump (temporal inconsistency)
         if i == 80:
-            pos = 200
+            pos = int(200 * s)
         out.write(frame)
     out.release()
+    return path
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--frames", type=int, default=120)
+    ap.add_argument("--width", type=int, default=320)
+    ap.add_argument("--height", type=int, default=240)
+    ap.add_argument("--codec", default="mp4v", choices=sorted(CODECS))
+    args = ap.parse_args()
+
+    write_synthetic_video(args.out, args.frames, args.width, args.height, codec=args.codec)
     print(f"Wrote {args.out}")
 
 if __name__ == "__main__":
@@ -1,81 +1,216 @@
-import torch
-import torch.nn as nn
-from torchvision import models, transforms
-from PIL import Image
-import os, json
+# torch/torchvision are imported inside the functions that need them, so the
+# module (and `vdt annotate --help`) loads without them.
+import os, json, time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from tqdm import tqdm
 
+IMAGE_SIZE = 224
+EMBED_DIM = 512  # ResNet-18 pooled features
+MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
 # Load pretrained model
-def load_model():
+def load_model(threads=None):
+    import torch
+    import torch.nn as nn
+    from torchvision import models
+
+    if threads:
+        torch.set_num_threads(threads)  # intra-op threads; decoding has its own pool
     model = models.resnet18(pretrained=True)
     model.fc = nn.Identity()  # use embeddings only
     model.eval()
-    return model
+    return model.to(memory_format=torch.channels_last)
 
 # Image preprocessing
-transform = transforms.Compose([
-    transforms.Resize((224, 224)),
-    transforms.ToTensor(),
-    transforms.Normalize(mean=[0.485, 0.456, 0.406],
-                         std=[0.229, 0.224, 0.225])
-])
-
-def compute_score(embedding):
+def load_image(path, size=IMAGE_SIZE, draft=False):
+    """Decode and normalize one frame to a (size, size, 3) float32 array.
+
+    Bilinear resize to size x size, then ImageNet mean/std, in HWC order.
+    With `draft`, JPEG decoding is scaled down (PIL draft) when the frame is
+    at least twice the target size: faster, but the pixels (and so the
+    scores) shift slightly.
+    """
+    from PIL import Image
+
+    with Image.open(path) as image:
+        if draft:
+            image.draft("RGB", (size, size))
+        image = image.convert("RGB").resize((size, size), Image.BILINEAR)
+        arr = np.asarray(image, dtype=np.float32)
+    arr *= 1.0 / 255.0
+    arr -= MEAN
+    arr /= STD
+    return arr
+
+def _load_batch(paths, size, draft=False):
+    batch = np.empty((len(paths), size, size, 3), dtype=np.float32)
+    for i, path in enumerate(paths):
+        batch[i] = load_image(path, size, draft)
+    return batch
+
+def iter_batches(paths, batch_size=32, workers=2, prefetch=2, size=IMAGE_SIZE, draft=False):
+    """Yield (paths, NHWC float32 batch) in order, decoded by a thread pool.
+
+    Like a DataLoader with `workers` workers: each worker builds whole
+    batches, and at most `prefetch` batches per worker are decoded ahead of
+    the consumer.
     """
-    Converts an embedding into a trustworthiness score.
+    chunks = [paths[i:i + batch_size] for i in range(0, len(paths), max(1, batch_size))]
+    if workers <= 0:
+        for chunk in chunks:
+            yield chunk, _load_batch(chunk, size, draft)
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vdt-annotate") as pool:
+        pending = deque()
+        todo = iter(chunks)
+        for chunk in todo:
+            pending.append((chunk, pool.submit(_load_batch, chunk, size, draft)))
+            if len(pending) >= workers * max(1, prefetch):
+                break
+        while pending:
+            chunk, future = pending.popleft()
+            for nxt in todo:
+                pending.append((nxt, pool.submit(_load_batch, nxt, size, draft)))
+                break
+            yield chunk, future.result()
+
+def compute_scores(embeddings):
+    """
+    Converts each row of a batch of embeddings into a trustworthiness score.
     (In real pipeline, this would be learned; here we use embedding smoothness.)
     """
-    variance = torch.var(embedding)
-    return max(0.0, min(1.0, 1.0 - variance.item() * 50))  # heuristic scaling
-
-def auto_annotate(video_folder, output_json):
-    model = load_model()
-    annotations = []
-
-    frames = sorted([f for f in os.listdir(video_folder) if f.endswith('.jpg')])
-    print(f"\nAuto-annotating {len(frames)} frames in {os.path.basename(video_folder)}...")
-
-    for frame_name in tqdm(frames):
-        frame_path = os.path.join(video_folder, frame_name)
-        image = Image.open(frame_path).convert("RGB")
-        img_t = transform(image).unsqueeze(0)
-
-        with torch.no_grad():
-            embedding = model(img_t)
-            score = compute_score(embedding)
-
-        # Decide ethical flags from trustworthiness score
-        flags = {
-            "manipulated": score < 0.5,
-            "cropped": False,
-            "context_loss": score < 0.6,
-            "bias_detected": False
-        }
+    import torch
+
+    variance = torch.var(embeddings, dim=1)
+    return (1.0 - variance * 50).clamp(0.0, 1.0).tolist()  # heuristic scaling
 
-        annotations.append({
-            "frame_id": frame_name,
-            "trustworthiness_score": round(score, 3),
-            "ethical_flags": flags,
-            "notes": "Auto-generated using ResNet-18 heuristic"
-        })
-
-    result = {
-        "video_id": os.path.basename(video_folder),
-        "source": "auto_annotation_resnet18",
-        "total_frames": len(annotations),
-        "annotations": annotations
+def list_frames(video_folder):
+    return sorted([f for f in os.listdir(video_folder) if f.endswith('.jpg')])
+
+def build_annotation(frame_name, score):
+    # Decide ethical flags from trustworthiness score
+    flags = {
+        "manipulated": score < 0.5,
+        "cropped": False,
+        "context_loss": score < 0.6,
+        "bias_detected": False
+    }
+    return {
+        "frame_id": frame_name,
+        "trustworthiness_score": round(score, 3),
+        "ethical_flags": flags,
+        "notes": "Auto-generated using ResNet-18 heuristic"
     }
 
-    with open(output_json, "w") as f:
-        json.dump(result, f, indent=4)
+class Annotator:
+    """Loads the model once and annotates any number of frame folders.
 
-    print(f"\n✅ Auto-annotations saved → {output_json}")
+    With `feature_store` (a directory), embeddings are kept in an
+    EmbeddingStore and only frames that are new or changed are encoded.
+    `fast_decode` decodes JPEGs at reduced scale (see load_image).
+    """
 
-if __name__ == "__main__":
+    def __init__(self, batch_size=32, workers=2, threads=None, model=None, feature_store=None, fast_decode=False):
+        self.batch_size = batch_size
+        self.workers = workers
+        self.fast_decode = fast_decode
+        self.model = model if model is not None else load_model(threads)
+        self.store = None
+        if feature_store:
+            from src.vdt_scoring.pipeline.embeddings import EmbeddingStore
+
+            # Draft decoding changes the embeddings, so it gets its own store
+            model = "resnet18-imagenet-pool" + ("-draft" if fast_decode else "")
+            self.store = EmbeddingStore(feature_store, EMBED_DIM, model=model)
+
+    def embed(self, paths):
+        import torch
+
+        out = np.empty((len(paths), EMBED_DIM), dtype=np.float32)
+        done = 0
+        with torch.inference_mode():
+            for chunk, batch in iter_batches(paths, self.batch_size, self.workers, draft=self.fast_decode):
+                # NHWC -> NCHW view: already channels_last, no copy
+                x = torch.from_numpy(batch).permute(0, 3, 1, 2)
+                out[done:done + len(chunk)] = self.model(x).numpy()
+                done += len(chunk)
+        return out
+
+    def scores(self, paths):
+        import torch
+
+        embeddings = self.store.ensure(paths, self.embed) if self.store else self.embed(paths)
+        return compute_scores(torch.from_numpy(embeddings.astype(np.float32, copy=False)))
+
+    def annotate(self, video_folder, output_json):
+        frames = list_frames(video_folder)
+        print(f"\nAuto-annotating {len(frames)} frames in {os.path.basename(video_folder)}...")
+        t0 = time.perf_counter()
+        scores = self.scores([os.path.join(video_folder, f) for f in frames])
+        seconds = time.perf_counter() - t0
+        annotations = [build_annotation(name, score) for name, score in zip(frames, scores)]
+
+        result = {
+            "video_id": os.path.basename(video_folder),
+            "source": "auto_annotation_resnet18",
+            "total_frames": len(annotations),
+            "annotations": annotations
+        }
+
+        with open(output_json, "w") as f:
+            json.dump(result, f, indent=4)
+
+        rate = len(frames) / seconds if seconds > 0 else 0.0
+        print(f"\n✅ Auto-annotations saved → {output_json} ({rate:.1f} images/s)")
+        return {"frames": len(frames), "seconds": seconds, "images_per_s": rate}
+
+def auto_annotate(video_folder, output_json, batch_size=32, workers=2, threads=None, feature_store=None,
+                  fast_decode=False):
+    annotator = Annotator(batch_size, workers, threads, feature_store=feature_store, fast_decode=fast_decode)
+    return annotator.annotate(video_folder, output_json)
+
+def annotate_folders(video_folders, output_dir, batch_size=32, workers=2, threads=None, feature_store=None,
+                     fast_decode=False):
+    """Annotate each folder to output_dir/<folder name>.json with one model."""
+    os.makedirs(output_dir, exist_ok=True)
+    annotator = Annotator(batch_size, workers, threads, feature_store=feature_store, fast_decode=fast_decode)
+    frames, seconds = 0, 0.0
+    for folder in tqdm(video_folders, desc="Folders"):
+        name = os.path.basename(os.path.normpath(folder))
+        stats = annotator.annotate(folder, os.path.join(output_dir, f"{name}.json"))
+        frames += stats["frames"]
+        seconds += stats["seconds"]
+    rate = frames / seconds if seconds > 0 else 0.0
+    print(f"\nAnnotated {frames} frames in {len(video_folders)} folders ({rate:.1f} images/s)")
+    return {"folders": len(video_folders), "frames": frames, "seconds": seconds, "images_per_s": rate}
+
+def main(argv=None, prog=None):
     import argparse
-    parser = argparse.ArgumentParser(description="Automatic ethical annotation using pretrained CNN.")
-    parser.add_argument("--video_folder", required=True, help="Folder path containing frames.")
-    parser.add_argument("--output_json", required=True, help="Output JSON file path.")
-    args = parser.parse_args()
+    parser = argparse.ArgumentParser(prog=prog, description="Automatic ethical annotation using pretrained CNN.")
+    parser.add_argument("--video_folder", required=True, nargs="+", help="Folder path(s) containing frames.")
+    parser.add_argument("--output_json", help="Output JSON file path (one folder).")
+    parser.add_argument("--output_dir", help="Output directory for <folder name>.json files (any number of folders).")
+    parser.add_argument("--batch_size", type=int, default=32, help="Frames per forward pass (default: 32).")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Decoding threads; 0 decodes on the main thread.")
+    parser.add_argument("--threads", type=int, default=None, help="Torch intra-op threads (default: torch's).")
+    parser.add_argument("--feature_store", default=None,
+                        help="Embedding store directory; only new or changed frames are encoded.")
+    parser.add_argument("--fast_decode", action="store_true",
+                        help="Decode large JPEGs at reduced scale; faster, scores shift slightly.")
+    args = parser.parse_args(argv)
+
+    if args.output_dir:
+        annotate_folders(args.video_folder, args.output_dir, args.batch_size, args.workers, args.threads,
+                         args.feature_store, args.fast_decode)
+    elif args.output_json and len(args.video_folder) == 1:
+        auto_annotate(args.video_folder[0], args.output_json, args.batch_size, args.workers, args.threads,
+                      args.feature_store, args.fast_decode)
+    else:
+        parser.error("use --output_json with one --video_folder, or --output_dir")
 
-    auto_annotate(args.video_folder, args.output_json)
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,188 @@
-from ultralytics import YOLO
+"""Auto-label videos with an object detector: sampled frames plus one label file per video.
+
+    vdt label --video_folder tampered_videos --output_folder auto_labels --stride 5
+    python -m scripts.auto_label_tampered_videos --video_folder tampered_videos --model dummy
+
+For each video, <output_folder>/<video>/labels.jsonl holds one line per
+sampled frame, {"frame": "frame_00005.jpg", "index": 5, "boxes": [[cls,
+x_center, y_center, w, h], ...]}, with box values in YOLO order and
+normalized to the frame. Images go to <output_folder>/<video>/images/,
+written by a background thread, and frames already on disk are not
+rewritten. ultralytics is only imported when a YOLO model is used.
+"""
 import cv2
 import os
+import json
+import queue
+import threading
+import time
+import numpy as np
 from tqdm import tqdm
 
-# === CONFIGURATION ===
-video_folder = "tampered_videos"          # Folder with your tampered videos
-output_folder = "auto_labels"             # Output directory for frames + YOLO labels
-model_path = "yolov8x.pt"                 # Pretrained model (you can switch to 'yolov8m.pt' for speed)
+VIDEO_EXTS = ('.mp4', '.avi', '.mov')
 
-# Create output directories
-os.makedirs(output_folder, exist_ok=True)
 
-# Load the YOLO model
-model = YOLO(model_path)
+class YoloDetector:
+    """ultralytics YOLO model; one predict() call per batch of frames."""
 
-# Process each video
-for video_name in os.listdir(video_folder):
-    if not video_name.lower().endswith(('.mp4', '.avi', '.mov')):
-        continue
+    def __init__(self, model_path="yolov8x.pt"):  # 'yolov8m.pt' for speed
+        from ultralytics import YOLO
 
-    video_path = os.path.join(video_folder, video_name)
-    video_stem = os.path.splitext(video_name)[0]
-    save_dir = os.path.join(output_folder, video_stem)
-    img_dir = os.path.join(save_dir, "images")
-    label_dir = os.path.join(save_dir, "labels")
+        self.model = YOLO(model_path)
+
+    def __call__(self, frames):
+        results = self.model.predict(frames, verbose=False)
+        out = []
+        for r in results:
+            cls = r.boxes.cls.cpu().numpy().reshape(-1, 1)
+            out.append(np.hstack([cls, r.boxes.xywhn.cpu().numpy().reshape(-1, 4)]))
+        return out
+
+
+class DummyDetector:
+    """Weight-free stand-in: one class-0 box per bright blob (area >= min_area pixels)."""
+
+    def __init__(self, threshold=64, min_area=16):
+        self.threshold = threshold
+        self.min_area = min_area
+
+    def __call__(self, frames):
+        out = []
+        for frame in frames:
+            h, w = frame.shape[:2]
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            _, mask = cv2.threshold(gray, self.threshold, 255, cv2.THRESH_BINARY)
+            n, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+            boxes = [[0, (x + bw / 2) / w, (y + bh / 2) / h, bw / w, bh / h]
+                     for x, y, bw, bh, area in stats[1:n] if area >= self.min_area]
+            out.append(np.array(boxes, dtype=np.float64).reshape(-1, 5))
+        return out
+
+
+def load_detector(model_path):
+    return DummyDetector() if model_path == "dummy" else YoloDetector(model_path)
 
-    os.makedirs(img_dir, exist_ok=True)
-    os.makedirs(label_dir, exist_ok=True)
 
+class ImageWriter:
+    """Writes images on a background thread; at most `queue_size` frames wait in memory."""
+
+    def __init__(self, queue_size=64):
+        self._queue = queue.Queue(max(1, queue_size))
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="vdt-image-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is None:
+                path, frame = item
+                try:
+                    if not cv2.imwrite(path, frame):
+                        raise OSError(f"Could not write {path}")
+                except Exception as e:
+                    self._error = e
+
+    def submit(self, path, frame):
+        if self._error is not None:
+            raise self._error
+        self._queue.put((path, frame))
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+def label_video(video_path, save_dir, detector, stride=1, batch_size=16, writer=None, overwrite_images=False):
+    """Label every `stride`-th frame of one video; returns the number of frames labeled."""
+    img_dir = os.path.join(save_dir, "images")
+    os.makedirs(img_dir if writer is not None else save_dir, exist_ok=True)
     cap = cv2.VideoCapture(video_path)
-    frame_idx = 0
+    if not cap.isOpened():
+        print(f"[ERROR] Cannot open {video_path}")
+        return 0
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    labels_path = os.path.join(save_dir, "labels.jsonl")
+    labeled = 0
+    batch = []
 
-    print(f"\nProcessing {video_name} ({total_frames} frames)...")
+    def flush(f):
+        for (idx, name, _), boxes in zip(batch, detector([frame for _, _, frame in batch])):
+            f.write(json.dumps({"frame": name, "index": idx,
+                                "boxes": [[int(b[0])] + [round(float(v), 6) for v in b[1:]] for b in boxes]}) + "\n")
+        batch.clear()
 
-    for _ in tqdm(range(total_frames)):
-        ret, frame = cap.read()
-        if not ret:
-            break
+    with open(labels_path + ".tmp", "w", encoding="utf-8") as f, \
+            tqdm(total=total_frames, desc=os.path.basename(video_path)) as bar:
+        frame_idx = 0
+        # grab() every frame, retrieve() only every stride-th one
+        while cap.grab():
+            if frame_idx % stride == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                frame_name = f"frame_{frame_idx:05d}.jpg"
+                frame_path = os.path.join(img_dir, frame_name)
+                if writer is not None and (overwrite_images or not os.path.exists(frame_path)):
+                    writer.submit(frame_path, frame)
+                batch.append((frame_idx, frame_name, frame))
+                labeled += 1
+                if len(batch) >= batch_size:
+                    flush(f)
+            frame_idx += 1
+            bar.update(1)
+        if batch:
+            flush(f)
+    cap.release()
+    os.replace(labels_path + ".tmp", labels_path)  # a complete file or the previous one
+    return labeled
 
-        frame_name = f"frame_{frame_idx:05d}.jpg"
-        frame_path = os.path.join(img_dir, frame_name)
-        cv2.imwrite(frame_path, frame)
 
-        # Run detection
-        results = model.predict(frame, verbose=False)
+def auto_label(video_folder="tampered_videos", output_folder="auto_labels", model_path="yolov8x.pt",
+               stride=1, batch_size=16, save_images=True, overwrite_images=False, detector=None):
+    """Label every video of video_folder into output_folder/<video stem>/."""
+    os.makedirs(output_folder, exist_ok=True)
+    detector = detector or load_detector(model_path)
+    writer = ImageWriter() if save_images else None
+    t0 = time.perf_counter()
+    videos, frames = 0, 0
+    try:
+        for video_name in sorted(os.listdir(video_folder)):
+            if not video_name.lower().endswith(VIDEO_EXTS):
+                continue
+            video_stem = os.path.splitext(video_name)[0]
+            frames += label_video(os.path.join(video_folder, video_name), os.path.join(output_folder, video_stem),
+                                  detector, stride, batch_size, writer, overwrite_images)
+            videos += 1
+    finally:
+        if writer is not None:
+            writer.close()
+    seconds = time.perf_counter() - t0
+    rate = frames / seconds if seconds > 0 else 0.0
+    print(f"\n✅ Auto-labeling complete! {frames} frames from {videos} videos ({rate:.1f} frames/s) saved in:",
+          output_folder)
+    return {"videos": videos, "frames": frames, "seconds": seconds, "frames_per_s": rate}
 
-        # Save results in YOLO format
-        label_path = os.path.join(label_dir, frame_name.replace(".jpg", ".txt"))
-        with open(label_path, "w") as f:
-            for box in results[0].boxes:
-                cls = int(box.cls[0])
-                x_center, y_center, w, h = box.xywhn[0]
-                f.write(f"{cls} {x_center:.6f} {y_center:.6f} {w:.6f} {h:.6f}\n")
 
-        frame_idx += 1
+def main(argv=None, prog=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog=prog, description="Auto-label tampered videos with an object detector.")
+    parser.add_argument("--video_folder", default="tampered_videos", help="Folder with your tampered videos.")
+    parser.add_argument("--output_folder", default="auto_labels", help="Output directory for frames + labels.")
+    parser.add_argument("--model", default="yolov8x.pt", help="YOLO weights, or 'dummy' for the weight-free test detector.")
+    parser.add_argument("--stride", type=int, default=1, help="Label every n-th frame (default: 1).")
+    parser.add_argument("--batch_size", type=int, default=16, help="Frames per predict() call (default: 16).")
+    parser.add_argument("--no_images", action="store_true", help="Only write labels, not frame images.")
+    parser.add_argument("--overwrite_images", action="store_true", help="Rewrite frame images that already exist.")
+    args = parser.parse_args(argv)
+
+    auto_label(args.video_folder, args.output_folder, args.model, max(1, args.stride), max(1, args.batch_size),
+               not args.no_images, args.overwrite_images)
 
-    cap.release()
 
-print("\n✅ Auto-labeling complete! YOLOv8-format images and labels saved in:", output_folder)
+if __name__ == "__main__":
+    main()
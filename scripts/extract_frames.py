@@ -2,62 +2,204 @@ import cv2
 import os
 import argparse
 import csv
+import json
+import math
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
 
-def extract_frames(video_path, output_dir, fps=2):
+VIDEO_EXTS = (".mp4", ".avi", ".mov")
+FORMATS = {"jpg": cv2.IMWRITE_JPEG_QUALITY, "webp": cv2.IMWRITE_WEBP_QUALITY}
+MANIFEST_NAME = "manifest.jsonl"  # one line per completed video, in output_root
+
+def sample_indices(fps, src_fps):
+    """Frame indices to keep: the first frame at or after each multiple of 1/fps seconds.
+
+    Steps are taken on the true source rate (e.g. 29.97), so the sample times
+    do not drift the way an integer frame step does.
+    """
+    step = max(1.0, src_fps / fps)
+    k = 0
+    while True:
+        yield math.ceil(k * step - 1e-6)
+        k += 1
+
+def extract_frames(video_path, output_dir, fps=2, fmt="jpg", quality=95):
     """
     Extract frames from a given video at specified FPS.
-    Saves frames as JPG in the output directory.
+    Saves frames as JPG (or WebP) in the output directory.
+    Raises IOError when the video cannot be opened.
     """
-    os.makedirs(output_dir, exist_ok=True)
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
-        print(f"[ERROR] Cannot open {video_path}")
-        return 0
+        raise IOError(f"Cannot open {video_path}")
+    os.makedirs(output_dir, exist_ok=True)
 
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    orig_fps = int(cap.get(cv2.CAP_PROP_FPS)) or 30
-    step = max(1, int(orig_fps / fps))
+    src_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    params = [FORMATS[fmt], int(quality)]
+    targets = sample_indices(fps, src_fps)
+    keep = next(targets)
 
     count, saved = 0, 0
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        if count % step == 0:
-            frame_name = f"frame_{saved:05d}.jpg"
-            cv2.imwrite(os.path.join(output_dir, frame_name), frame)
+    # grab() every frame (needed to advance the stream); retrieve() only kept ones
+    while cap.grab():
+        if count == keep:
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            frame_name = f"frame_{saved:05d}.{fmt}"
+            cv2.imwrite(os.path.join(output_dir, frame_name), frame, params)
             saved += 1
+            keep = next(targets)
         count += 1
     cap.release()
+    _remove_stale_frames(output_dir, fmt, saved)
     return saved
 
-def process_dataset(input_root, output_root, fps=2, csv_path="outputs/logs/frame_index.csv"):
+def _remove_stale_frames(output_dir, fmt, saved):
+    # Frames numbered past this run's count are left over from an earlier run
+    for name in os.listdir(output_dir):
+        stem, ext = os.path.splitext(name)
+        if ext == f".{fmt}" and stem.startswith("frame_") and stem[6:].isdigit() and int(stem[6:]) >= saved:
+            os.remove(os.path.join(output_dir, name))
+
+def find_videos(input_root):
+    videos = []
+    for root, dirs, files in os.walk(input_root):
+        dirs.sort()
+        for file in sorted(files):
+            if file.lower().endswith(VIDEO_EXTS):
+                videos.append(os.path.join(root, file))
+    return videos
+
+def frame_folder_names(videos, input_root):
+    """One distinct output folder name per video.
+
+    A video is named after its file unless another video shares that stem;
+    those are named by their path under input_root ("x/a.mp4" -> "x__a").
+    Any name still taken (case-insensitively) gets a numeric suffix.
+    """
+    stems = [os.path.splitext(os.path.basename(v))[0] for v in videos]
+    counts = Counter(stem.lower() for stem in stems)
+    used, names = set(), []
+    for v, base in zip(videos, stems):
+        if counts[base.lower()] > 1:
+            base = "__".join(os.path.splitext(os.path.relpath(v, input_root))[0].split(os.sep))
+        name, n = base, 0
+        while name.lower() in used:
+            n += 1
+            name = f"{base}_{n}"
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+def load_manifest(path):
+    """Completed videos by absolute path (a later line for the same video wins)."""
+    done = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn line from an interrupted run
+                done[entry["video"]] = entry
+    return done
+
+def _is_done(entry, video_path, output_dir, settings):
+    if entry is None or entry["frame_folder"] != output_dir or any(entry.get(k) != v for k, v in settings.items()):
+        return False
+    st = os.stat(video_path)
+    return entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns and os.path.isdir(output_dir)
+
+def _extract_one(video_path, output_dir, settings):
+    """Manifest entry of the extracted video, or {"error": ...} when it failed."""
+    try:
+        st = os.stat(video_path)
+        saved = extract_frames(video_path, output_dir, settings["fps"], settings["format"], settings["quality"])
+    except Exception as e:  # keep going; failed videos are not recorded as done
+        return {"error": f"{type(e).__name__}: {e}"}
+    return {"video": os.path.abspath(video_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+            "frame_folder": output_dir, "num_frames": saved, **settings}
+
+def _init_worker():
+    cv2.setNumThreads(1)  # one decoder thread per process; the pool provides the parallelism
+
+def process_dataset(input_root, output_root, fps=2, csv_path="outputs/logs/frame_index.csv",
+                    workers=1, fmt="jpg", quality=95):
     """
-    Iterate over all video files in dataset and extract frames.
+    Extract frames of every video under input_root, `workers` videos at a time.
+    Videos recorded as completed (same file, same settings) in
+    output_root/manifest.jsonl are skipped, so an interrupted run resumes.
+    Videos that fail are reported and retried by the next run.
     """
     os.makedirs(output_root, exist_ok=True)
-    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    if os.path.dirname(csv_path):
+        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+
+    settings = {"fps": fps, "format": fmt, "quality": quality}
+    manifest_path = os.path.join(output_root, MANIFEST_NAME)
+    done = load_manifest(manifest_path)
+    videos = find_videos(input_root)
+    names = dict(zip(videos, frame_folder_names(videos, input_root)))
+    rows = {}
+    failed = {}
+    jobs = []
+    for video_path in videos:
+        output_dir = os.path.join(output_root, names[video_path])
+        entry = done.get(os.path.abspath(video_path))
+        if _is_done(entry, video_path, output_dir, settings):
+            rows[video_path] = entry
+        else:
+            jobs.append((video_path, output_dir))
+
+    with open(manifest_path, "a", encoding="utf-8") as manifest, \
+            tqdm(total=len(jobs), desc=f"Processing {os.path.basename(input_root)}") as bar:
+        def record(video_path, entry):
+            bar.update(1)
+            if "error" in entry:
+                failed[video_path] = entry["error"]
+                tqdm.write(f"[ERROR] {entry['error']}")
+                return
+            rows[video_path] = entry
+            manifest.write(json.dumps(entry) + "\n")
+            manifest.flush()
+
+        if workers <= 1:
+            for video_path, output_dir in jobs:
+                record(video_path, _extract_one(video_path, output_dir, settings))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                futures = {pool.submit(_extract_one, v, d, settings): v for v, d in jobs}
+                for fut in as_completed(futures):
+                    record(futures[fut], fut.result())
 
     with open(csv_path, mode='w', newline='') as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(["video_name", "frame_folder", "num_frames"])
+        for video_path in videos:
+            if video_path in rows:
+                writer.writerow([names[video_path], rows[video_path]["frame_folder"], rows[video_path]["num_frames"]])
+    return {"videos": len(videos), "extracted": len(jobs) - len(failed), "skipped": len(videos) - len(jobs),
+            "failed": len(failed), "frames": sum(e["num_frames"] for e in rows.values())}
 
-        for root, _, files in os.walk(input_root):
-            for file in tqdm(files, desc=f"Processing {os.path.basename(input_root)}"):
-                if file.lower().endswith((".mp4", ".avi", ".mov")):
-                    video_path = os.path.join(root, file)
-                    video_name = os.path.splitext(file)[0]
-                    output_dir = os.path.join(output_root, video_name)
-                    frames_saved = extract_frames(video_path, output_dir, fps)
-                    writer.writerow([video_name, output_dir, frames_saved])
-
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Extract frames from videos for trustworthiness dataset.")
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Extract frames from videos for trustworthiness dataset.")
     parser.add_argument("--input_root", type=str, required=True, help="Path to the input dataset folder (with videos).")
     parser.add_argument("--output_root", type=str, required=True, help="Path to save extracted frames.")
-    parser.add_argument("--fps", type=int, default=2, help="Frames per second to extract (default: 2).")
-    args = parser.parse_args()
+    parser.add_argument("--fps", type=float, default=2, help="Frames per second to extract (default: 2).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Videos extracted in parallel (default: CPU count).")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="jpg", help="Frame image format (default: jpg).")
+    parser.add_argument("--quality", type=int, default=95, help="JPEG/WebP quality, 1-100 (default: 95).")
+    parser.add_argument("--csv_path", default="outputs/logs/frame_index.csv", help="Frame index CSV path.")
+    args = parser.parse_args(argv)
 
-    process_dataset(args.input_root, args.output_root, args.fps)
+    stats = process_dataset(args.input_root, args.output_root, args.fps, args.csv_path,
+                            args.workers, args.format, args.quality)
+    print(f"\nExtracted {stats['extracted']} videos, skipped {stats['skipped']} already done ({stats['frames']} frames).")
+    if stats["failed"]:
+        print(f"[ERROR] {stats['failed']} videos failed; they will be retried on the next run.")
     print("\n✅ Frame extraction completed successfully.")
+
+if __name__ == "__main__":
+    main()
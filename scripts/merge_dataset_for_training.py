@@ -1,4 +1,5 @@
-import os, shutil, random
+import os, csv, json, errno, shutil, random
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 from pathlib import Path
 
@@ -7,35 +8,90 @@ TAMPER_ROOT = Path(r"D:/Computer Vision/vdt-ethical/dataset/faceforensics_tamper
 OUT_ROOT    = Path(r"D:/Computer Vision/vdt-ethical/dataset/unified")
 SPLIT       = (0.7, 0.2, 0.1)   # train/val/test
 RANDOM_SEED = 42
-CLEAN_UNIFIED = True            # set True to wipe unified/ before writing
+CLEAN_UNIFIED = False           # set True (or pass --clean) to wipe unified/ before writing
+IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+SPLITS = ("train", "val", "test")
+# How selected frames land in unified/: copied, linked, or only listed in manifest.csv.
+# "auto" hardlinks, then reflinks, then copies.
+MODES = ("auto", "copy", "hardlink", "reflink", "symlink", "manifest")
+INDEX_CACHE = ".dir_index.json"  # in OUT_ROOT
+FICLONE = 0x40049409  # Linux ioctl: share the source's extents (btrfs, XFS, ...)
 
-random.seed(RANDOM_SEED)
+class DirIndex:
+    """Cached recursive listing of image files.
 
-def find_images_recursively(root: Path):
+    For each directory the cache keeps its mtime plus its image files and
+    subdirectories. A directory's mtime changes when entries are added,
+    removed or renamed in it, so unchanged directories are only stat()ed
+    on a rescan, not listed. With path=None nothing is persisted.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.dirs = {}
+        self.seen = set()
+        self.listed = 0  # directories read by this index
+        if path is not None and path.exists():
+            try:
+                self.dirs = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                self.dirs = {}
+
+    def images(self, root: Path):
+        """Return list[Path] of all .jpg/.jpeg/.png under root (any depth), sorted."""
+        found, stack = [], [os.path.abspath(root)]
+        while stack:
+            d = stack.pop()
+            mtime = os.stat(d).st_mtime_ns
+            self.seen.add(d)
+            entry = self.dirs.get(d)
+            if entry is None or entry["mtime_ns"] != mtime:
+                files, subdirs = [], []
+                with os.scandir(d) as it:
+                    for e in it:
+                        if e.is_dir():
+                            subdirs.append(e.name)
+                        elif os.path.splitext(e.name)[1].lower() in IMAGE_EXTS:
+                            files.append(e.name)
+                entry = self.dirs[d] = {"mtime_ns": mtime, "files": sorted(files), "dirs": sorted(subdirs)}
+                self.listed += 1
+            found.extend(Path(d) / f for f in entry["files"])
+            stack.extend(os.path.join(d, s) for s in entry["dirs"])
+        return sorted(found)
+
+    def save(self):
+        """Persist the directories scanned by this index (removed ones drop out)."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({d: e for d, e in self.dirs.items() if d in self.seen}), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+def find_images_recursively(root: Path, index=None):
     """Return list[Path] of all .jpg/.jpeg/.png under root (any depth)."""
-    exts = {".jpg", ".jpeg", ".png"}
-    return [p for p in root.rglob("*") if p.suffix.lower() in exts]
+    return (index or DirIndex()).images(root)
 
-def collect_frames(root: Path, label: int):
+def collect_frames(root: Path, label: int, index=None):
     """
     Collect (image_path, label, rel_key) tuples.
     rel_key is a unique, stable identifier derived from relative path to avoid name collisions.
     """
     items = []
-    images = find_images_recursively(root)
+    images = find_images_recursively(root, index)
     for img in images:
         # Build a unique key from the path *relative* to the class root
-        rel = img.relative_to(root)  # e.g., videoA/frame_00001.jpg or variantX/frames/frame_00001.jpg
+        rel = img.relative_to(os.path.abspath(root))  # e.g., videoA/frame_00001.jpg or variantX/frames/frame_00001.jpg
         # Create a filename-safe slug: replace separators with double underscores
         rel_slug = "__".join(rel.parts)
         items.append((img, label, rel_slug))
     return items
 
-def ensure_clean_dirs(base: Path):
-    for split_name in ["train", "val", "test"]:
+def ensure_clean_dirs(base: Path, clean=CLEAN_UNIFIED):
+    for split_name in SPLITS:
         img_dir = base / split_name / "images"
         lbl_dir = base / split_name / "labels"
-        if CLEAN_UNIFIED and (base / split_name).exists():
+        if clean and (base / split_name).exists():
             shutil.rmtree(base / split_name, ignore_errors=True)
         img_dir.mkdir(parents=True, exist_ok=True)
         lbl_dir.mkdir(parents=True, exist_ok=True)
@@ -61,38 +117,153 @@ def balanced_split(auth_items, tamp_items):
     test  = combined[n_train+n_val:]
     return train, val, test
 
-def copy_and_write(items, split_name, out_root: Path):
+def _reflink(src, dst):
+    import fcntl
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    shutil.copystat(src, dst)
+
+def _up_to_date(src, dst, mode):
+    try:
+        if mode == "symlink":
+            return os.path.islink(dst) and os.readlink(dst) == os.path.abspath(src)
+        if os.path.islink(dst):
+            return False
+        s, d = os.stat(src), os.stat(dst)
+    except OSError:
+        return False
+    # a hardlink is the same inode; copies and reflinks keep size and mtime (copy2/copystat)
+    return (s.st_ino == d.st_ino and s.st_dev == d.st_dev) or (s.st_size == d.st_size and s.st_mtime_ns == d.st_mtime_ns)
+
+def materialize(src, dst, mode="auto"):
+    """Place src at dst; returns the method used ("kept" if dst already matches).
+
+    hardlink/reflink fall back to a copy where the filesystem can't do them
+    (e.g. across devices); "auto" tries hardlink, then reflink, then copy.
+    """
+    if _up_to_date(src, dst, mode):
+        return "kept"
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if mode == "symlink":
+        os.symlink(os.path.abspath(src), dst)
+        return "symlink"
+    for method in {"auto": ("hardlink", "reflink"), "hardlink": ("hardlink",), "reflink": ("reflink",)}.get(mode, ()):
+        try:
+            if method == "hardlink":
+                os.link(src, dst)
+            else:
+                _reflink(src, dst)
+            return method
+        except (OSError, ImportError) as e:
+            if isinstance(e, OSError) and e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP,
+                                                          errno.EOPNOTSUPP, errno.EINVAL, errno.ENOTTY, errno.EBADF):
+                raise
+            if os.path.lexists(dst):
+                os.remove(dst)
+    shutil.copy2(src, dst)
+    return "copy"
+
+def _image_name(rel_slug):
+    # Make unique image name using rel_slug; ensure an image extension for consistency
+    dst_img = Path(rel_slug)
+    if dst_img.suffix.lower() not in IMAGE_EXTS:
+        dst_img = dst_img.with_suffix(".jpg")
+    return dst_img.name
+
+def _write_label(path, label):
+    text = str(label)
+    try:
+        with open(path) as f:
+            if f.read() == text:
+                return
+    except OSError:
+        pass
+    with open(path, "w") as f:
+        f.write(text)
+
+def copy_and_write(items, split_name, out_root: Path, mode="copy", workers=8):
+    """Materialize one split's images and .txt labels; files of the split not in items are removed."""
     img_dir = out_root / split_name / "images"
     lbl_dir = out_root / split_name / "labels"
-    print(f"Copying {split_name} set ({len(items)} images)...")
-    for src, label, rel_slug in tqdm(items):
-        # Make unique image name using rel_slug
-        dst_img = img_dir / f"{rel_slug}"
-        # Ensure .jpg extension for consistency
-        if dst_img.suffix.lower() not in {".jpg", ".jpeg", ".png"}:
-            dst_img = dst_img.with_suffix(".jpg")
-        # Corresponding label file
-        dst_lbl = lbl_dir / (dst_img.stem + ".txt")
-
-        shutil.copy2(src, dst_img)
-        with open(dst_lbl, "w") as f:
-            f.write(str(label))
+    names = [_image_name(rel_slug) for _, _, rel_slug in items]
 
-if __name__ == "__main__":
+    keep_imgs, keep_lbls = set(names), {Path(n).stem + ".txt" for n in names}
+    for d, keep in ((img_dir, keep_imgs), (lbl_dir, keep_lbls)):
+        for name in os.listdir(d):
+            if name not in keep:
+                os.remove(d / name)
+
+    def one(args):
+        (src, label, _), name = args
+        method = materialize(src, img_dir / name, mode)
+        _write_label(lbl_dir / (Path(name).stem + ".txt"), label)
+        return method
+
+    counts = {}
+    print(f"Materializing {split_name} set ({len(items)} images, {mode})...")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for method in tqdm(pool.map(one, zip(items, names)), total=len(items)):
+            counts[method] = counts.get(method, 0) + 1
+    return counts
+
+def write_manifest(splits, out_root: Path, mode):
+    """manifest.csv: path (relative to out_root, or the source in manifest mode), label, split, source, name.
+
+    `name` is the sample's unique image name (from its rel_slug), the same
+    in every mode.
+    """
+    out_root.mkdir(parents=True, exist_ok=True)
+    path = out_root / "manifest.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["path", "label", "split", "source", "name"])
+        for split_name, items in zip(SPLITS, splits):
+            for src, label, rel_slug in items:
+                src = os.path.abspath(src)
+                name = _image_name(rel_slug)
+                rel = src if mode == "manifest" else f"{split_name}/images/{name}"
+                writer.writerow([rel, label, split_name, src, name])
+    return path
+
+def main(argv=None, prog=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog=prog, description="Merge authentic and tampered frames into a split dataset.")
+    parser.add_argument("--auth_root", type=Path, default=AUTH_ROOT, help="Authentic frames root (label 0)")
+    parser.add_argument("--tamper_root", type=Path, default=TAMPER_ROOT, help="Tampered frames root (label 1)")
+    parser.add_argument("--out_root", type=Path, default=OUT_ROOT, help="Unified dataset output root")
+    parser.add_argument("--mode", choices=MODES, default="auto",
+                        help="auto (hardlink, else reflink, else copy), copy, hardlink, reflink, symlink, "
+                             "or manifest (only write manifest.csv)")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel file operations")
+    parser.add_argument("--clean", action="store_true", default=CLEAN_UNIFIED, help="Wipe the split folders first")
+    parser.add_argument("--no_index_cache", action="store_true", help="Rescan every directory")
+    args = parser.parse_args(argv)
+
+    random.seed(RANDOM_SEED)
+    index = DirIndex(None if args.no_index_cache else args.out_root / INDEX_CACHE)
     print("Collecting authentic frames...")
-    authentic = collect_frames(AUTH_ROOT, 0)
+    authentic = collect_frames(args.auth_root, 0, index)
     print(f"  Found authentic: {len(authentic)}")
 
     print("Collecting tampered frames (recursively, includes .../variant/frames/)...")
-    tampered = collect_frames(TAMPER_ROOT, 1)
-    print(f"  Found tampered:  {len(tampered)}")
+    tampered = collect_frames(args.tamper_root, 1, index)
+    print(f"  Found tampered:  {len(tampered)} ({index.listed} directories listed)")
+    index.save()
 
-    ensure_clean_dirs(OUT_ROOT)
     train, val, test = balanced_split(authentic, tampered)
+    write_manifest((train, val, test), args.out_root, args.mode)
 
-    copy_and_write(train, "train", OUT_ROOT)
-    copy_and_write(val,   "val",   OUT_ROOT)
-    copy_and_write(test,  "test",  OUT_ROOT)
+    counts = {}
+    if args.mode != "manifest":
+        ensure_clean_dirs(args.out_root, args.clean)
+        for items, split_name in zip((train, val, test), SPLITS):
+            for method, n in copy_and_write(items, split_name, args.out_root, args.mode, args.workers).items():
+                counts[method] = counts.get(method, 0) + n
 
-    print("\n✅ Unified dataset ready at:", OUT_ROOT)
-    print(f"Counts → train:{len(train)}  val:{len(val)}  test:{len(test)}")
+    print("\n✅ Unified dataset ready at:", args.out_root)
+    print(f"Counts → train:{len(train)}  val:{len(val)}  test:{len(test)}  files:{counts or 'manifest only'}")
+    return counts
+
+if __name__ == "__main__":
+    main()
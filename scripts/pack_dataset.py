@@ -0,0 +1,42 @@
+"""Pack the unified dataset (or frame folders) into tar shards for training.
+
+    vdt pack --unified dataset/unified --out dataset/packed
+    python -m scripts.pack_dataset --auth_root frames --tamper_root tampered_variants --out dataset/packed
+
+See src/vdt_scoring/pipeline/shards.py for the format and the reader.
+"""
+import argparse
+
+from src.vdt_scoring.pipeline.shards import pack_split, samples_from_folders, samples_from_unified
+
+SPLITS = ("train", "val", "test")
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Pack a dataset into tar shards with a numpy index.")
+    parser.add_argument("--unified", help="merge_dataset_for_training output root (train/val/test)")
+    parser.add_argument("--auth_root", help="Authentic frame folders (label 0), packed as one split")
+    parser.add_argument("--tamper_root", help="Tampered frame folders (label 1), packed with --auth_root")
+    parser.add_argument("--split", default="all", help="Split name for --auth_root/--tamper_root (default: all)")
+    parser.add_argument("--out", required=True, help="Output directory for shards and index")
+    parser.add_argument("--shard_mb", type=int, default=256, help="Target shard size in MiB (default: 256)")
+    args = parser.parse_args(argv)
+
+    if args.unified:
+        jobs = [(split, samples_from_unified(args.unified, split)) for split in SPLITS]
+    elif args.auth_root or args.tamper_root:
+        samples = []
+        if args.auth_root:
+            samples += samples_from_folders(args.auth_root, 0)
+        if args.tamper_root:
+            samples += samples_from_folders(args.tamper_root, 1)
+        jobs = [(args.split, samples)]
+    else:
+        parser.error("give --unified, or --auth_root and/or --tamper_root")
+
+    for split, samples in jobs:
+        info = pack_split(samples, args.out, split, args.shard_mb << 20)
+        print(f"{split}: {info['samples']} samples in {len(info['shards'])} shards ({info['bytes'] / 2**20:.1f} MiB)")
+    print("\n✅ Packed dataset saved to", args.out)
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,8 @@ import os
 import cv2
 import json
 import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from tqdm import tqdm
 from datetime import datetime
 
@@ -26,24 +28,47 @@ SUBTLE_PROB = 0.7          # 70% subtle, 30% severe
 RANDOM_SEED = 42
 # ----------------------------------------
 
-random.seed(RANDOM_SEED)
-
 # --- helpers for parameter sampling ---
-def sample_crop_ratio(severity):
+# Each takes the random stream to draw from; per-video streams (see
+# video_rng) keep results independent of processing order and worker count.
+def sample_crop_ratio(severity, rng=random):
     if severity == "subtle":
-        return round(random.uniform(0.10, 0.25), 3)
+        return round(rng.uniform(0.10, 0.25), 3)
     else:  # severe
-        return round(random.uniform(0.30, 0.65), 3)
+        return round(rng.uniform(0.30, 0.65), 3)
 
-def sample_skip_interval(severity):
+def sample_skip_interval(severity, rng=random):
     if severity == "subtle":
         # subtle skipping -> larger interval = less frequent skips
-        return random.randint(8, 15)
+        return rng.randint(8, 15)
     else:
-        return random.randint(2, 7)
-
-def sample_crf():
-    return random.randint(20, 40)
+        return rng.randint(2, 7)
+
+def sample_crf(rng=random):
+    return rng.randint(20, 40)
+
+def sample_tamper_spec(rng=random):
+    # decide severity
+    severity = "subtle" if rng.random() < SUBTLE_PROB else "severe"
+
+    # choose tamper mode: single or combo
+    # options: "crop", "skip", "compress", "crop+compress", "skip+compress"
+    modes = ["crop", "skip", "compress", "crop+compress", "skip+compress"]
+    # bias selection slightly toward combos and crop/skip
+    mode = rng.choices(modes, weights=[2,2,1,2,2], k=1)[0]
+
+    tamper_spec = {"mode": mode, "severity": severity}
+    if "crop" in mode:
+        tamper_spec["crop_ratio"] = sample_crop_ratio(severity, rng)
+    if "skip" in mode:
+        tamper_spec["skip_interval"] = sample_skip_interval(severity, rng)
+    if "compress" in mode:
+        tamper_spec["crf"] = sample_crf(rng)
+    return tamper_spec
+
+def video_rng(seed, name):
+    # str seeds hash deterministically (not affected by PYTHONHASHSEED)
+    return random.Random(f"{seed}:{name}")
 
 def crf_to_jpeg_quality(crf):
     """
@@ -56,16 +81,16 @@ def crf_to_jpeg_quality(crf):
     return q
 
 # --- image operations ---
-def apply_crop_and_resize(img, crop_ratio):
+def apply_crop_and_resize(img, crop_ratio, rng=random):
     h, w = img.shape[:2]
     # crop area size = (1 - crop_ratio) of original
     ch = int(h * (1 - crop_ratio))
     cw = int(w * (1 - crop_ratio))
     if ch <= 0 or cw <= 0:
-        return img.copy()
+        return img, None
     # random top-left within valid range
-    x0 = random.randint(0, w - cw)
-    y0 = random.randint(0, h - ch)
+    x0 = rng.randint(0, w - cw)
+    y0 = rng.randint(0, h - ch)
     cropped = img[y0:y0 + ch, x0:x0 + cw]
     # resize back to original to keep consistent shape
     resized = cv2.resize(cropped, (w, h), interpolation=cv2.INTER_LINEAR)
@@ -80,130 +105,140 @@ def compress_and_save_as_jpeg(img, out_path, jpeg_quality):
     with open(out_path, 'wb') as f:
         f.write(encimg.tobytes())
 
+def _write_frame(img, out_path, jpeg_quality):
+    # Runs on the encoder pool; cv2 releases the GIL while encoding.
+    try:
+        if jpeg_quality is not None:
+            compress_and_save_as_jpeg(img, out_path, jpeg_quality)
+        else:
+            # save lossless-ish PNG to preserve quality
+            cv2.imwrite(out_path, img)
+        return True
+    except Exception:
+        return False
+
 # --- main tampering per-folder ---
-def create_variant_from_frame_folder(src_folder, dst_variant_folder, tamper_spec):
+def create_variants_from_frame_folder(src_folder, variants, encode_threads=2, seed=RANDOM_SEED):
     """
     src_folder: path to folder containing frames (images)
-    dst_variant_folder: path to output folder for this variant (will contain 'frames/' and metadata)
-    tamper_spec: dict specifying operations and parameters
+    variants: list of (dst_variant_folder, tamper_spec); each folder will contain 'frames/' and metadata
+    Each source frame is decoded once and fanned out to every variant; the
+    encoded frames are written by a pool of `encode_threads` threads.
+    Returns the metadata of each variant, in order.
     """
-    os.makedirs(dst_variant_folder, exist_ok=True)
-    frames_out_dir = os.path.join(dst_variant_folder, "frames")
-    os.makedirs(frames_out_dir, exist_ok=True)
-
     frames = sorted([f for f in os.listdir(src_folder) if f.lower().endswith(('.jpg','.jpeg','.png'))])
+    states = []
+    for dst_variant_folder, tamper_spec in variants:
+        os.makedirs(dst_variant_folder, exist_ok=True)
+        frames_out_dir = os.path.join(dst_variant_folder, "frames")
+        os.makedirs(frames_out_dir, exist_ok=True)
+
+        # If skip is requested, skip frames where index % si == 0 (keeps pattern reproducible)
+        si = tamper_spec.get("skip_interval")
+        skipped_indices = set(range(0, len(frames), si)) if si else set()
+
+        # If compression requested, compute jpeg quality
+        jpeg_quality = crf_to_jpeg_quality(tamper_spec["crf"]) if tamper_spec.get("crf") is not None else None
+
+        states.append({
+            "folder": dst_variant_folder, "frames_dir": frames_out_dir, "spec": tamper_spec,
+            "skipped": skipped_indices, "jpeg_quality": jpeg_quality, "crop_box": None,
+            "saved": 0, "failed": [],
+            # crop positions come from a stream of their own, drawn in frame order
+            "rng": video_rng(seed, os.path.basename(dst_variant_folder)),
+        })
     if len(frames) == 0:
-        return {"status":"no_frames"}
-
-    skipped_indices = set()
-    crop_box = None
-    jpeg_quality = None
-
-    # If skip is requested, compute indices to skip (every nth)
-    if tamper_spec.get("skip_interval"):
-        si = tamper_spec["skip_interval"]
-        # skip rule: skip frames where index % si == 0 (keeps pattern reproducible)
-        # but to add some randomness, randomly remove up to 20% additional frames for severe
-        for i in range(len(frames)):
-            if (i % si) == 0:
-                skipped_indices.add(i)
-
-    # If compression requested, compute jpeg quality
-    if tamper_spec.get("crf") is not None:
-        jpeg_quality = crf_to_jpeg_quality(tamper_spec["crf"])
-
-    # Process each frame
-    saved = 0
-    failed = []
-    for i, frame_name in enumerate(tqdm(frames, desc=f"Tampering {os.path.basename(src_folder)} -> {os.path.basename(dst_variant_folder)}")):
-        if i in skipped_indices:
-            continue
-
-        src_path = os.path.join(src_folder, frame_name)
-        img = cv2.imread(src_path)
-        if img is None:
-            failed.append(frame_name)
-            continue
-
-        # start with original
-        out_img = img.copy()
-        applied_crop = False
-
-        # apply crop if requested
-        if tamper_spec.get("crop_ratio") is not None:
-            out_img, crop_box = apply_crop_and_resize(out_img, tamper_spec["crop_ratio"])
-            applied_crop = True
-
-        # save with compression if requested
-        out_path = os.path.join(frames_out_dir, frame_name)
-        if jpeg_quality is not None:
-            try:
-                compress_and_save_as_jpeg(out_img, out_path, jpeg_quality)
-            except Exception as e:
-                failed.append(frame_name)
-                continue
+        return [{"status":"no_frames"} for _ in variants]
+
+    pending = deque()
+
+    def collect(state, frame_name, future):
+        if future.result():
+            state["saved"] += 1
         else:
-            # save lossless-ish PNG to preserve quality
-            cv2.imwrite(out_path, out_img)
+            state["failed"].append(frame_name)
 
-        saved += 1
+    with ThreadPoolExecutor(max_workers=max(1, encode_threads)) as pool:
+        for i, frame_name in enumerate(tqdm(frames, desc=f"Tampering {os.path.basename(src_folder)} ({len(variants)} variants)")):
+            wanted = [s for s in states if i not in s["skipped"]]
+            if not wanted:
+                continue
 
-    # write metadata.json for this variant
-    metadata = {
-        "variant_of": os.path.basename(src_folder),
-        "variant_id": os.path.basename(dst_variant_folder),
-        "created_at": datetime.utcnow().isoformat() + "Z",
-        "tamper_spec": tamper_spec,
-        "num_input_frames": len(frames),
-        "num_output_frames": saved,
-        "skipped_frames_count": len(skipped_indices),
-        "crop_box": crop_box,
-        "jpeg_quality": jpeg_quality,
-        "failed_frames": failed
-    }
+            src_path = os.path.join(src_folder, frame_name)
+            img = cv2.imread(src_path)  # decoded once for all variants; never modified
+            if img is None:
+                for state in wanted:
+                    state["failed"].append(frame_name)
+                continue
 
-    with open(os.path.join(dst_variant_folder, "metadata.json"), 'w') as jf:
-        json.dump(metadata, jf, indent=4)
+            for state in wanted:
+                out_img = img
+                # apply crop if requested
+                if state["spec"].get("crop_ratio") is not None:
+                    out_img, state["crop_box"] = apply_crop_and_resize(img, state["spec"]["crop_ratio"], state["rng"])
+                out_path = os.path.join(state["frames_dir"], frame_name)
+                pending.append((state, frame_name, pool.submit(_write_frame, out_img, out_path, state["jpeg_quality"])))
+            # bound the frames held in memory while the encoders catch up
+            while len(pending) > 4 * max(1, encode_threads) * len(states):
+                collect(*pending.popleft())
+        while pending:
+            collect(*pending.popleft())
+
+    results = []
+    for state in states:
+        # write metadata.json for this variant
+        metadata = {
+            "variant_of": os.path.basename(src_folder),
+            "variant_id": os.path.basename(state["folder"]),
+            "created_at": datetime.utcnow().isoformat() + "Z",
+            "tamper_spec": state["spec"],
+            "num_input_frames": len(frames),
+            "num_output_frames": state["saved"],
+            "skipped_frames_count": len(state["skipped"]),
+            "crop_box": state["crop_box"],
+            "jpeg_quality": state["jpeg_quality"],
+            "failed_frames": state["failed"]
+        }
+
+        with open(os.path.join(state["folder"], "metadata.json"), 'w') as jf:
+            json.dump(metadata, jf, indent=4)
+        results.append(metadata)
+    return results
 
-    return metadata
+def create_variant_from_frame_folder(src_folder, dst_variant_folder, tamper_spec):
+    return create_variants_from_frame_folder(src_folder, [(dst_variant_folder, tamper_spec)])[0]
 
 # --- orchestration ---
-def generate_variants_for_all_videos(frames_root, out_root, n_variants=4):
+def generate_variants_for_video(frames_root, video, out_root, n_variants=4, seed=RANDOM_SEED, encode_threads=2):
+    """Sample n_variants specs from the video's own random stream and create them in one pass."""
+    rng = video_rng(seed, video)
+    variants = []
+    for vidx in range(1, n_variants + 1):
+        tamper_spec = sample_tamper_spec(rng)
+        variant_name = f"{video}__variant_{vidx}_{tamper_spec['mode']}_s-{tamper_spec['severity']}"
+        variants.append((os.path.join(out_root, variant_name), tamper_spec))
+
+    metas = create_variants_from_frame_folder(os.path.join(frames_root, video), variants, encode_threads, seed)
+    return [{"video": video, "variant": os.path.basename(dst), "metadata": meta}
+            for (dst, _), meta in zip(variants, metas)]
+
+def _init_worker():
+    cv2.setNumThreads(1)  # parallelism comes from the video and encoder pools
+
+def generate_variants_for_all_videos(frames_root, out_root, n_variants=4, workers=1, encode_threads=2,
+                                     seed=RANDOM_SEED):
     os.makedirs(out_root, exist_ok=True)
     video_folders = sorted([d for d in os.listdir(frames_root) if os.path.isdir(os.path.join(frames_root, d))])
 
     summary = []
-    for video in video_folders:
-        src_folder = os.path.join(frames_root, video)
-        # sample number of variants (or fixed n)
-        for vidx in range(1, n_variants + 1):
-            # decide severity
-            severity = "subtle" if random.random() < SUBTLE_PROB else "severe"
-
-            # choose tamper mode: single or combo
-            # options: "crop", "skip", "compress", "crop+compress", "skip+compress"
-            modes = ["crop", "skip", "compress", "crop+compress", "skip+compress"]
-            # bias selection slightly toward combos and crop/skip
-            mode = random.choices(modes, weights=[2,2,1,2,2], k=1)[0]
-
-            tamper_spec = {"mode": mode, "severity": severity}
-            if "crop" in mode:
-                tamper_spec["crop_ratio"] = sample_crop_ratio(severity)
-            if "skip" in mode:
-                tamper_spec["skip_interval"] = sample_skip_interval(severity)
-            if "compress" in mode:
-                crf = sample_crf()
-                tamper_spec["crf"] = crf
-
-            variant_name = f"{video}__variant_{vidx}_{mode}_s-{severity}"
-            dst_variant_folder = os.path.join(out_root, variant_name)
-
-            meta = create_variant_from_frame_folder(src_folder, dst_variant_folder, tamper_spec)
-            summary.append({
-                "video": video,
-                "variant": variant_name,
-                "metadata": meta
-            })
+    args = [(frames_root, video, out_root, n_variants, seed, encode_threads) for video in video_folders]
+    if workers <= 1:
+        for a in args:
+            summary.extend(generate_variants_for_video(*a))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            for entries in pool.map(generate_variants_for_video, *zip(*args)):
+                summary.extend(entries)
 
     # write global summary
     with open(os.path.join(out_root, "variants_summary.json"), 'w') as sf:
@@ -213,15 +248,22 @@ def generate_variants_for_all_videos(frames_root, out_root, n_variants=4):
     return summary
 
 # ----------------- CLI entrypoint -----------------
-if __name__ == "__main__":
+def main(argv=None, prog=None):
     import argparse
-    parser = argparse.ArgumentParser(description="Generate randomized tampered frame-folder variants.")
+    parser = argparse.ArgumentParser(prog=prog, description="Generate randomized tampered frame-folder variants.")
     parser.add_argument("--frames_root", default=FRAMES_DIR, help="Root folder containing per-video frame folders")
     parser.add_argument("--out_root", default=OUTPUT_ROOT, help="Root folder to save tampered variants")
     parser.add_argument("--n_variants", type=int, default=N_VARIANTS_PER_VIDEO, help="Variants per original video")
-    args = parser.parse_args()
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Videos processed in parallel")
+    parser.add_argument("--encode_threads", type=int, default=2, help="Encoder threads per video")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED, help="Seed of the per-video random streams")
+    args = parser.parse_args(argv)
 
     print("Frames root:", args.frames_root)
     print("Output root:", args.out_root)
     print("Variants per video:", args.n_variants)
-    generate_variants_for_all_videos(args.frames_root, args.out_root, args.n_variants)
+    generate_variants_for_all_videos(args.frames_root, args.out_root, args.n_variants, args.workers,
+                                     args.encode_threads, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,2 @@
+__version__ = "0.1.0"
 __all__ = ["config", "utils", "pipeline", "scoring", "explain", "privacy", "governance", "ethics"]
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 import yaml
 
@@ -6,23 +6,63 @@ import yaml
 class SamplerCfg:
     every_nth: int = 5
     max_frames: int = 500
+    mode: str = "grab"  # read | grab | seek | keyframe, see utils.video_io
+    adaptive: bool = False  # coarse pass, then densify around discontinuities (pipeline.sampling)
+    coarse_every: int = 15  # adaptive: stride of the coarse pass
+    fine_every: int = 2     # adaptive: stride inside densified intervals
+    adaptive_z: float = 3.0  # adaptive: robust z-score marking an interval as suspicious
+    motion_threshold: Optional[float] = None  # adaptive: also densify where coarse motion >= this
+    coarse_max_side: int = 160  # adaptive: the coarse pass scores grays downscaled to this
 
 @dataclass
 class ScoringCfg:
     w_edge: float = 0.4
     w_motion: float = 0.3
     w_blur: float = 0.3
+    batch_size: int = 16  # frames scored per vectorized batch
+    analysis_max_side: int = 0  # >0: score on a pyramid-downscaled gray, longer side <= this
 
 @dataclass
 class OutputCfg:
     save_heatmaps: bool = True
     save_every_n: int = 5
+    heatmap_full_res: bool = True  # with analysis_max_side, recompute Sobel at full res for heatmaps
+    format: str = "json"  # json (single indented file) | jsonl (streamed frames.jsonl)
+    columnar: Optional[str] = None  # also write per-frame arrays: npz | parquet
+    anonymize_heatmaps: bool = False  # blur faces in saved heatmaps
+    face_detect_every: int = 5        # sampled frames between face detections (heatmap frames always detect)
+    face_detect_max_side: int = 480   # detect on a gray copy downscaled to this longer side
+
+@dataclass
+class RuntimeCfg:
+    pipelined: bool = False  # run decode / score / output on separate threads
+    queue_size: int = 2      # batches buffered between two pipeline stages
+    reuse_buffers: bool = True  # decode into a preallocated frame ring
+    cache_dir: Optional[str] = None  # persistent result cache keyed on video content + config
+    cache_size_mb: int = 1024        # LRU eviction beyond this size
+    timing_sample_every: int = 1     # time every n-th batch per stage; 0 = off
+    profile_path: Optional[str] = None  # dump a cProfile of the run (.prof) here
+    validation: str = "sampled"      # strict | full | sampled | summary | off, see schemas.validation
+    validation_sample_every: int = 50  # sampled mode: check every n-th frame record
+
+@dataclass
+class SegmentCfg:
+    window: int = 25         # rolling baseline of the last n unflagged frame scores
+    min_history: int = 5     # baseline samples needed before z-scores are used
+    z_enter: float = 2.0     # open a segment at mean + z_enter * std ...
+    z_exit: float = 1.0      # ... and keep it open while above mean + z_exit * std
+    min_std: float = 0.01    # floor for the rolling std, so static footage is not all flagged
+    abs_enter: Optional[float] = None  # also flag any frame scoring at least this
+    merge_gap: int = 2       # merge segments separated by at most n unflagged samples
+    min_samples: int = 1     # drop segments with fewer flagged samples
 
 @dataclass
 class AppCfg:
-    sampler: SamplerCfg = SamplerCfg()
-    scoring: ScoringCfg = ScoringCfg()
-    output: OutputCfg = OutputCfg()
+    sampler: SamplerCfg = field(default_factory=SamplerCfg)
+    scoring: ScoringCfg = field(default_factory=ScoringCfg)
+    output: OutputCfg = field(default_factory=OutputCfg)
+    runtime: RuntimeCfg = field(default_factory=RuntimeCfg)
+    segments: SegmentCfg = field(default_factory=SegmentCfg)
 
 def load_config(path: Optional[str]) -> AppCfg:
     if path is None:
@@ -32,8 +72,12 @@ def load_config(path: Optional[str]) -> AppCfg:
     s = data.get("sampler", {})
     sc = data.get("scoring", {})
     o = data.get("output", {})
+    r = data.get("runtime", {})
+    sg = data.get("segments", {})
     return AppCfg(
         sampler=SamplerCfg(**s),
         scoring=ScoringCfg(**sc),
         output=OutputCfg(**o),
+        runtime=RuntimeCfg(**r),
+        segments=SegmentCfg(**sg),
     )
@@ -1,16 +1,32 @@
 import numpy as np
 import cv2
 import os
+from typing import Optional, Sequence, Tuple
 
-def save_edge_heatmap(frame: np.ndarray, out_dir: str, idx: int) -> str:
+from ..scoring.features import FrameFeatures
+from ..privacy.face_blur import blur_boxes
+
+def save_edge_heatmap(
+    frame: np.ndarray,
+    out_dir: str,
+    idx: int,
+    mag: Optional[np.ndarray] = None,
+    blur: Sequence[Tuple[int, int, int, int]] = (),
+) -> str:
+    # `mag` lets callers reuse the Sobel magnitude already computed for scoring;
+    # a reduced-resolution magnitude is upsampled to the frame size.
+    # `blur` boxes (x, y, w, h) are blurred in the overlay, hiding both the
+    # pixels and their edge response.
     os.makedirs(out_dir, exist_ok=True)
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    gx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
-    gy = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
-    mag = cv2.magnitude(gx, gy)
+    if mag is None:
+        mag = FrameFeatures(frame)["mag"]
+    h, w = frame.shape[:2]
+    if mag.shape[:2] != (h, w):
+        mag = cv2.resize(mag, (w, h), interpolation=cv2.INTER_LINEAR)
     mag_norm = cv2.normalize(mag, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
     heat = cv2.applyColorMap(mag_norm, cv2.COLORMAP_JET)
     overlay = cv2.addWeighted(frame, 0.6, heat, 0.4, 0)
+    blur_boxes(overlay, blur)
     path = os.path.join(out_dir, f"frame_{idx:06d}.png")
     cv2.imwrite(path, overlay)
     return path
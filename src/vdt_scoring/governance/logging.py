@@ -1,12 +1,46 @@
+import json
 import logging
 import os
 
+# VDT_LOG_FORMAT=json switches every vdt logger to one JSON object per line.
+LOG_FORMAT_ENV = "VDT_LOG_FORMAT"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        data.update(getattr(record, "fields", {}))
+        return json.dumps(data, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " " + " ".join(f"{k}={json.dumps(v, default=str)}" for k, v in fields.items())
+        return text
+
+
 def get_logger(name: str = "vdt"):
     logger = logging.getLogger(name)
     if not logger.handlers:
         logger.setLevel(logging.INFO)
         ch = logging.StreamHandler()
-        fmt = logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s")
+        if os.environ.get(LOG_FORMAT_ENV, "").lower() == "json":
+            fmt = JsonFormatter()
+        else:
+            fmt = TextFormatter("[%(asctime)s] %(levelname)s - %(message)s")
         ch.setFormatter(fmt)
         logger.addHandler(ch)
     return logger
+
+
+def log_event(logger: logging.Logger, event: str, level: int = logging.INFO, **fields) -> None:
+    """Log a structured record: `event` is the message, `fields` travel as machine-readable data."""
+    logger.log(level, event, extra={"fields": fields})
@@ -0,0 +1,130 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+
+# Per-process state, filled once by _init_worker.
+_worker: Dict[str, Any] = {}
+
+
+def collect_videos(spec: str) -> List[str]:
+    """Resolve a directory, glob pattern or manifest file (one path per line) into video paths."""
+    if os.path.isdir(spec):
+        found = []
+        for root, _, files in os.walk(spec):
+            found.extend(os.path.join(root, f) for f in files if f.lower().endswith(VIDEO_EXTS))
+        return sorted(found)
+    if os.path.isfile(spec) and not spec.lower().endswith(VIDEO_EXTS):
+        base = os.path.dirname(os.path.abspath(spec))
+        videos = []
+        with open(spec, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    videos.append(line if os.path.isabs(line) else os.path.join(base, line))
+        return videos
+    return sorted(glob.glob(spec, recursive=True))
+
+
+def _out_dirs(videos: List[str], out_root: str) -> List[str]:
+    # One directory per video, named after the file; a taken name gets the first
+    # free numeric suffix. Names are compared case-insensitively so two videos
+    # never share a directory, even on case-insensitive filesystems.
+    used = set()
+    dirs = []
+    for v in videos:
+        stem = os.path.splitext(os.path.basename(v))[0]
+        name, n = stem, 0
+        while name.lower() in used:
+            n += 1
+            name = f"{stem}_{n}"
+        used.add(name.lower())
+        dirs.append(os.path.join(out_root, name))
+    return dirs
+
+
+def _init_worker(config_path: Optional[str], single_thread: bool, cache_dir: Optional[str] = None) -> None:
+    import cv2
+    from ..config import load_config
+    from .cache import open_cache
+
+    if single_thread:
+        # Parallelism comes from the pool; avoid oversubscribing cores.
+        cv2.setNumThreads(1)
+    cfg = load_config(config_path)
+    if cache_dir:
+        cfg.runtime.cache_dir = cache_dir
+    _worker["cfg"] = cfg
+    _worker["cache"] = None
+    if cfg.runtime.cache_dir:
+        _worker["cache"] = open_cache(cfg.runtime.cache_dir, cfg.runtime.cache_size_mb << 20)
+
+
+def _score_one(video: str, out_dir: str) -> Dict[str, Any]:
+    from .cache import score_with_cache
+
+    t0 = time.perf_counter()
+    entry: Dict[str, Any] = {"video_path": video, "results_path": os.path.join(out_dir, "results.json")}
+    try:
+        results, hit = score_with_cache(video, out_dir, _worker["cfg"], _worker["cache"])
+    except Exception as e:  # keep going; the failure is recorded in the index
+        entry.update(status="error", error=f"{type(e).__name__}: {e}")
+    else:
+        entry.update(
+            status="ok",
+            global_score=results["summary"]["global_score"],
+            frames_evaluated=results["summary"]["frames_evaluated"],
+        )
+        if _worker["cache"] is not None:
+            entry["cache"] = "hit" if hit else "miss"
+        errors = results["summary"].get("validation", {}).get("errors")
+        if errors:
+            entry["schema_warning"] = errors[0]
+    entry["seconds"] = round(time.perf_counter() - t0, 4)
+    return entry
+
+
+def run_batch(
+    videos: List[str],
+    out_root: str,
+    config_path: Optional[str] = None,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Score many videos with a process pool; writes per-video results plus out_root/index.json."""
+    os.makedirs(out_root, exist_ok=True)
+    workers = max(1, workers)
+    jobs = list(zip(videos, _out_dirs(videos, out_root)))
+    t0 = time.perf_counter()
+    entries: List[Dict[str, Any]] = []
+    if workers == 1:
+        _init_worker(config_path, False, cache_dir)
+        entries = [_score_one(v, d) for v, d in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(config_path, True, cache_dir)
+        ) as pool:
+            futures = {pool.submit(_score_one, v, d): i for i, (v, d) in enumerate(jobs)}
+            done = {futures[fut]: fut.result() for fut in as_completed(futures)}
+        entries = [done[i] for i in range(len(jobs))]
+    elapsed = time.perf_counter() - t0
+
+    n_frames = sum(e.get("frames_evaluated", 0) for e in entries)
+    index = {
+        "config": config_path,
+        "workers": workers,
+        "videos": len(entries),
+        "failed": sum(1 for e in entries if e["status"] != "ok"),
+        "cache_hits": sum(1 for e in entries if e.get("cache") == "hit"),
+        "seconds": round(elapsed, 4),
+        "videos_per_s": round(len(entries) / elapsed, 3) if elapsed > 0 else None,
+        "frames_per_s": round(n_frames / elapsed, 3) if elapsed > 0 else None,
+        "entries": entries,
+    }
+    with open(os.path.join(out_root, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return index
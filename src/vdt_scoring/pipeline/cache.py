@@ -0,0 +1,165 @@
+import copy
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from .. import __version__
+from ..config import AppCfg
+from .infer import infer_video
+from .writers import write_results_json
+
+# Bump whenever the scoring output changes for the same code version and config.
+CACHE_FORMAT = 2
+CODE_VERSION = f"{__version__}/{CACHE_FORMAT}"
+
+_open_caches: Dict[str, "ResultCache"] = {}
+
+
+def video_fingerprint(path: str, samples: int = 8, chunk: int = 64 * 1024) -> str:
+    """Fast content fingerprint: file size plus a hash of evenly spaced chunks (head and tail included)."""
+    size = os.path.getsize(path)
+    h = hashlib.blake2b(str(size).encode(), digest_size=20)
+    with open(path, "rb") as f:
+        if size <= samples * chunk:
+            h.update(f.read())
+        else:
+            step = (size - chunk) / (samples - 1)
+            for i in range(samples):
+                f.seek(int(i * step))
+                h.update(f.read(chunk))
+    return h.hexdigest()
+
+
+def config_fingerprint(cfg: AppCfg) -> str:
+    # runtime settings only change how a video is scored, not the results.
+    data = {k: v for k, v in asdict(cfg).items() if k != "runtime"}
+    return hashlib.blake2b(json.dumps(data, sort_keys=True).encode(), digest_size=20).hexdigest()
+
+
+class ResultCache:
+    """Persistent, size-bounded LRU cache of infer_video results (diskcache).
+
+    An entry stores the results dict plus the bytes of the streamed frame and
+    column files and of the heatmap PNGs. Heatmap paths are stored relative
+    to the output directory and re-rooted under the new one on a hit. The
+    filling run's summary.performance and summary.validation are not stored,
+    since they describe that run only.
+    """
+
+    def __init__(self, directory: str, size_limit: int = 1 << 30):
+        from diskcache import Cache
+
+        self.directory = directory
+        self._cache = Cache(directory, size_limit=size_limit, eviction_policy="least-recently-used")
+        self._cache.stats(enable=True)
+
+    def key(self, path: str, cfg: AppCfg) -> str:
+        return f"{CODE_VERSION}:{video_fingerprint(path)}:{config_fingerprint(cfg)}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    def put(self, key: str, results: Dict[str, Any], out_dir: str) -> None:
+        files: Dict[str, bytes] = {}
+        heatmaps: Dict[str, bytes] = {}
+
+        def relative(path: str) -> str:
+            rel = os.path.relpath(path, out_dir)
+            if rel not in heatmaps:
+                with open(path, "rb") as f:
+                    heatmaps[rel] = f.read()
+            return rel
+
+        stored = copy.deepcopy(results)
+        summary = stored["summary"]
+        summary.pop("performance", None)
+        summary.pop("validation", None)
+        _map_heatmap_paths(stored.get("frames", []), relative)
+        for name_key in ("frames_file", "columns_file"):
+            name = results.get(name_key)
+            if name:
+                with open(os.path.join(out_dir, name), "rb") as f:
+                    files[name] = f.read()
+        if results.get("frames_file"):
+            files[results["frames_file"]] = _map_jsonl_heatmap_paths(files[results["frames_file"]], relative)
+        self._cache.set(key, {"results": stored, "files": files, "heatmaps": heatmaps})
+
+    def stats(self) -> Dict[str, int]:
+        hits, misses = self._cache.stats(enable=True)
+        return {"hits": hits, "misses": misses, "entries": len(self._cache), "bytes": self._cache.volume()}
+
+    def close(self) -> None:
+        self._cache.close()
+
+
+def _map_heatmap_paths(records: List[Dict[str, Any]], fn: Callable[[str], str]) -> None:
+    for r in records:
+        if r.get("heatmap_path"):
+            r["heatmap_path"] = fn(r["heatmap_path"])
+
+
+def _map_jsonl_heatmap_paths(data: bytes, fn: Callable[[str], str]) -> bytes:
+    if b'"heatmap_path":"' not in data:
+        return data
+    records = [orjson.loads(line) for line in data.splitlines() if line]
+    _map_heatmap_paths(records, fn)
+    return b"".join(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in records)
+
+
+def open_cache(directory: str, size_limit: int = 1 << 30) -> ResultCache:
+    """One ResultCache per directory and process."""
+    cache = _open_caches.get(directory)
+    if cache is None:
+        cache = _open_caches[directory] = ResultCache(directory, size_limit)
+    return cache
+
+
+def score_with_cache(
+    path: str, out_dir: str, cfg: AppCfg, cache: Optional[ResultCache]
+) -> Tuple[Dict[str, Any], bool]:
+    """infer_video behind the result cache; returns (results, whether they came from the cache).
+
+    A hit restores the frame, column and heatmap files into out_dir and
+    replaces summary.performance with the time taken to restore them.
+    """
+    if cache is None:
+        return infer_video(path, out_dir, cfg), False
+    t0 = time.perf_counter()
+    key = cache.key(path, cfg)
+    entry = cache.get(key)
+    if entry is None:
+        results = infer_video(path, out_dir, cfg)
+        cache.put(key, results, out_dir)
+        return results, False
+
+    os.makedirs(out_dir, exist_ok=True)
+    for rel, data in entry.get("heatmaps", {}).items():
+        dst = os.path.join(out_dir, rel)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        with open(dst, "wb") as f:
+            f.write(data)
+
+    def rooted(rel: str) -> str:
+        return os.path.join(out_dir, rel)
+
+    results = dict(entry["results"], video_path=path)
+    _map_heatmap_paths(results.get("frames", []), rooted)
+    for name, data in entry["files"].items():
+        if name == results.get("frames_file"):
+            data = _map_jsonl_heatmap_paths(data, rooted)
+        with open(os.path.join(out_dir, name), "wb") as f:
+            f.write(data)
+    results["summary"] = dict(results["summary"], performance={
+        "cache": "hit", "wall_s": round(time.perf_counter() - t0, 4)})
+    write_results_json(out_dir, results)
+    return results, True
+
+
+def cached_infer_video(path: str, out_dir: str, cfg: AppCfg, cache: Optional[ResultCache] = None) -> Dict[str, Any]:
+    """infer_video behind the result cache; without a cache this is plain infer_video."""
+    return score_with_cache(path, out_dir, cfg, cache)[0]
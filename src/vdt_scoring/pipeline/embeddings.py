@@ -0,0 +1,225 @@
+import json
+import os
+import zlib
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STORE_FORMAT = 1
+META_FILE = "meta.json"
+INDEX_FILE = "index.jsonl"
+
+Key = Tuple[int, int]  # file size, mtime_ns
+Entry = Tuple[int, int, str, int, int]  # size, mtime_ns, shard, row, crc32
+
+
+def frame_key(path: str) -> Key:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class EmbeddingStore:
+    """Fixed-width frame embeddings in memory-mapped .npy shards.
+
+    Entries are keyed by absolute frame path and valid while the file's size
+    and mtime match the ones recorded, so changed frames read as missing.
+    Appends fill the last shard (a new one is preallocated when it is full)
+    and add a line to index.jsonl after the rows are flushed; a later line for
+    the same path supersedes earlier ones. compact() rewrites the live rows
+    into fresh shards; verify() checks each live row against its CRC32.
+    One writer per directory.
+    """
+
+    def __init__(self, directory: str, dim: int, dtype: str = "float16", model: str = "",
+                 shard_rows: int = 16384):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, META_FILE)
+        meta = {"format": STORE_FORMAT, "dim": int(dim), "dtype": np.dtype(dtype).name, "model": model,
+                "shard_rows": int(shard_rows), "generation": 0}
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            for name in ("format", "dim", "dtype", "model"):
+                if stored.get(name) != meta[name]:
+                    raise ValueError(f"Embedding store {directory} has {name}={stored.get(name)!r}, "
+                                     f"expected {meta[name]!r}")
+            meta = stored
+        else:
+            self._write_json(META_FILE, meta)
+        self.meta = meta
+        self.dim = meta["dim"]
+        self.dtype = np.dtype(meta["dtype"])
+        self._shards: Dict[str, np.memmap] = {}
+        self._entries: Dict[str, Entry] = {}
+        self._tail: Optional[Tuple[str, int]] = None  # shard being filled, next free row
+        self._load_index()
+
+    # -- files -------------------------------------------------------------
+
+    def _write_json(self, name: str, data) -> None:
+        tmp = os.path.join(self.directory, name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, os.path.join(self.directory, name))
+
+    def _load_index(self) -> None:
+        path = os.path.join(self.directory, INDEX_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    frame, size, mtime, shard, row, crc = json.loads(line)
+                except ValueError:
+                    continue  # torn last line of an interrupted append
+                self._entries[frame] = (size, mtime, shard, row, crc)
+                if self._tail is None or (shard, row) >= self._tail:
+                    self._tail = (shard, row + 1)
+
+    def shard(self, name: str) -> np.memmap:
+        """A shard's rows, memory-mapped (opened once)."""
+        arr = self._shards.get(name)
+        if arr is None:
+            arr = np.load(os.path.join(self.directory, name), mmap_mode="r+")
+            self._shards[name] = arr
+        return arr
+
+    def _new_shard(self, rows: int) -> str:
+        gen = self.meta["generation"]
+        n = sum(1 for f in os.listdir(self.directory) if f.startswith(f"{gen:04d}-") and f.endswith(".npy"))
+        name = f"{gen:04d}-{n:05d}.npy"
+        self._shards[name] = np.lib.format.open_memmap(
+            os.path.join(self.directory, name), mode="w+", dtype=self.dtype, shape=(rows, self.dim))
+        return name
+
+    # -- lookups -----------------------------------------------------------
+
+    def _live(self, path: str) -> Optional[Entry]:
+        entry = self._entries.get(os.path.abspath(path))
+        if entry is None:
+            return None
+        try:
+            key = frame_key(path)
+        except OSError:
+            return None
+        return entry if entry[:2] == key else None
+
+    def __contains__(self, path: str) -> bool:
+        return self._live(path) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def missing(self, paths: Sequence[str]) -> List[str]:
+        return [p for p in paths if self._live(p) is None]
+
+    def get_row(self, path: str) -> Optional[np.ndarray]:
+        """Zero-copy view of one embedding, or None when missing or stale."""
+        entry = self._live(path)
+        return None if entry is None else self.shard(entry[2])[entry[3]]
+
+    def get(self, paths: Sequence[str]) -> np.ndarray:
+        """(len(paths), dim) array in the store dtype; raises KeyError for missing paths."""
+        out = np.empty((len(paths), self.dim), dtype=self.dtype)
+        by_shard: Dict[str, Tuple[List[int], List[int]]] = {}
+        for i, p in enumerate(paths):
+            entry = self._live(p)
+            if entry is None:
+                raise KeyError(p)
+            dst, rows = by_shard.setdefault(entry[2], ([], []))
+            dst.append(i)
+            rows.append(entry[3])
+        for name, (dst, rows) in by_shard.items():
+            out[dst] = self.shard(name)[rows]
+        return out
+
+    # -- writes ------------------------------------------------------------
+
+    def put(self, paths: Sequence[str], embeddings: np.ndarray) -> None:
+        embeddings = np.asarray(embeddings)
+        if embeddings.shape != (len(paths), self.dim):
+            raise ValueError(f"Expected embeddings of shape {(len(paths), self.dim)}, got {embeddings.shape}")
+        embeddings = embeddings.astype(self.dtype, copy=False)
+        lines = []
+        touched = set()
+        for path, emb in zip(paths, embeddings):
+            if self._tail is None or self._tail[1] >= len(self.shard(self._tail[0])):
+                self._tail = (self._new_shard(self.meta["shard_rows"]), 0)
+            name, row = self._tail
+            arr = self.shard(name)
+            arr[row] = emb
+            touched.add(name)
+            frame = os.path.abspath(path)
+            size, mtime = frame_key(path)
+            entry = (size, mtime, name, row, zlib.crc32(arr[row].tobytes()))
+            self._entries[frame] = entry
+            lines.append(json.dumps([frame, *entry]) + "\n")
+            self._tail = (name, row + 1)
+        for name in touched:
+            self.shard(name).flush()
+        with open(os.path.join(self.directory, INDEX_FILE), "a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    def ensure(self, paths: Sequence[str], encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Embeddings of `paths`, calling encode() only on the missing or stale ones."""
+        todo = self.missing(paths)
+        if todo:
+            self.put(todo, encode(todo))
+        return self.get(paths)
+
+    # -- maintenance -------------------------------------------------------
+
+    def verify(self) -> Dict[str, object]:
+        """Check every entry: shard readable, row in range, CRC32 matches; also count stale entries."""
+        bad, stale = [], 0
+        for frame, (size, mtime, name, row, crc) in self._entries.items():
+            try:
+                arr = self.shard(name)
+            except (OSError, ValueError):
+                bad.append(frame)
+                continue
+            if arr.dtype != self.dtype or arr.shape[1:] != (self.dim,) or row >= len(arr) \
+                    or zlib.crc32(arr[row].tobytes()) != crc:
+                bad.append(frame)
+            elif self._live(frame) is None:
+                stale += 1
+        return {"entries": len(self._entries), "bad": bad, "stale": stale, "ok": not bad}
+
+    def compact(self, drop_stale: bool = True) -> Dict[str, int]:
+        """Rewrite the valid entries into new, full shards and drop superseded rows.
+
+        Corrupt entries are always dropped; entries whose frame changed or
+        disappeared are dropped too unless `drop_stale` is False.
+        """
+        bad = set(self.verify()["bad"])
+        keep = [f for f in self._entries if f not in bad and (not drop_stale or self._live(f) is not None)]
+        old_files = [f for f in os.listdir(self.directory) if f.endswith(".npy")]
+        self.meta["generation"] += 1
+        rows = self.meta["shard_rows"]
+        entries: Dict[str, Entry] = {}
+        lines = []
+        self._tail = None
+        for start in range(0, len(keep), rows):
+            chunk = keep[start:start + rows]
+            name = self._new_shard(len(chunk))
+            arr = self.shard(name)
+            for row, frame in enumerate(chunk):
+                size, mtime, src, src_row, crc = self._entries[frame]
+                arr[row] = self.shard(src)[src_row]
+                entries[frame] = (size, mtime, name, row, crc)
+                lines.append(json.dumps([frame, *entries[frame]]) + "\n")
+            arr.flush()
+            self._tail = (name, len(chunk))
+        tmp = os.path.join(self.directory, INDEX_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(tmp, os.path.join(self.directory, INDEX_FILE))
+        self._write_json(META_FILE, self.meta)
+
+        removed = len(self._entries) - len(entries)
+        self._entries = entries
+        for name in old_files:
+            self._shards.pop(name, None)
+            os.remove(os.path.join(self.directory, name))
+        return {"kept": len(entries), "removed": removed, "shards": len({e[2] for e in entries.values()})}
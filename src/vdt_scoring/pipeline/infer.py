@@ -1,54 +1,142 @@
-import os, json
-from typing import Dict, Any, List, Tuple, Optional
+import logging
+import os
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
 
-import cv2
 import numpy as np
 
 from ..config import AppCfg
 from ..utils.video_io import read_frames
-from ..scoring.heuristics import edge_energy, blur_score, motion_inconsistency
+from ..scoring.features import FeatureEngine
+from ..scoring.heuristics import HEURISTICS, combine_scores
 from ..scoring.calibration import calibrate
+from ..scoring.segments import OnlineSegmenter
 from ..explain.visual import save_edge_heatmap
 from ..explain.text import textual_reasons
+from ..governance.logging import get_logger, log_event
+from ..privacy.face_blur import FaceAnonymizer
+from ..schemas.validation import ResultsValidator
+from ..utils.timing import StageTimers, profiled
+from .sampling import adaptive_frames
+from .stages import run_pipelined, run_serial
+from .writers import ResultsWriter
+
+def _batches(it: Iterable[Tuple[int, np.ndarray]], size: int) -> Iterator[Tuple[int, List[Tuple[int, np.ndarray]]]]:
+    # Yields (number of frames sampled before this batch, batch).
+    it = iter(it)
+    n = 0
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield n, batch
+        n += len(batch)
 
 def infer_video(path: str, out_dir: str, cfg: AppCfg) -> Dict[str, Any]:
     os.makedirs(out_dir, exist_ok=True)
-    frames: List[Dict[str, Any]] = []
-    prev_frame: Optional[np.ndarray] = None
-
-    for idx, frame in read_frames(path, cfg.sampler.every_nth, cfg.sampler.max_frames):
-        e = edge_energy(frame)
-        b = blur_score(frame)
-        m = motion_inconsistency(prev_frame, frame)
-        raw = cfg.scoring.w_edge * (1.0 - e) + cfg.scoring.w_motion * m + cfg.scoring.w_blur * b
-        score = calibrate(raw)
-
-        heat_path = None
-        if cfg.output.save_heatmaps and (idx // cfg.sampler.every_nth) % cfg.output.save_every_n == 0:
-            heat_path = save_edge_heatmap(frame, os.path.join(out_dir, "heatmaps"), idx)
-
-        frames.append({
-            "index": idx,
-            "score": score,
-            "explanations": textual_reasons(e, m, b),
-            "heatmap_path": heat_path,
-        })
-        prev_frame = frame
-
-    # Aggregate: take top-k suspicious frames and form simple segments (placeholder)
-    scores = [f["score"] for f in frames]
-    global_score = float(np.clip(float(np.mean(scores)), 0, 1)) if scores else 0.0
-
-    results = {
-        "video_path": path,
-        "summary": {
+    writer = ResultsWriter(out_dir, path, cfg.output.format, cfg.output.columnar)
+    totals = {"frames": 0, "score_sum": 0.0}
+    timers = StageTimers(cfg.runtime.timing_sample_every)
+    validator = ResultsValidator(cfg.runtime.validation, cfg.runtime.validation_sample_every)
+    segmenter = OnlineSegmenter(cfg.segments)
+    engine = FeatureEngine(HEURISTICS, max_side=cfg.scoring.analysis_max_side)
+    full_res_heat = cfg.output.heatmap_full_res and cfg.scoring.analysis_max_side > 0
+    heat_dir = os.path.join(out_dir, "heatmaps")
+    anonymizer = None
+    if cfg.output.save_heatmaps and cfg.output.anonymize_heatmaps:
+        anonymizer = FaceAnonymizer(cfg.output.face_detect_every, cfg.output.face_detect_max_side)
+
+    def score(job):
+        n, batch = job
+        heat = []
+        if cfg.output.save_heatmaps:
+            heat = [k for k in range(len(batch)) if (n + k) % cfg.output.save_every_n == 0]
+        with timers.stage("score"):
+            feats, values = engine.process_batch([frame for _, frame in batch], retain=heat)
+            e, b, m = values["edge"], values["blur"], values["motion"]
+            scores = calibrate(combine_scores(e, m, b, cfg.scoring))
+        return batch, feats, e.tolist(), b.tolist(), m.tolist(), scores.tolist()
+
+    def emit(scored):
+        batch, feats, e, b, m, scores = scored
+        heat_paths = {}
+        faces = {}
+        if anonymizer is not None:
+            with timers.stage("anonymize"):
+                # Every sampled frame keeps the tracker's gaps short; heatmap
+                # frames also detect, so no face that appeared since the last
+                # detection is saved unblurred.
+                for k, (_, frame) in enumerate(batch):
+                    boxes = anonymizer.boxes(frame, detect=k in feats)
+                    if k in feats:
+                        faces[k] = boxes
+            timers.count("faces", sum(len(b) for b in faces.values()))
+        if feats:
+            with timers.stage("heatmaps"):
+                for k in feats:
+                    idx, frame = batch[k]
+                    mag = None if full_res_heat else feats[k]["mag"]
+                    heat_paths[k] = save_edge_heatmap(frame, heat_dir, idx, mag=mag, blur=faces.get(k, ()))
+            timers.count("heatmaps", len(feats))
+
+        with timers.stage("output"):
+            records = [{
+                "index": idx,
+                "score": scores[k],
+                "explanations": textual_reasons(e[k], m[k], b[k]),
+                "heatmap_path": heat_paths.get(k),
+            } for k, (idx, _) in enumerate(batch)]
+            index = [idx for idx, _ in batch]
+            writer.write(records, {"index": index, "score": scores, "edge": e, "blur": b, "motion": m})
+        with timers.stage("validate"):
+            validator.records(records)
+        timers.count("frames", len(records))
+        timers.count("batches")
+        totals["frames"] += len(records)
+        for s in scores:  # frame by frame, so the total does not depend on batching
+            totals["score_sum"] += s
+        with timers.stage("segment"):
+            for idx, s in zip(index, scores):
+                segmenter.update(idx, s)
+
+    batch_size = max(1, cfg.scoring.batch_size)
+    ring_size = 0
+    if cfg.runtime.reuse_buffers:
+        # Frames stay referenced until their batch is emitted: one batch in each
+        # stage plus those waiting in the two queues when pipelined.
+        in_flight = 2 * max(1, cfg.runtime.queue_size) + 3 if cfg.runtime.pipelined else 1
+        ring_size = batch_size * in_flight
+    if cfg.sampler.adaptive:
+        frames_iter = adaptive_frames(path, cfg.sampler)
+    else:
+        frames_iter = read_frames(
+            path, cfg.sampler.every_nth, cfg.sampler.max_frames, cfg.sampler.mode, ring_size
+        )
+    jobs = timers.timed(_batches(frames_iter, batch_size), "decode")
+    with writer:
+        with profiled(cfg.runtime.profile_path):
+            if cfg.runtime.pipelined:
+                run_pipelined(jobs, score, emit, cfg.runtime.queue_size)
+            else:
+                run_serial(jobs, score, emit)
+
+        n = totals["frames"]
+        global_score = float(np.clip(totals["score_sum"] / n, 0, 1)) if n else 0.0
+        performance = timers.report()
+        performance["pipelined"] = cfg.runtime.pipelined
+        if cfg.runtime.profile_path:
+            performance["profile_path"] = cfg.runtime.profile_path
+        logger = get_logger()
+        log_event(logger, "infer_video.performance", video=path, **performance)
+        summary = {
             "global_score": global_score,
-            "frames_evaluated": len(frames),
-            "flagged_segments": [],
-        },
-        "frames": frames,
-    }
-
-    with open(os.path.join(out_dir, "results.json"), "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2)
-    return results
+            "frames_evaluated": n,
+            "flagged_segments": segmenter.finish(),
+            "performance": performance,
+        }
+        validator.summary(summary)
+        if validator.mode != "off":
+            summary["validation"] = validator.report()
+        if validator.errors:
+            log_event(logger, "infer_video.schema_errors", logging.WARNING, video=path, errors=validator.errors)
+        return writer.close(summary)
@@ -0,0 +1,124 @@
+import math
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..config import SamplerCfg
+from ..scoring.features import FeatureEngine
+from ..scoring.heuristics import HEURISTICS
+
+HISTORY = 64  # coarse intervals the outlier statistics look back over
+
+
+def _robust_z(x: float, history: deque) -> float:
+    # (x - median) / MAD-based sigma of the history. The sigma floor (10% of
+    # the median) keeps near-constant signals from turning wobbles into outliers.
+    if len(history) < 2:
+        return 0.0
+    h = np.fromiter(history, dtype=np.float64, count=len(history))
+    med = float(np.median(h))
+    sigma = 1.4826 * float(np.median(np.abs(h - med)))
+    return (x - med) / max(sigma, 0.1 * abs(med), 1e-3)
+
+
+class AdaptiveSampler:
+    """Coarse-to-fine sampling in one decoding pass, within a frame budget.
+
+    Every `coarse_every`-th frame is always sampled and scored on a small gray
+    (motion against the previous coarse sample, blur). The frames of the
+    interval leading up to a coarse sample, kept every `fine_every` frames,
+    are sampled too when that interval is suspicious: its motion, or the
+    change in blur across it, is an outlier (robust z-score of at least
+    `adaptive_z`) against the recent intervals, or the motion exceeds
+    `motion_threshold`. Frames are yielded in index order like read_frames.
+
+    For long videos the coarse stride grows so coarse samples take at most
+    half of `max_frames` and span the whole video; only the last
+    `coarse_every` frames of each interval are then candidates. It decodes
+    sequentially (SamplerCfg.mode does not apply), retrieves only candidate
+    frames and reuses the buffers of those it drops, so memory is one window.
+    Sample spacing is not uniform, so frame-to-frame motion is measured over
+    varying gaps.
+    """
+
+    def __init__(self, path: str, cfg: SamplerCfg):
+        self.path = path
+        self.cfg = cfg
+        self.fine = max(1, cfg.fine_every)
+        cap = cv2.VideoCapture(path)
+        self.total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if cap.isOpened() else 0
+        cap.release()
+        stride = max(cfg.coarse_every, self.fine)
+        if self.total > 0:
+            stride = max(stride, math.ceil(self.total / max(1, cfg.max_frames // 2)))
+        self.stride = math.ceil(stride / self.fine) * self.fine  # coarse samples lie on the fine grid
+        # Only the last `coarse_every` frames before a coarse sample are kept for densifying.
+        self.window = min(self.stride, math.ceil(max(cfg.coarse_every, self.fine) / self.fine) * self.fine)
+        self.dense: List[Tuple[int, int]] = []  # densified (start, end) intervals
+        self.frames_read = 0
+
+    def _suspicious(self, motion: float, blur_jump: float, hist_m: deque, hist_b: deque) -> bool:
+        cfg = self.cfg
+        if cfg.motion_threshold is not None and motion >= cfg.motion_threshold:
+            return True
+        # Motion outliers count both ways: a cut or jump can also show up as a dip.
+        return abs(_robust_z(motion, hist_m)) >= cfg.adaptive_z or _robust_z(blur_jump, hist_b) >= cfg.adaptive_z
+
+    def __iter__(self) -> Iterator[Tuple[int, np.ndarray]]:
+        cap = cv2.VideoCapture(self.path)
+        if not cap.isOpened():
+            raise FileNotFoundError(f"Could not open video: {self.path}")
+        try:
+            yield from self._sample(cap)
+        finally:
+            cap.release()
+
+    def _sample(self, cap) -> Iterator[Tuple[int, np.ndarray]]:
+        budget = self.cfg.max_frames
+        coarse_left = math.ceil(self.total / self.stride) if self.total > 0 else budget // 2
+        engine = FeatureEngine(HEURISTICS, max_side=self.cfg.coarse_max_side)
+        hist_m: deque = deque(maxlen=HISTORY)
+        hist_b: deque = deque(maxlen=HISTORY)
+        pending: List[Tuple[int, np.ndarray]] = []  # fine-grid frames since the last coarse sample
+        spare_bufs: List[np.ndarray] = []  # buffers of dropped pending frames, reused
+        prev_idx: Optional[int] = None
+        prev_blur = 0.0
+        idx = -1
+        while budget > 0 and cap.grab():
+            idx += 1
+            pos = idx % self.stride
+            if idx % self.fine or (pos and self.stride - pos > self.window):
+                continue
+            ok, frame = cap.retrieve(spare_bufs.pop() if spare_bufs else None)
+            if not ok:
+                break
+            self.frames_read += 1
+            if pos:
+                pending.append((idx, frame))
+                continue
+
+            _, values = engine.process_batch([frame])
+            motion, blur = float(values["motion"][0]), float(values["blur"][0])
+            if prev_idx is not None:
+                blur_jump = abs(blur - prev_blur)
+                spare = budget - min(coarse_left, budget)  # budget not reserved for coarse samples
+                if pending and spare > 0 and self._suspicious(motion, blur_jump, hist_m, hist_b):
+                    self.dense.append((prev_idx, idx))
+                    yield from pending[:spare]
+                    budget -= min(len(pending), spare)
+                    del pending[:spare]
+                hist_m.append(motion)
+                hist_b.append(blur_jump)
+            spare_bufs.extend(f for _, f in pending)  # never handed out
+            pending.clear()
+            if budget > 0:
+                yield idx, frame
+                budget -= 1
+                coarse_left = max(0, coarse_left - 1)
+            prev_idx, prev_blur = idx, blur
+
+
+def adaptive_frames(path: str, cfg: SamplerCfg) -> Iterator[Tuple[int, np.ndarray]]:
+    return iter(AdaptiveSampler(path, cfg))
@@ -0,0 +1,266 @@
+"""Packed dataset shards: large tar files plus a numpy offset index.
+
+A packed split is `<split>-NNNNN.tar` shards (plain tar, readable by any tar
+tool) and, next to them, `<split>.index.npy` (shard, offset, size of each
+sample's bytes), `<split>.labels.npy` (int8) and `<split>.names.txt`. Readers
+pread() sample bytes straight from the shards, so a sample costs one read
+instead of opening an image and its label file.
+"""
+import csv
+import io
+import json
+import os
+import queue
+import random
+import tarfile
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+SHARD_FORMAT = 1
+META_FILE = "meta.json"
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".webp")
+INDEX_DTYPE = np.dtype([("shard", "<u4"), ("offset", "<u8"), ("size", "<u4")])
+
+Sample = Tuple[str, str, int]  # name, source path, label
+
+_seek_lock = threading.Lock()
+
+
+def _pread(fd: int, size: int, offset: int) -> bytes:
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+    with _seek_lock:  # Windows: no pread, the file position is shared
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, size)
+
+
+def samples_from_unified(root: str, split: str) -> List[Sample]:
+    """Samples of one split of merge_dataset_for_training's output.
+
+    Uses manifest.csv when present (this covers --mode manifest, where no
+    images are materialized), else <split>/images with the .txt labels.
+    Samples are named like the materialized images (their rel_slug), so
+    frames of different videos never share a name.
+    """
+    manifest = os.path.join(root, "manifest.csv")
+    if os.path.exists(manifest):
+        with open(manifest, newline="") as f:
+            rows = [r for r in csv.DictReader(f) if r["split"] == split]
+        # Manifests without a name column predate it and were always materialized
+        return [(r.get("name") or os.path.basename(r["path"]), os.path.join(root, r["path"]), int(r["label"]))
+                for r in rows]
+    img_dir = os.path.join(root, split, "images")
+    lbl_dir = os.path.join(root, split, "labels")
+    samples = []
+    for name in sorted(os.listdir(img_dir)):
+        with open(os.path.join(lbl_dir, os.path.splitext(name)[0] + ".txt")) as f:
+            samples.append((name, os.path.join(img_dir, name), int(f.read().strip())))
+    return samples
+
+
+def samples_from_folders(root: str, label: int) -> List[Sample]:
+    """Every image under root (frame folders, any depth), named by its relative path."""
+    samples = []
+    for d, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTS):
+                path = os.path.join(d, name)
+                samples.append(("__".join(os.path.relpath(path, root).split(os.sep)), path, label))
+    return samples
+
+
+def pack_split(samples: Iterable[Sample], out_dir: str, split: str, shard_bytes: int = 256 << 20) -> Dict:
+    """Write samples into `<split>-NNNNN.tar` shards of about shard_bytes each, plus the index files."""
+    os.makedirs(out_dir, exist_ok=True)
+    index: List[Tuple[int, int, int]] = []
+    labels: List[int] = []
+    names: List[str] = []
+    shards: List[str] = []
+    tar = None
+    for name, path, label in samples:
+        if tar is None or tar.offset >= shard_bytes:
+            if tar is not None:
+                tar.close()
+            shards.append(f"{split}-{len(shards):05d}.tar")
+            tar = tarfile.open(os.path.join(out_dir, shards[-1]), "w", format=tarfile.GNU_FORMAT)
+        with open(path, "rb") as f:
+            data = f.read()
+        info = tarfile.TarInfo(f"{len(names):09d}{os.path.splitext(name)[1].lower()}")
+        info.size = len(data)
+        # The member's data starts right after its header block(s)
+        offset = tar.offset + len(info.tobuf(tar.format, tar.encoding, tar.errors))
+        tar.addfile(info, io.BytesIO(data))
+        index.append((len(shards) - 1, offset, len(data)))
+        labels.append(label)
+        names.append(name)
+    if tar is not None:
+        tar.close()
+
+    np.save(os.path.join(out_dir, f"{split}.index.npy"), np.array(index, dtype=INDEX_DTYPE))
+    np.save(os.path.join(out_dir, f"{split}.labels.npy"), np.array(labels, dtype=np.int8))
+    with open(os.path.join(out_dir, f"{split}.names.txt"), "w", encoding="utf-8") as f:
+        f.writelines(n + "\n" for n in names)
+
+    meta_path = os.path.join(out_dir, META_FILE)
+    meta = {"format": SHARD_FORMAT, "splits": {}}
+    if os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    meta["splits"][split] = {"samples": len(names), "shards": shards,
+                             "bytes": int(sum(s for _, _, s in index))}
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta["splits"][split]
+
+
+def decode_image(data: bytes) -> np.ndarray:
+    """BGR frame from encoded image bytes."""
+    import cv2
+
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+class ShardDataset:
+    """Random access and streaming over one packed split.
+
+    `dataset[i]` is (bytes, label), or (frame, label) with decode=True.
+    stream() reads shards front to back; with shuffle=True the shard order
+    is shuffled per epoch and samples are mixed through a buffer of
+    `buffer_size`. `worker_id`/`num_workers` give each reader a disjoint set
+    of shards, like a DataLoader worker.
+    """
+
+    def __init__(self, root: str, split: str, decode: bool = False):
+        with open(os.path.join(root, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != SHARD_FORMAT:
+            raise ValueError(f"Unsupported shard format {meta.get('format')!r} in {root}")
+        self.root = root
+        self.split = split
+        self.decode = decode
+        self.shards = meta["splits"][split]["shards"]
+        self.index = np.load(os.path.join(root, f"{split}.index.npy"), mmap_mode="r")
+        self.labels = np.load(os.path.join(root, f"{split}.labels.npy"))
+        self._names: Optional[List[str]] = None
+        self._fds: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def names(self) -> List[str]:
+        if self._names is None:
+            with open(os.path.join(self.root, f"{self.split}.names.txt"), "r", encoding="utf-8") as f:
+                self._names = f.read().splitlines()
+        return self._names
+
+    def _fd(self, shard: int) -> int:
+        fd = self._fds.get(shard)
+        if fd is None:
+            with self._lock:
+                fd = self._fds.get(shard)
+                if fd is None:
+                    fd = os.open(os.path.join(self.root, self.shards[shard]), os.O_RDONLY | getattr(os, "O_BINARY", 0))
+                    self._fds[shard] = fd
+        return fd
+
+    def read(self, i: int) -> bytes:
+        shard, offset, size = self.index[i]
+        return _pread(self._fd(int(shard)), int(size), int(offset))
+
+    def _item(self, i: int, data: bytes):
+        return (decode_image(data) if self.decode else data), int(self.labels[i])
+
+    def __getitem__(self, i: int):
+        return self._item(i, self.read(i))
+
+    def _shard_samples(self, shard: int, chunk_bytes: int = 8 << 20) -> Iterator[Tuple[int, bytes]]:
+        # Sequential reads of about chunk_bytes covering consecutive samples, sliced per sample
+        ids = np.flatnonzero(self.index["shard"] == shard)
+        rows = self.index[ids]
+        fd = self._fd(shard) if len(ids) else None
+        lo = 0
+        while lo < len(ids):
+            start = int(rows["offset"][lo])
+            hi = int(np.searchsorted(rows["offset"], start + chunk_bytes, side="right"))
+            hi = max(hi, lo + 1)
+            end = int(rows["offset"][hi - 1] + rows["size"][hi - 1])
+            view = memoryview(_pread(fd, end - start, start))
+            for i, off, size in zip(ids[lo:hi], rows["offset"][lo:hi], rows["size"][lo:hi]):
+                yield int(i), bytes(view[off - start:off - start + size])
+            lo = hi
+
+    def stream(self, shuffle: bool = False, seed: int = 0, epoch: int = 0, buffer_size: int = 1024,
+               worker_id: int = 0, num_workers: int = 1) -> Iterator[Tuple[object, int]]:
+        order = list(range(len(self.shards)))
+        rng = random.Random(f"{seed}:{epoch}")
+        if shuffle:
+            rng.shuffle(order)
+        order = order[worker_id::max(1, num_workers)]
+        buf: List[Tuple[int, bytes]] = []
+        for shard in order:
+            for item in self._shard_samples(shard):
+                if not shuffle:
+                    yield self._item(*item)
+                    continue
+                buf.append(item)
+                if len(buf) >= buffer_size:
+                    j = rng.randrange(len(buf))
+                    buf[j], buf[-1] = buf[-1], buf[j]
+                    yield self._item(*buf.pop())
+        rng.shuffle(buf)
+        for item in buf:
+            yield self._item(*item)
+
+    def parallel_stream(self, num_workers: int = 2, queue_size: int = 256, **kwargs) -> Iterator[Tuple[object, int]]:
+        """stream() split over `num_workers` reader threads (decoding releases the GIL); order is interleaved."""
+        if num_workers <= 1:
+            yield from self.stream(**kwargs)
+            return
+        q: "queue.Queue" = queue.Queue(queue_size)
+        done = object()
+        stop = threading.Event()
+
+        def work(worker_id: int) -> None:
+            try:
+                for item in self.stream(worker_id=worker_id, num_workers=num_workers, **kwargs):
+                    if stop.is_set():
+                        return
+                    q.put(item)
+            except BaseException as e:  # re-raised in the consumer
+                q.put(e)
+            finally:
+                q.put(done)
+
+        threads = [threading.Thread(target=work, args=(w,), name=f"vdt-shard-{w}", daemon=True)
+                   for w in range(num_workers)]
+        for t in threads:
+            t.start()
+        try:
+            running = num_workers
+            while running:
+                item = q.get()
+                if item is done:
+                    running -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stop.set()
+            while any(t.is_alive() for t in threads):
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+                for t in threads:
+                    t.join(0.01)
+
+    def close(self) -> None:
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
@@ -0,0 +1,89 @@
+import queue
+import threading
+from typing import Any, Callable, Iterable, List
+
+_DONE = object()
+
+
+class _Failed:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def run_serial(source: Iterable[Any], transform: Callable[[Any], Any], sink: Callable[[Any], None]) -> None:
+    for item in source:
+        sink(transform(item))
+
+
+def run_pipelined(
+    source: Iterable[Any],
+    transform: Callable[[Any], Any],
+    sink: Callable[[Any], None],
+    queue_size: int = 2,
+) -> None:
+    """Same contract as run_serial, but source, transform and sink each run on their own thread.
+
+    The stages are connected by bounded FIFO queues, so items reach the sink in
+    source order and at most `queue_size` items wait between two stages. The sink
+    runs on the calling thread; the first exception from any stage is re-raised.
+    """
+    stop = threading.Event()
+    q_in: "queue.Queue[Any]" = queue.Queue(max(1, queue_size))
+    q_out: "queue.Queue[Any]" = queue.Queue(max(1, queue_size))
+
+    def put(q, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in source:
+                if not put(q_in, item):
+                    return
+        except BaseException as e:
+            put(q_in, _Failed(e))
+            return
+        put(q_in, _DONE)
+
+    def work():
+        while True:
+            item = q_in.get()
+            if item is _DONE or isinstance(item, _Failed):
+                put(q_out, item)
+                return
+            try:
+                result = transform(item)
+            except BaseException as e:
+                put(q_out, _Failed(e))
+                return
+            if not put(q_out, result):
+                return
+
+    threads: List[threading.Thread] = [
+        threading.Thread(target=produce, name="vdt-decode", daemon=True),
+        threading.Thread(target=work, name="vdt-score", daemon=True),
+    ]
+    for t in threads:
+        t.start()
+    try:
+        while True:
+            item = q_out.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failed):
+                raise item.exc
+            sink(item)
+    finally:
+        stop.set()
+        # Unblock a worker waiting on an empty input queue after a sink failure.
+        try:
+            q_in.put_nowait(_DONE)
+        except queue.Full:
+            pass
+        for t in threads:
+            t.join()
@@ -1,2 +1,180 @@
-# Placeholder for training code.
-# Replace heuristics with a learned model and document training here.
+"""Train the ResNet-18 trust head on cached backbone features.
+
+The backbone is frozen, so its 1000 logits per frame are extracted once into
+an EmbeddingStore (pipeline.embeddings) and the head trains from those
+arrays; later runs and epochs never decode an image. The store is keyed on
+frame path, size and mtime. `feature_store` is a root directory laid out
+like MultiModalScorer(feature_store=...)'s (logits in <root>/resnet18), so
+passing the same root to both lets inference reuse the training features;
+this needs the default float16 feature dtype. The checkpoint loads with
+scoring.multimodal.load_trust_head.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .. import __version__
+from ..scoring.multimodal import BACKBONE, HEAD_FORMAT, backbone_store, build_trust_head
+from .embeddings import EmbeddingStore
+from .shards import samples_from_unified
+
+FEATURE_DIM = 1000
+SPLITS = ("train", "val", "test")
+
+Encoder = Callable[[List[str]], np.ndarray]
+
+
+def backbone_encoder(batch_size: int = 64, workers: int = 4, threads: Optional[int] = None) -> Encoder:
+    """paths -> (n, 1000) float32 ResNet-18 logits; images are decoded by a thread pool."""
+    import torch
+    from PIL import Image
+
+    from ..scoring.multimodal import build_resnet_transform, load_backbone
+
+    if threads:
+        torch.set_num_threads(threads)
+    model = load_backbone().to(memory_format=torch.channels_last)
+    transform = build_resnet_transform()
+
+    def load(path):
+        with Image.open(path) as im:
+            return transform(im.convert("RGB"))
+
+    def encode(paths: List[str]) -> np.ndarray:
+        out = np.empty((len(paths), FEATURE_DIM), dtype=np.float32)
+        with ThreadPoolExecutor(max(1, workers)) as pool, torch.inference_mode():
+            for start in range(0, len(paths), batch_size):
+                chunk = paths[start:start + batch_size]
+                x = torch.stack(list(pool.map(load, chunk))).contiguous(memory_format=torch.channels_last)
+                out[start:start + len(chunk)] = model(x).numpy()
+        return out
+
+    return encode
+
+
+def split_features(unified: str, split: str, store: EmbeddingStore, encode: Encoder) -> Tuple[np.ndarray, np.ndarray]:
+    """Features (store dtype) and labels of one unified split; only uncached frames are encoded."""
+    samples = samples_from_unified(unified, split)
+    if not samples:
+        return np.empty((0, store.dim), dtype=store.dtype), np.empty(0, dtype=np.float32)
+    paths = [path for _, path, _ in samples]
+    features = store.ensure(paths, encode)
+    return features, np.array([label for _, _, label in samples], dtype=np.float32)
+
+
+def _evaluate(head, x, y, batch_size: int = 4096) -> Dict[str, float]:
+    import torch
+
+    if len(y) == 0:
+        return {"loss": float("nan"), "accuracy": float("nan")}
+    head.eval()
+    with torch.inference_mode():
+        probs = torch.cat([head(x[i:i + batch_size].float()).squeeze(1) for i in range(0, len(y), batch_size)])
+        loss = torch.nn.functional.binary_cross_entropy(probs, y).item()
+        acc = ((probs >= 0.5).float() == y).float().mean().item()
+    return {"loss": round(loss, 5), "accuracy": round(acc, 5)}
+
+
+def train_head(train: Tuple[np.ndarray, np.ndarray], val: Tuple[np.ndarray, np.ndarray], epochs: int = 30,
+               batch_size: int = 256, lr: float = 1e-3, weight_decay: float = 1e-4, seed: int = 0,
+               hidden: int = 256, dropout: float = 0.2):
+    """Fit the trust head on (features, labels); keeps the weights with the best validation loss.
+
+    Features stay in their stored dtype in memory and are cast per batch.
+    Returns (head, arch, history).
+    """
+    import torch
+
+    torch.manual_seed(seed)
+    x_tr, y_tr = torch.from_numpy(np.ascontiguousarray(train[0])), torch.from_numpy(train[1])
+    x_va, y_va = torch.from_numpy(np.ascontiguousarray(val[0])), torch.from_numpy(val[1])
+    arch = {"in_dim": int(x_tr.shape[1]), "hidden": hidden, "dropout": dropout}
+    head = build_trust_head(**arch)
+    opt = torch.optim.AdamW(head.parameters(), lr=lr, weight_decay=weight_decay)
+    loss_fn = torch.nn.BCELoss()
+    gen = torch.Generator().manual_seed(seed)
+
+    history = []
+    best, best_state = float("inf"), None
+    for epoch in range(epochs):
+        t0 = time.perf_counter()
+        head.train()
+        total = 0.0
+        for idx in torch.randperm(len(y_tr), generator=gen).split(batch_size):
+            opt.zero_grad(set_to_none=True)
+            loss = loss_fn(head(x_tr[idx].float()).squeeze(1), y_tr[idx])
+            loss.backward()
+            opt.step()
+            total += loss.item() * len(idx)
+        metrics = {"epoch": epoch + 1, "train_loss": round(total / max(1, len(y_tr)), 5),
+                   **{f"val_{k}": v for k, v in _evaluate(head, x_va, y_va).items()},
+                   "seconds": round(time.perf_counter() - t0, 4)}
+        history.append(metrics)
+        score = metrics["val_loss"] if len(y_va) else metrics["train_loss"]
+        if score < best:
+            best = score
+            best_state = {k: v.detach().clone() for k, v in head.state_dict().items()}
+    if best_state is not None:
+        head.load_state_dict(best_state)
+    head.eval()
+    return head, arch, history
+
+
+def save_checkpoint(path: str, head, arch: Dict, metrics: Dict) -> None:
+    import torch
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    torch.save({
+        "format": HEAD_FORMAT,
+        "backbone": BACKBONE,
+        "code_version": __version__,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "arch": arch,
+        "state_dict": head.state_dict(),
+        "metrics": metrics,
+    }, path)
+
+
+def train_from_unified(unified: str, out_path: str, feature_store: Optional[str] = None, epochs: int = 30,
+                       batch_size: int = 256, lr: float = 1e-3, seed: int = 0,
+                       encode: Optional[Encoder] = None, feature_dtype: str = "float16") -> Dict:
+    """Cache features of the unified splits, train the head, evaluate on test and write the checkpoint.
+
+    Features are kept under `feature_store` (default <unified>/.features).
+    """
+    import torch
+
+    store = backbone_store(feature_store or os.path.join(unified, ".features"), feature_dtype)
+    if encode is None:
+        loaded: List[Encoder] = []
+
+        def encode(paths: List[str]) -> np.ndarray:
+            # The backbone only loads when some frame is not cached yet
+            if not loaded:
+                loaded.append(backbone_encoder())
+            return loaded[0](paths)
+
+    t0 = time.perf_counter()
+    data = {split: split_features(unified, split, store, encode) for split in SPLITS}
+    extract_s = time.perf_counter() - t0
+    if len(data["train"][1]) == 0:
+        raise RuntimeError(f"No training samples found in {unified}")
+
+    head, arch, history = train_head(data["train"], data["val"], epochs, batch_size, lr, seed=seed)
+    x_te, y_te = data["test"]
+    test = _evaluate(head, torch.from_numpy(np.ascontiguousarray(x_te)), torch.from_numpy(y_te))
+    metrics = {
+        "samples": {split: int(len(data[split][1])) for split in SPLITS},
+        "feature_seconds": round(extract_s, 3),
+        "epoch_seconds": round(sum(h["seconds"] for h in history) / max(1, len(history)), 4),
+        "best_epoch": min(history, key=lambda h: h["val_loss"] if len(data["val"][1]) else h["train_loss"])["epoch"],
+        "test": test,
+        "history": history,
+    }
+    save_checkpoint(out_path, head, arch, metrics)
+    return metrics
@@ -0,0 +1,99 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import orjson
+
+RESULT_FORMATS = ("json", "jsonl")
+COLUMNAR_FORMATS = ("npz", "parquet")
+COLUMNS = ("index", "score", "edge", "blur", "motion")
+
+
+def write_results_json(out_dir: str, results: Dict[str, Any]) -> str:
+    """Write results.json: indented when frames are inline, compact when they are streamed."""
+    path = os.path.join(out_dir, "results.json")
+    if "frames_file" in results:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(results))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return path
+
+
+class ResultsWriter:
+    """Writes per-frame records as they are produced, and the summary at the end.
+
+    json  - legacy: frames are kept in memory and dumped once to an indented results.json
+    jsonl - frames are appended to frames.jsonl (one compact orjson record per line);
+            results.json then only holds the summary and a `frames_file` pointer
+    `columnar` additionally writes the numeric per-frame columns to frames.npz or
+    frames.parquet (the latter needs pandas with a parquet engine).
+    """
+
+    def __init__(self, out_dir: str, video_path: str, fmt: str = "json", columnar: Optional[str] = None):
+        if fmt not in RESULT_FORMATS:
+            raise ValueError(f"Unknown results format '{fmt}', expected one of {RESULT_FORMATS}")
+        if columnar and columnar not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format '{columnar}', expected one of {COLUMNAR_FORMATS}")
+        self.out_dir = out_dir
+        self.video_path = video_path
+        self.fmt = fmt
+        self.columnar = columnar or None
+        if self.columnar == "parquet":
+            # Fail before scoring rather than after, if no parquet engine is installed.
+            import pandas as pd
+
+            pd.io.parquet.get_engine("auto")
+        self.frames: List[Dict[str, Any]] = []
+        self._columns: Dict[str, List[np.ndarray]] = {c: [] for c in COLUMNS}
+        self._fh = None
+        if fmt == "jsonl":
+            self._fh = open(os.path.join(out_dir, "frames.jsonl"), "wb", buffering=1 << 20)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def write(self, records: List[Dict[str, Any]], columns: Optional[Dict[str, Any]] = None) -> None:
+        if self._fh is not None:
+            self._fh.write(b"".join(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in records))
+        else:
+            self.frames.extend(records)
+        if self.columnar and columns is not None:
+            for c in COLUMNS:
+                self._columns[c].append(np.asarray(columns[c]))
+
+    def close(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        results: Dict[str, Any] = {"video_path": self.video_path, "summary": summary}
+        if self.columnar:
+            results["columns_file"] = self._write_columns()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            results["frames_file"] = "frames.jsonl"
+        else:
+            results["frames"] = self.frames
+        write_results_json(self.out_dir, results)
+        return results
+
+    def _write_columns(self) -> str:
+        cols = {
+            c: np.concatenate(parts) if parts else np.empty(0)
+            for c, parts in self._columns.items()
+        }
+        cols["index"] = cols["index"].astype(np.int64)
+        if self.columnar == "npz":
+            name = "frames.npz"
+            np.savez(os.path.join(self.out_dir, name), **cols)
+        else:
+            import pandas as pd
+
+            name = "frames.parquet"
+            pd.DataFrame(cols).to_parquet(os.path.join(self.out_dir, name), index=False)
+        return name
@@ -1,14 +1,147 @@
 import cv2
 import numpy as np
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple
 
-def blur_faces(frame):
+Box = Tuple[int, int, int, int]  # x, y, w, h
+
+DEFAULT_CASCADE = "haarcascade_frontalface_default.xml"
+
+
+@lru_cache(maxsize=None)
+def load_cascade(name: str = DEFAULT_CASCADE) -> cv2.CascadeClassifier:
+    """Parse a cascade once per process; `name` is a file in cv2.data.haarcascades or a path."""
+    path = name if "/" in name or "\\" in name else cv2.data.haarcascades + name
+    cascade = cv2.CascadeClassifier(path)
+    if cascade.empty():
+        raise FileNotFoundError(f"Could not load cascade: {path}")
+    return cascade
+
+
+def _downscaled_gray(frame: np.ndarray, max_side: int) -> Tuple[np.ndarray, float]:
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    scale = 1.0
+    if max_side and max(gray.shape) > max_side:
+        scale = max_side / max(gray.shape)
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return gray, scale
+
+
+def detect_faces(gray: np.ndarray, scale_factor: float = 1.3, min_neighbors: int = 5) -> List[Box]:
+    faces = load_cascade().detectMultiScale(gray, scale_factor, min_neighbors)
+    return [tuple(int(v) for v in f) for f in faces]
+
+
+def blur_boxes(frame: np.ndarray, boxes: Sequence[Box]) -> np.ndarray:
+    """Blur each box of `frame` in place (boxes are clipped to the frame)."""
+    fh, fw = frame.shape[:2]
+    for (x, y, w, h) in boxes:
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(fw, x + w), min(fh, y + h)
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            continue
+        roi = frame[y0:y1, x0:x1]
+        roi[...] = cv2.GaussianBlur(roi, (51, 51), 30)
+    return frame
+
+
+def blur_faces(frame, max_side: int = 640):
     # Simple Haar cascade face blurring as a placeholder.
     # In production, use more robust detectors.
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-    faces = face_cascade.detectMultiScale(gray, 1.3, 5)
-    for (x, y, w, h) in faces:
-        roi = frame[y:y+h, x:x+w]
-        roi = cv2.GaussianBlur(roi, (51, 51), 30)
-        frame[y:y+h, x:x+w] = roi
-    return frame
+    gray, scale = _downscaled_gray(frame, max_side)
+    boxes = [tuple(int(round(v / scale)) for v in b) for b in detect_faces(gray)]
+    return blur_boxes(frame, boxes)
+
+
+def _shift_box(prev_gray: np.ndarray, gray: np.ndarray, box: Box) -> Box:
+    # Median Lucas-Kanade displacement of corners inside the box; the box keeps
+    # its place when nothing trackable is found.
+    x, y, w, h = box
+    H, W = prev_gray.shape
+    x0, y0, x1, y1 = max(0, x), max(0, y), min(W, x + w), min(H, y + h)
+    if x1 - x0 < 4 or y1 - y0 < 4:
+        return box
+    pts = cv2.goodFeaturesToTrack(prev_gray[y0:y1, x0:x1], 24, 0.01, 3)
+    if pts is None:
+        return box
+    pts = pts + np.array([x0, y0], dtype=np.float32)
+    nxt, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, pts, None, winSize=(15, 15), maxLevel=3)
+    good = status.ravel() == 1
+    if not good.any():
+        return box
+    dx, dy = np.median((nxt - pts)[good].reshape(-1, 2), axis=0)
+    return (int(round(x + dx)), int(round(y + dy)), w, h)
+
+
+def _overlaps(a: Box, b: Box, min_iou: float = 0.3) -> bool:
+    ix = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    iy = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if ix <= 0 or iy <= 0:
+        return False
+    inter = ix * iy
+    return inter / float(a[2] * a[3] + b[2] * b[3] - inter) >= min_iou
+
+
+class FaceAnonymizer:
+    """Face boxes for a sequence of frames, detecting every `detect_every` frames.
+
+    Feed it every frame of the sequence, so boxes are tracked across short
+    gaps. Detection and tracking run on a gray copy downscaled to `max_side`;
+    frames in between detections reuse the last boxes shifted by optical
+    flow. `boxes(frame, detect=True)` forces a detection, for frames whose
+    boxes will be blurred: a face that appeared since the last detection is
+    then found too. A tracked box the detector misses is kept until it is
+    `detect_every` frames past its last detection. Boxes are returned in
+    frame coordinates, enlarged by `pad` on each side.
+    """
+
+    def __init__(
+        self,
+        detect_every: int = 5,
+        max_side: int = 480,
+        pad: float = 0.15,
+        detector: Optional[Callable[[np.ndarray], List[Box]]] = None,
+    ):
+        self.detect_every = max(1, detect_every)
+        self.max_side = max_side
+        self.pad = pad
+        self.detector = detector or detect_faces
+        self.reset()
+
+    def reset(self) -> None:
+        self._n = 0
+        self._prev: Optional[np.ndarray] = None
+        self._boxes: List[Box] = []
+        self._ages: List[int] = []  # frames since each box was last detected
+        self.detections = 0
+
+    def boxes(self, frame: np.ndarray, detect: bool = False) -> List[Box]:
+        gray, scale = _downscaled_gray(frame, self.max_side)
+        if self._prev is None or self._prev.shape != gray.shape:
+            self._boxes, self._ages = [], []
+            detect = True
+        elif self._boxes:
+            self._boxes = [_shift_box(self._prev, gray, b) for b in self._boxes]
+            self._ages = [a + 1 for a in self._ages]
+        if detect or self._n % self.detect_every == 0:
+            found = [tuple(int(v) for v in b) for b in self.detector(gray)]
+            kept = [(b, a) for b, a in zip(self._boxes, self._ages)
+                    if a < self.detect_every and not any(_overlaps(b, f) for f in found)]
+            self._boxes = found + [b for b, _ in kept]
+            self._ages = [0] * len(found) + [a for _, a in kept]
+            self.detections += 1
+        self._prev = gray
+        self._n += 1
+
+        out = []
+        for (x, y, w, h) in self._boxes:
+            px, py = w * self.pad, h * self.pad
+            out.append((
+                int((x - px) / scale), int((y - py) / scale),
+                int(np.ceil((w + 2 * px) / scale)), int(np.ceil((h + 2 * py) / scale)),
+            ))
+        return out
+
+    def __call__(self, frame: np.ndarray) -> np.ndarray:
+        """Blur the faces of `frame` in place."""
+        return blur_boxes(frame, self.boxes(frame))
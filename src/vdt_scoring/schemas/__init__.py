@@ -1 +1,4 @@
 # Schema package
+import os
+
+RESULTS_SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "results_schema.json")
@@ -0,0 +1,83 @@
+import json
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from jsonschema import ValidationError
+from jsonschema.validators import validator_for
+
+from . import RESULTS_SCHEMA_PATH
+
+# strict  - validate every frame record and the summary; raise on the first error
+# full    - validate everything, collect errors instead of raising
+# sampled - every `sample_every`-th frame record plus the summary
+# summary - the summary only
+# off     - no validation
+VALIDATION_MODES = ("strict", "full", "sampled", "summary", "off")
+MAX_ERRORS = 20
+
+
+@lru_cache(maxsize=None)
+def load_results_schema() -> Dict[str, Any]:
+    with open(RESULTS_SCHEMA_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def _compiled(part: str):
+    schema = load_results_schema()
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    if part == "results":
+        return cls(schema)
+    if part == "frame":
+        return cls(schema["properties"]["frames"]["items"])
+    return cls(schema["properties"][part])
+
+
+def validate_results(results: Dict[str, Any]) -> None:
+    """Validate a complete results object (walks every inline frame); raises ValidationError."""
+    _compiled("results").validate(results)
+
+
+class ResultsValidator:
+    """Validates frame records as they are emitted and the summary at the end.
+
+    Validators are compiled once per process and shared by all instances.
+    """
+
+    def __init__(self, mode: str = "sampled", sample_every: int = 50):
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode '{mode}', expected one of {VALIDATION_MODES}")
+        self.mode = mode
+        self.sample_every = 1 if mode in ("strict", "full") else max(1, sample_every)
+        self.checked = 0
+        self.errors: List[str] = []
+        self._seen = 0
+
+    def _check(self, part: str, instance: Any, where: str) -> None:
+        if self.mode == "strict":
+            _compiled(part).validate(instance)
+            return
+        for e in _compiled(part).iter_errors(instance):
+            if len(self.errors) < MAX_ERRORS:
+                path = "/".join(str(p) for p in e.absolute_path)
+                self.errors.append(f"{where}{'/' + path if path else ''}: {e.message}")
+
+    def records(self, records: List[Dict[str, Any]]) -> None:
+        if self.mode in ("summary", "off"):
+            return
+        for rec in records:
+            if self._seen % self.sample_every == 0:
+                self._check("frame", rec, f"frames/{rec.get('index')}")
+                self.checked += 1
+            self._seen += 1
+
+    def summary(self, summary: Dict[str, Any]) -> None:
+        if self.mode != "off":
+            self._check("summary", summary, "summary")
+
+    def report(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "records_checked": self.checked, "errors": list(self.errors)}
+
+
+__all__ = ["ResultsValidator", "ValidationError", "VALIDATION_MODES", "load_results_schema", "validate_results"]
@@ -1,4 +1,8 @@
-def calibrate(score: float) -> float:
+import numpy as np
+
+def calibrate(score):
     # Placeholder for Platt scaling / isotonic regression.
-    # Keep identity mapping for demo.
+    # Keep identity mapping for demo. Arrays are calibrated element-wise.
+    if np.ndim(score):
+        return np.clip(np.asarray(score, dtype=np.float64), 0.0, 1.0)
     return float(max(0.0, min(1.0, score)))
@@ -0,0 +1,231 @@
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+
+def _gray(feats: "FrameFeatures") -> np.ndarray:
+    return cv2.cvtColor(feats.frame, cv2.COLOR_BGR2GRAY, dst=feats.out("gray"))
+
+
+def _sobel_x(feats: "FrameFeatures") -> np.ndarray:
+    return cv2.Sobel(feats["gray"], cv2.CV_32F, 1, 0, dst=feats.out("gx"), ksize=3)
+
+
+def _sobel_y(feats: "FrameFeatures") -> np.ndarray:
+    return cv2.Sobel(feats["gray"], cv2.CV_32F, 0, 1, dst=feats.out("gy"), ksize=3)
+
+
+def _magnitude(feats: "FrameFeatures") -> np.ndarray:
+    return cv2.magnitude(feats["gx"], feats["gy"], magnitude=feats.out("mag"))
+
+
+def _laplacian(feats: "FrameFeatures") -> np.ndarray:
+    # 3x3 Laplacian of uint8 input lies in [-1020, 1020]: int16 is exact and
+    # a quarter of the float64 footprint.
+    return cv2.Laplacian(feats["gray"], cv2.CV_16S, dst=feats.out("lap"))
+
+
+# Intermediate name -> producer. Producers pull their own inputs through the
+# cache, so e.g. "mag" computes "gray", "gx" and "gy" at most once each.
+INTERMEDIATES: Dict[str, Callable[["FrameFeatures"], np.ndarray]] = {
+    "gray": _gray,
+    "gx": _sobel_x,
+    "gy": _sobel_y,
+    "mag": _magnitude,
+    "lap": _laplacian,
+}
+
+# Element type of each intermediate, used to size reusable output buffers.
+DTYPES = {"gray": np.uint8, "gx": np.float32, "gy": np.float32, "mag": np.float32, "lap": np.int16}
+
+
+def pyramid_levels(shape: Tuple[int, ...], max_side: int) -> int:
+    """Number of pyrDown halvings that bring the longer side to at most max_side (0 = none)."""
+    h, w = shape[:2]
+    levels = 0
+    while max_side > 0 and max(h, w) > max_side and min(h, w) > 1:
+        h, w = (h + 1) // 2, (w + 1) // 2
+        levels += 1
+    return levels
+
+
+def requires(*names: str):
+    """Declare the intermediates a heuristic reads (e.g. "mag", "lap", "prev_gray")."""
+
+    def deco(fn):
+        fn.requires = tuple(names)
+        return fn
+
+    return deco
+
+
+def batched(stack_fn: Callable[..., np.ndarray]):
+    """Attach a vectorized implementation, called as stack_fn(grays, prev_gray, workspace)."""
+
+    def deco(fn):
+        fn.batch = stack_fn
+        return fn
+
+    return deco
+
+
+class Workspace:
+    """Named output buffers reused from frame to frame to keep the hot loop allocation-free."""
+
+    def __init__(self):
+        self._bufs: Dict[str, np.ndarray] = {}
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        buf = self._bufs.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._bufs[name] = buf
+        return buf
+
+
+class FrameFeatures:
+    """Per-frame cache of intermediates shared by all heuristics and the heatmap.
+
+    With a workspace, intermediates are written into its buffers and are only
+    valid until the next frame is processed with the same workspace.
+    """
+
+    def __init__(
+        self,
+        frame: Optional[np.ndarray],
+        prev_gray: Optional[np.ndarray] = None,
+        gray: Optional[np.ndarray] = None,
+        workspace: Optional[Workspace] = None,
+    ):
+        self.frame = frame
+        self.prev_gray = prev_gray
+        self.workspace = workspace
+        self._cache: Dict[str, np.ndarray] = {}
+        if gray is not None:
+            self._cache["gray"] = gray
+
+    def out(self, name: str) -> Optional[np.ndarray]:
+        """Destination buffer for intermediate `name`, or None to let OpenCV allocate."""
+        if self.workspace is None:
+            return None
+        shape = self.frame.shape[:2] if name == "gray" else self["gray"].shape
+        return self.workspace.get(name, shape, DTYPES[name])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        value = self._cache.get(name)
+        if value is None:
+            if name not in INTERMEDIATES:
+                raise KeyError(f"Unknown intermediate: {name}")
+            value = INTERMEDIATES[name](self)
+            self._cache[name] = value
+        return value
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._cache
+
+    def prefetch(self, names: Iterable[str]) -> None:
+        for name in names:
+            if name != "prev_gray":
+                self[name]
+
+
+class FeatureEngine:
+    """Evaluates a set of heuristics frame by frame.
+
+    Intermediates are computed once per frame and shared; the gray image of the
+    previous frame is carried forward when any heuristic declares "prev_gray".
+    With max_side > 0 heuristics see a pyramid-downscaled gray whose longer side
+    is at most max_side; all intermediates are then at that resolution.
+    """
+
+    def __init__(
+        self,
+        heuristics: Dict[str, Callable[[FrameFeatures], float]],
+        prev_gray: Optional[np.ndarray] = None,
+        max_side: int = 0,
+    ):
+        self.heuristics = dict(heuristics)
+        self._per_frame = {k: fn for k, fn in self.heuristics.items() if not hasattr(fn, "batch")}
+        self._stacked = {k: fn.batch for k, fn in self.heuristics.items() if hasattr(fn, "batch")}
+        needed = set()
+        for fn in self.heuristics.values():
+            needed.update(getattr(fn, "requires", ()))
+        self.required: Tuple[str, ...] = tuple(sorted(needed))
+        self._keep_prev = "prev_gray" in needed
+        self._prev_gray = prev_gray
+        self._workspace = Workspace()
+        self.max_side = max_side
+
+    def reset(self) -> None:
+        self._prev_gray = None
+
+    def analysis_gray(
+        self, frame: np.ndarray, dst: Optional[np.ndarray] = None, workspace: Optional[Workspace] = None
+    ) -> np.ndarray:
+        """BGR frame -> gray at analysis resolution, optionally written into `dst`."""
+        levels = pyramid_levels(frame.shape, self.max_side)
+        if levels == 0:
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=dst)
+        buf = workspace.get("gray_full", frame.shape[:2], np.uint8) if workspace is not None else None
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=buf)
+        for level in range(levels):
+            out = dst
+            if level < levels - 1:
+                shape = ((gray.shape[0] + 1) // 2, (gray.shape[1] + 1) // 2)
+                out = workspace.get(f"pyr{level}", shape, np.uint8) if workspace is not None else None
+            gray = cv2.pyrDown(gray, dst=out)
+        return gray
+
+    def analysis_shape(self, shape: Tuple[int, ...]) -> Tuple[int, int]:
+        h, w = shape[:2]
+        for _ in range(pyramid_levels(shape, self.max_side)):
+            h, w = (h + 1) // 2, (w + 1) // 2
+        return h, w
+
+    def process(self, frame: np.ndarray) -> Tuple[FrameFeatures, Dict[str, float]]:
+        feats = FrameFeatures(frame, prev_gray=self._prev_gray, gray=self.analysis_gray(frame))
+        feats.prefetch(self.required)
+        values = {name: fn(feats) for name, fn in self.heuristics.items()}
+        if self._keep_prev:
+            self._prev_gray = feats["gray"]
+        return feats, values
+
+    def process_batch(
+        self, frames: Sequence[np.ndarray], retain: Iterable[int] = ()
+    ) -> Tuple[Dict[int, FrameFeatures], Dict[str, np.ndarray]]:
+        """Score a batch of BGR frames; returns features of the `retain` positions and value arrays."""
+        shape = (len(frames),) + self.analysis_shape(frames[0].shape)
+        grays = self._workspace.get("grays", shape, np.uint8)
+        for i, frame in enumerate(frames):
+            self.analysis_gray(frame, dst=grays[i], workspace=self._workspace)
+        return self.score_grays(grays, frames, retain)
+
+    def score_grays(
+        self,
+        grays: np.ndarray,
+        frames: Optional[Sequence[np.ndarray]] = None,
+        retain: Iterable[int] = (),
+    ) -> Tuple[Dict[int, FrameFeatures], Dict[str, np.ndarray]]:
+        retain = set(retain)
+        n = len(grays)
+        values = {name: np.empty(n, dtype=np.float64) for name in self._per_frame}
+        kept: Dict[int, FrameFeatures] = {}
+        prev = self._prev_gray
+        for i in range(n):
+            frame = frames[i] if frames is not None else None
+            if i in retain:
+                # Retained features outlive this batch, so they own their arrays.
+                feats = FrameFeatures(frame, prev_gray=prev, gray=grays[i].copy())
+                kept[i] = feats
+            else:
+                feats = FrameFeatures(frame, prev_gray=prev, gray=grays[i], workspace=self._workspace)
+            for name, fn in self._per_frame.items():
+                values[name][i] = fn(feats)
+            prev = grays[i]
+        for name, fn in self._stacked.items():
+            values[name] = fn(grays, self._prev_gray, self._workspace)
+        if self._keep_prev and n:
+            self._prev_gray = self._workspace.get("prev_gray", grays.shape[1:], np.uint8)
+            np.copyto(self._prev_gray, grays[-1])
+        return kept, values
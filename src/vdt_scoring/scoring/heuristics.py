@@ -1,27 +1,84 @@
 import numpy as np
 import cv2
+from typing import Dict, Optional
 
-def edge_energy(frame: np.ndarray) -> float:
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    gx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
-    gy = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
-    mag = cv2.magnitude(gx, gy)
+from .features import FeatureEngine, FrameFeatures, Workspace, batched, requires
+
+
+@requires("mag")
+def edge_energy_from_features(feats: FrameFeatures) -> float:
     # Normalize by image size to [0,1]
-    return float(np.clip(np.mean(mag) / 255.0, 0, 1))
+    return float(np.clip(np.mean(feats["mag"]) / 255.0, 0, 1))
 
-def blur_score(frame: np.ndarray) -> float:
+
+@requires("lap")
+def blur_score_from_features(feats: FrameFeatures) -> float:
     # Lower variance of Laplacian indicates blur. Convert to a "risk" score.
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    var_lap = cv2.Laplacian(gray, cv2.CV_64F).var()
+    # meanStdDev avoids the full-size float64 temporary of ndarray.var().
+    var_lap = float(cv2.meanStdDev(feats["lap"])[1][0, 0]) ** 2
     # Heuristic mapping: small variance -> higher risk (more blur/compression)
     return float(np.clip(1.0 - (var_lap / 1000.0), 0, 1))
 
-def motion_inconsistency(prev_frame: np.ndarray, frame: np.ndarray) -> float:
+
+def motion_inconsistency_stack(
+    grays: np.ndarray, prev_gray: Optional[np.ndarray] = None, workspace: Optional[Workspace] = None
+) -> np.ndarray:
+    # Mean absolute difference of each frame to its predecessor, for the whole stack at once.
+    n, h, w = grays.shape
+    out = np.zeros(n, dtype=np.float64)
+    diff = None
+    if workspace is not None and n:
+        diff = workspace.get("diff", (max(n - 1, 1) * h, w), np.uint8)
+    if prev_gray is not None and n:
+        first = diff[:h] if diff is not None else None
+        out[0] = cv2.mean(cv2.absdiff(prev_gray, grays[0], dst=first))[0]
+    if n > 1:
+        # Viewing the stack as one tall image lets a single absdiff cover every pair.
+        diff = cv2.absdiff(grays[1:].reshape(-1, w), grays[:-1].reshape(-1, w), dst=diff)
+        # cv2.mean sums uint8 exactly without numpy's casting buffers.
+        for i, d in enumerate(diff.reshape(n - 1, h, w), start=1):
+            out[i] = cv2.mean(d)[0]
+    return np.clip(out / 255.0, 0, 1)
+
+
+@batched(motion_inconsistency_stack)
+@requires("gray", "prev_gray")
+def motion_inconsistency_from_features(feats: FrameFeatures) -> float:
     # Simple temporal difference as inconsistency proxy
+    if feats.prev_gray is None:
+        return 0.0
+    diff = cv2.absdiff(feats.prev_gray, feats["gray"])
+    return float(np.clip(np.mean(diff) / 255.0, 0, 1))
+
+
+# Heuristics evaluated by the inference pipeline, keyed by result name.
+HEURISTICS = {
+    "edge": edge_energy_from_features,
+    "blur": blur_score_from_features,
+    "motion": motion_inconsistency_from_features,
+}
+
+
+def score_stack(grays: np.ndarray, prev_gray: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Score an (N, H, W) uint8 gray stack; returns arrays keyed like HEURISTICS."""
+    return FeatureEngine(HEURISTICS, prev_gray=prev_gray).score_grays(grays)[1]
+
+
+def combine_scores(edge, motion, blur, scoring_cfg):
+    # Works on floats and on arrays alike.
+    return scoring_cfg.w_edge * (1.0 - edge) + scoring_cfg.w_motion * motion + scoring_cfg.w_blur * blur
+
+
+def edge_energy(frame: np.ndarray) -> float:
+    return edge_energy_from_features(FrameFeatures(frame))
+
+
+def blur_score(frame: np.ndarray) -> float:
+    return blur_score_from_features(FrameFeatures(frame))
+
+
+def motion_inconsistency(prev_frame: np.ndarray, frame: np.ndarray) -> float:
     if prev_frame is None:
         return 0.0
-    prev = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-    cur = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    diff = cv2.absdiff(prev, cur)
-    score = float(np.clip(np.mean(diff) / 255.0, 0, 1))
-    return score
+    prev_gray = FrameFeatures(prev_frame)["gray"]
+    return motion_inconsistency_from_features(FrameFeatures(frame, prev_gray=prev_gray))
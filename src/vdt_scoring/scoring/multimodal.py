@@ -0,0 +1,241 @@
+"""ResNet + CLIP + FFT frame scorer (scripts/real_trustworthiness_inference.py).
+
+torch, torchvision and CLIP are imported when a scorer is built, so the
+frequency score and record helpers work without them.
+"""
+import os
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+PROMPTS = ("a real human face", "a synthetic or fake face")  # the first is "real"
+CLIP_MODEL = "ViT-B/32"
+IMAGE_EXTS = (".jpg", ".png", ".jpeg")
+FFT_MAX_SIDE = 256
+BACKBONE = "resnet18-imagenet-logits"  # what the trust head reads: ResNet-18's 1000 ImageNet logits
+HEAD_FORMAT = 1  # bump when the trust head checkpoint layout changes
+
+
+def frequency_score(gray: np.ndarray, max_side: int = FFT_MAX_SIDE) -> float:
+    """1 - share of spectrum magnitudes above their median (lower high-freq = more natural).
+
+    The gray image is downscaled to `max_side` first and the spectrum is the
+    real-input half (rfft2), which holds every magnitude of the full one. The
+    original 20*log(|F|+1) scale is monotonic, so comparing against the median
+    works on |F| directly.
+    """
+    if max_side and max(gray.shape) > max_side:
+        scale = max_side / max(gray.shape)
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    magnitude = np.abs(np.fft.rfft2(gray.astype(np.float32)))
+    return 1.0 - float(np.mean(magnitude > np.median(magnitude)))
+
+
+def build_record(frame_file: str, trust: float, semantic: float, freq: float) -> Dict:
+    combined = round(float((trust + semantic + freq) / 3), 3)
+    flags = {
+        "manipulated": bool(combined < 0.5),
+        "deepfake_artifact": bool(freq < 0.4),
+        "semantic_inconsistency": bool(semantic < 0.5),
+        "context_loss": bool(trust < 0.3),
+    }
+    return {
+        "frame_id": frame_file,
+        "trustworthiness_score": round(trust, 3),
+        "semantic_score": round(semantic, 3),
+        "frequency_score": round(freq, 3),
+        "combined_score": combined,
+        "ethical_flags": {k: str(v) for k, v in flags.items()},
+        "notes": "ResNet + CLIP + FFT multi-modal trustworthiness assessment",
+    }
+
+
+def list_images(frames_dir: str) -> List[str]:
+    return sorted(f for f in os.listdir(frames_dir) if f.lower().endswith(IMAGE_EXTS))
+
+
+@lru_cache(maxsize=None)
+def load_clip(name: str = CLIP_MODEL, device: str = "cpu"):
+    import clip  # pip install git+https://github.com/openai/CLIP.git
+
+    model, preprocess = clip.load(name, device=device)
+    model.eval()
+    return model, preprocess
+
+
+@lru_cache(maxsize=None)
+def prompt_embeddings(prompts: Tuple[str, ...] = PROMPTS, name: str = CLIP_MODEL, device: str = "cpu"):
+    """L2-normalized CLIP text embeddings, computed once per (prompts, model, device)."""
+    import clip
+    import torch
+
+    model, _ = load_clip(name, device)
+    with torch.inference_mode():
+        text = model.encode_text(clip.tokenize(list(prompts)).to(device))
+    return text / text.norm(dim=-1, keepdim=True)
+
+
+def build_trust_head(in_dim: int = 1000, hidden: int = 256, dropout: float = 0.2):
+    import torch.nn as nn
+
+    return nn.Sequential(
+        nn.Linear(in_dim, hidden),
+        nn.ReLU(),
+        nn.Dropout(dropout),
+        nn.Linear(hidden, 1),
+        nn.Sigmoid(),
+    )
+
+
+def load_trust_head(path: str):
+    """Trust head from a pipeline.train checkpoint (checked against HEAD_FORMAT and BACKBONE)."""
+    import torch
+
+    ckpt = torch.load(path, map_location="cpu")
+    if ckpt.get("format") != HEAD_FORMAT or ckpt.get("backbone") != BACKBONE:
+        raise ValueError(f"{path}: expected a format {HEAD_FORMAT} trust head on {BACKBONE}, "
+                         f"got format {ckpt.get('format')!r} on {ckpt.get('backbone')!r}")
+    head = build_trust_head(**ckpt["arch"])
+    head.load_state_dict(ckpt["state_dict"])
+    head.eval()
+    return head
+
+
+def load_backbone():
+    """Frozen, pretrained ResNet-18."""
+    import torchvision.models as models
+
+    resnet = models.resnet18(pretrained=True)
+    resnet.eval()
+    for param in resnet.parameters():
+        param.requires_grad = False
+    return resnet
+
+
+def load_trust_models(head_path: Optional[str] = None):
+    """Frozen ResNet-18 and the trust head on its 1000 logits (untrained unless head_path is given)."""
+    classifier = load_trust_head(head_path) if head_path else build_trust_head()
+    classifier.eval()
+    return load_backbone(), classifier
+
+
+def backbone_store(feature_store: str, dtype: str = "float16"):
+    """EmbeddingStore of ResNet-18 logits under a feature store root.
+
+    MultiModalScorer(feature_store=...) and pipeline.train both go through
+    here, so a store filled by one is read by the other.
+    """
+    from ..pipeline.embeddings import EmbeddingStore
+
+    return EmbeddingStore(os.path.join(feature_store, "resnet18"), 1000, dtype=dtype, model=BACKBONE)
+
+
+def build_resnet_transform():
+    import torchvision.transforms as transforms
+
+    return transforms.Compose([
+        transforms.Resize((224, 224)),
+        transforms.ToTensor(),
+        transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+    ])
+
+
+class MultiModalScorer:
+    """Scores frames in batches through ResNet (trust head), CLIP and the FFT score.
+
+    Models load once per scorer (CLIP once per process) and the prompt
+    embeddings once per process; each batch runs one forward pass per tower.
+    With `feature_store` (a directory), ResNet logits and CLIP image features
+    are kept in EmbeddingStores under it and only new or changed frames go
+    through the towers. `head_path` loads a trust head trained by
+    pipeline.train instead of the untrained one.
+    """
+
+    def __init__(self, device: Optional[str] = None, batch_size: int = 32, prompts: Sequence[str] = PROMPTS,
+                 clip_model: str = CLIP_MODEL, fft_max_side: int = FFT_MAX_SIDE,
+                 feature_store: Optional[str] = None, head_path: Optional[str] = None):
+        import torch
+
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.batch_size = max(1, batch_size)
+        self.fft_max_side = fft_max_side
+        self.resnet, self.classifier = load_trust_models(head_path)
+        self.resnet.to(self.device)
+        self.classifier.to(self.device)
+        self.resnet_transform = build_resnet_transform()
+        self.clip_model, self.clip_preprocess = load_clip(clip_model, self.device)
+        self.text_features = prompt_embeddings(tuple(prompts), clip_model, self.device)
+        self.stores = None
+        if feature_store:
+            from ..pipeline.embeddings import EmbeddingStore
+
+            dim = int(self.text_features.shape[1])
+            self.stores = (
+                backbone_store(feature_store),
+                EmbeddingStore(os.path.join(feature_store, "clip"), dim, model=f"clip-{clip_model}-image"),
+            )
+
+    def encode(self, images) -> Tuple[np.ndarray, np.ndarray]:
+        """ResNet logits and L2-normalized CLIP image features of PIL images, one pass per tower."""
+        import torch
+
+        with torch.inference_mode():
+            x = torch.stack([self.resnet_transform(im) for im in images]).to(self.device)
+            logits = self.resnet(x)
+            c = torch.stack([self.clip_preprocess(im) for im in images]).to(self.device)
+            feats = self.clip_model.encode_image(c)
+            feats = feats / feats.norm(dim=-1, keepdim=True)
+        return logits.float().cpu().numpy(), feats.float().cpu().numpy()
+
+    def scores(self, logits: np.ndarray, feats: np.ndarray) -> Tuple[List[float], List[float]]:
+        """Trust and semantic scores from encode() outputs."""
+        import torch
+
+        with torch.inference_mode():
+            logits = torch.from_numpy(np.asarray(logits, dtype=np.float32)).to(self.device)
+            trust = self.classifier(logits).squeeze(1)
+            feats = torch.from_numpy(np.asarray(feats, dtype=np.float32)).to(self.device)
+            # Same logits as clip_model(image, tokens), with the text side precomputed
+            sims = self.clip_model.logit_scale.exp().float() * feats @ self.text_features.float().t()
+            semantic = sims.softmax(dim=-1)[:, 0]  # probability of the first ("real") prompt
+        return trust.cpu().tolist(), semantic.cpu().tolist()
+
+    def score_batch(self, images) -> List[Tuple[float, float, float]]:
+        """(trust, semantic, frequency) for each PIL image."""
+        trust, semantic = self.scores(*self.encode(images))
+        freq = [frequency_score(np.asarray(im.convert("L")), self.fft_max_side) for im in images]
+        return list(zip(trust, semantic, freq))
+
+    def _stored_features(self, paths: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        from PIL import Image
+
+        resnet_store, clip_store = self.stores
+        todo = sorted(set(resnet_store.missing(paths)) | set(clip_store.missing(paths)))
+        if todo:
+            logits, feats = self.encode([Image.open(p).convert("RGB") for p in todo])
+            resnet_store.put(todo, logits)
+            clip_store.put(todo, feats)
+        return resnet_store.get(paths), clip_store.get(paths)
+
+    def iter_scores(self, paths: Sequence[str]) -> Iterator[Tuple[str, Tuple[float, float, float]]]:
+        from PIL import Image
+
+        for i in range(0, len(paths), self.batch_size):
+            chunk = paths[i:i + self.batch_size]
+            if self.stores is None:
+                yield from zip(chunk, self.score_batch([Image.open(p).convert("RGB") for p in chunk]))
+                continue
+            trust, semantic = self.scores(*self._stored_features(chunk))
+            freq = []
+            for p in chunk:
+                with Image.open(p) as im:
+                    freq.append(frequency_score(np.asarray(im.convert("L")), self.fft_max_side))
+            yield from zip(chunk, zip(trust, semantic, freq))
+
+    def score_dir(self, frames_dir: str) -> List[Dict]:
+        """Metadata records for the images of `frames_dir`, in file name order."""
+        names = list_images(frames_dir)
+        paths = [os.path.join(frames_dir, n) for n in names]
+        return [build_record(os.path.basename(p), *s) for p, s in self.iter_scores(paths)]
@@ -0,0 +1,80 @@
+from collections import deque
+from typing import List, Optional
+
+from ..config import SegmentCfg
+
+
+class OnlineSegmenter:
+    """Flags runs of suspicious frames from a stream of (index, score) pairs.
+
+    A frame is suspicious when its score is `z_enter` rolling standard
+    deviations above the rolling mean of the last `window` unflagged scores
+    (or above `abs_enter`); a segment stays open until the score falls below
+    `z_exit`. Segments separated by at most `merge_gap` unflagged samples are
+    merged. Memory is O(window) plus the emitted segments.
+    """
+
+    def __init__(self, cfg: Optional[SegmentCfg] = None):
+        self.cfg = cfg or SegmentCfg()
+        self._window: deque = deque(maxlen=max(2, self.cfg.window))
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._n = 0  # samples seen
+        # current segment: [start index, end index, flagged samples, first sample, last sample]
+        self._open: Optional[List[int]] = None
+        self._kept_end = -1  # sample number where the last emitted segment ends
+        self.segments: List[List[int]] = []
+
+    def _push(self, score: float) -> None:
+        if len(self._window) == self._window.maxlen:
+            old = self._window[0]
+            self._sum -= old
+            self._sumsq -= old * old
+        self._window.append(score)
+        self._sum += score
+        self._sumsq += score * score
+
+    def _z(self, score: float) -> Optional[float]:
+        k = len(self._window)
+        if k < self.cfg.min_history:
+            return None
+        mean = self._sum / k
+        var = max(0.0, self._sumsq / k - mean * mean)
+        return (score - mean) / max(var ** 0.5, self.cfg.min_std)
+
+    def _close(self) -> None:
+        start, end, flagged, first, last = self._open
+        self._open = None
+        if flagged < self.cfg.min_samples:
+            return
+        if self.segments and first - self._kept_end - 1 <= self.cfg.merge_gap:
+            self.segments[-1][1] = end
+        else:
+            self.segments.append([start, end])
+        self._kept_end = last
+
+    def update(self, index: int, score: float) -> None:
+        cfg = self.cfg
+        z = self._z(score)
+        above_abs = cfg.abs_enter is not None and score >= cfg.abs_enter
+        if self._open is None:
+            suspicious = above_abs or (z is not None and z >= cfg.z_enter)
+        else:
+            suspicious = above_abs or (z is not None and z >= cfg.z_exit)
+
+        if suspicious:
+            if self._open is None:
+                self._open = [index, index, 0, self._n, self._n]
+            self._open[1] = index
+            self._open[2] += 1
+            self._open[4] = self._n
+        else:
+            if self._open is not None:
+                self._close()
+            self._push(score)  # the baseline only learns from unflagged frames
+        self._n += 1
+
+    def finish(self) -> List[List[int]]:
+        if self._open is not None:
+            self._close()
+        return self.segments
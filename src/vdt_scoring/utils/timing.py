@@ -0,0 +1,102 @@
+import cProfile
+import os
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+
+class StageTimers:
+    """Cumulative wall time, call counts and counters per pipeline stage.
+
+    Timing is per call of a stage (one batch), not per frame. With
+    sample_every=N only every N-th call of a stage is timed and its total is
+    extrapolated from the timed calls; sample_every=0 turns timing off while
+    counters keep working. Each stage must be driven from a single thread.
+    """
+
+    def __init__(self, sample_every: int = 1):
+        self.sample_every = max(0, sample_every)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self._calls: Dict[str, int] = defaultdict(int)
+        self._timed: Dict[str, int] = defaultdict(int)
+        self._seconds: Dict[str, float] = defaultdict(float)
+        self._t0 = perf_counter()
+
+    def _sampled(self, name: str) -> bool:
+        calls = self._calls[name]
+        self._calls[name] = calls + 1
+        return bool(self.sample_every) and calls % self.sample_every == 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self._sampled(name):
+            yield
+            return
+        t0 = perf_counter()
+        try:
+            yield
+        finally:
+            self._seconds[name] += perf_counter() - t0
+            self._timed[name] += 1
+
+    def timed(self, it: Iterable[Any], name: str) -> Iterator[Any]:
+        """Attribute the time spent producing each item of `it` to stage `name`."""
+        it = iter(it)
+        while True:
+            sampled = self._sampled(name)
+            t0 = perf_counter() if sampled else 0.0
+            try:
+                item = next(it)
+            except StopIteration:
+                self._calls[name] -= 1  # the exhausted call is not a stage call
+                return
+            if sampled:
+                self._seconds[name] += perf_counter() - t0
+                self._timed[name] += 1
+            yield item
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def report(self) -> Dict[str, Any]:
+        wall = perf_counter() - self._t0
+        stages = {}
+        for name, calls in self._calls.items():
+            timed = self._timed[name]
+            seconds = self._seconds[name] * calls / timed if timed else None
+            stages[name] = {
+                "calls": calls,
+                "timed_calls": timed,
+                "seconds": round(seconds, 6) if seconds is not None else None,
+                "share": round(seconds / wall, 4) if seconds is not None and wall > 0 else None,
+            }
+        out = {
+            "wall_s": round(wall, 6),
+            "sample_every": self.sample_every,
+            "stages": stages,
+            "counters": dict(self.counters),
+        }
+        frames = self.counters.get("frames")
+        if frames and wall > 0:
+            out["frames_per_s"] = round(frames / wall, 2)
+        return out
+
+
+@contextmanager
+def profiled(path: Optional[str]) -> Iterator[None]:
+    """cProfile the block and dump pstats to `path` (no-op when path is None).
+
+    Only the calling thread is profiled.
+    """
+    if not path:
+        yield
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        prof.dump_stats(path)
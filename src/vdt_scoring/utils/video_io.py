@@ -2,19 +2,118 @@ import cv2
 import numpy as np
 from typing import Iterator, Tuple
 
-def read_frames(path: str, every_nth: int = 5, max_frames: int = 500) -> Iterator[Tuple[int, np.ndarray]]:
+# Sampling strategies for read_frames:
+#   read     - decode every frame, keep every n-th (reference behaviour)
+#   grab     - grab() every frame, retrieve() only the kept ones
+#   seek     - jump straight to each kept frame; pays off for large strides
+#   keyframe - decode keyframes only (requires PyAV); every_nth is ignored
+READ_MODES = ("read", "grab", "seek", "keyframe")
+
+
+def read_frames(
+    path: str, every_nth: int = 5, max_frames: int = 500, mode: str = "grab", ring_size: int = 0
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield (source_frame_index, BGR frame) pairs sampled from a video.
+
+    With ring_size > 0, frames are decoded into a ring of that many reused
+    buffers: a yielded frame is overwritten ring_size frames later, so callers
+    must not hold more than ring_size frames at once. Ignored in keyframe mode.
+    """
+    if mode not in READ_MODES:
+        raise ValueError(f"Unknown read mode '{mode}', expected one of {READ_MODES}")
+    if mode == "keyframe":
+        yield from _read_keyframes(path, max_frames)
+        return
     cap = cv2.VideoCapture(path)
     if not cap.isOpened():
         raise FileNotFoundError(f"Could not open video: {path}")
+    try:
+        ring = _Ring(ring_size)
+        if mode == "seek":
+            yield from _read_seek(cap, every_nth, max_frames, ring)
+        else:
+            yield from _read_sequential(cap, every_nth, max_frames, ring, decode_all=mode == "read")
+    finally:
+        cap.release()
+
+
+class _Ring:
+    """Fixed set of frame buffers handed out in rotation; filled lazily from the first frames."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.bufs = []
+        self.slot = 0
+
+    def target(self):
+        # Buffer for the next kept frame, or None while the ring is still filling.
+        return self.bufs[self.slot] if self.slot < len(self.bufs) else None
+
+    def commit(self, frame):
+        if self.size <= 0:
+            return
+        if self.slot == len(self.bufs):
+            self.bufs.append(frame)
+        self.slot = (self.slot + 1) % self.size
+
+
+def _read_sequential(cap, every_nth, max_frames, ring, decode_all):
     idx = 0
-    grabbed = True
     yielded = 0
-    while grabbed and yielded < max_frames:
-        grabbed, frame = cap.read()
+    while yielded < max_frames:
+        keep = idx % every_nth == 0
+        if keep:
+            grabbed = cap.grab()
+            if grabbed:
+                grabbed, frame = cap.retrieve(ring.target())
+        elif decode_all:
+            # Skipped frames land in the next (not yet handed out) slot.
+            grabbed, _ = cap.read(ring.target())
+        else:
+            grabbed = cap.grab()
         if not grabbed:
             break
-        if idx % every_nth == 0:
+        if keep:
+            ring.commit(frame)
             yield idx, frame
             yielded += 1
         idx += 1
-    cap.release()
+
+
+def _read_seek(cap, every_nth, max_frames, ring):
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    idx = 0
+    yielded = 0
+    while yielded < max_frames and (total <= 0 or idx < total):
+        # Sequential neighbours are cheaper to reach by decoding than by seeking.
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != idx:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+        grabbed, frame = cap.read(ring.target())
+        if not grabbed:
+            break
+        ring.commit(frame)
+        yield idx, frame
+        yielded += 1
+        idx += every_nth
+
+
+def _read_keyframes(path, max_frames):
+    try:
+        import av
+    except ImportError as e:
+        raise ImportError("read mode 'keyframe' requires PyAV (pip install av)") from e
+    try:
+        container = av.open(path)
+    except (OSError, av.FFmpegError) as e:
+        raise FileNotFoundError(f"Could not open video: {path}") from e
+    with container:
+        stream = container.streams.video[0]
+        stream.codec_context.skip_frame = "NONKEY"
+        rate = stream.average_rate or stream.guessed_rate
+        yielded = 0
+        for frame in container.decode(stream):
+            if yielded >= max_frames:
+                break
+            t = frame.time if frame.time is not None else 0.0
+            yield int(round(t * float(rate))), frame.to_ndarray(format="bgr24")
+            yielded += 1
@@ -0,0 +1,39 @@
+import tracemalloc
+
+import numpy as np
+
+from examples.make_synthetic_video import write_synthetic_video
+from src.vdt_scoring.scoring.features import FeatureEngine
+from src.vdt_scoring.scoring.heuristics import HEURISTICS
+from src.vdt_scoring.utils.video_io import read_frames
+
+
+def _peak_growth(step, warmup=3, steps=20):
+    """Bytes allocated above the steady state while running `step` repeatedly."""
+    for _ in range(warmup):
+        step()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        for _ in range(steps):
+            step()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def test_scoring_hot_loop_does_not_allocate_images():
+    h, w = 480, 640
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (h, w, 3), dtype=np.uint8) for _ in range(4)]
+    engine = FeatureEngine(HEURISTICS)
+    growth = _peak_growth(lambda: engine.process_batch(frames))
+    # Any per-frame image allocation (even a uint8 gray) would exceed this.
+    assert growth < h * w // 4
+
+
+def test_frame_ring_does_not_allocate_images(tmp_path):
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=120)
+    it = read_frames(video, every_nth=2, max_frames=10**6, ring_size=3)
+    growth = _peak_growth(lambda: next(it), warmup=5, steps=40)
+    assert growth < 240 * 320 // 4
@@ -0,0 +1,41 @@
+import numpy as np
+from PIL import Image
+
+from scripts.auto_annotate import MEAN, STD, iter_batches, load_image
+
+
+def _frames(tmp_path, n):
+    paths = []
+    for i in range(n):
+        path = tmp_path / f"frame_{i:05d}.jpg"
+        Image.new("RGB", (640, 480), (i * 20, 128, 255 - i * 20)).save(path, quality=95)
+        paths.append(str(path))
+    return paths
+
+
+def test_load_image_normalizes_with_imagenet_stats(tmp_path):
+    (path,) = _frames(tmp_path, 1)
+    arr = load_image(path)
+    assert arr.shape == (224, 224, 3) and arr.dtype == np.float32
+    expected = (np.array([0, 128, 255], dtype=np.float32) / 255 - MEAN) / STD
+    np.testing.assert_allclose(arr[112, 112], expected, atol=0.05)
+
+
+def test_draft_decoding_is_opt_in(tmp_path):
+    path = tmp_path / "big.jpg"
+    rng = np.random.default_rng(0)
+    Image.fromarray(rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8)).save(path, quality=95)
+    with Image.open(path) as image:
+        full = np.asarray(image.convert("RGB").resize((224, 224), Image.BILINEAR), dtype=np.float32)
+    np.testing.assert_allclose(load_image(str(path)), (full / 255 - MEAN) / STD, atol=1e-5)
+    assert not np.allclose(load_image(str(path), draft=True), load_image(str(path)), atol=1e-3)
+
+
+def test_iter_batches_keeps_order_across_workers(tmp_path):
+    paths = _frames(tmp_path, 7)
+    serial = list(iter_batches(paths, batch_size=3, workers=0))
+    pooled = list(iter_batches(paths, batch_size=3, workers=3, prefetch=1))
+    assert [len(p) for p, _ in pooled] == [3, 3, 1]
+    assert [p for chunk, _ in pooled for p in chunk] == paths
+    for (_, a), (_, b) in zip(serial, pooled):
+        np.testing.assert_array_equal(a, b)
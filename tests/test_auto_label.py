@@ -0,0 +1,40 @@
+import json
+import os
+
+from examples.make_synthetic_video import write_synthetic_video
+from scripts.auto_label_tampered_videos import auto_label
+
+
+def _labels(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_auto_label_with_dummy_detector(tmp_path):
+    videos = tmp_path / "videos"
+    videos.mkdir()
+    write_synthetic_video(str(videos / "clip.mp4"), frames=30)
+    out = tmp_path / "labels"
+
+    stats = auto_label(str(videos), str(out), "dummy", stride=4, batch_size=3)
+    assert stats["videos"] == 1 and stats["frames"] == 8
+    rows = _labels(out / "clip" / "labels.jsonl")
+    assert [r["index"] for r in rows] == list(range(0, 30, 4))
+    assert rows[0]["frame"] == "frame_00000.jpg"
+    cls, xc, yc, w, h = rows[0]["boxes"][0]  # the moving square
+    assert cls == 0 and 0 < xc < 1 and abs(w - 40 / 320) < 0.02 and abs(h - 40 / 240) < 0.02
+    images = sorted(os.listdir(out / "clip" / "images"))
+    assert images == [r["frame"] for r in rows]
+
+    mtime = os.stat(out / "clip" / "images" / "frame_00004.jpg").st_mtime_ns
+    auto_label(str(videos), str(out), "dummy", stride=4)
+    assert os.stat(out / "clip" / "images" / "frame_00004.jpg").st_mtime_ns == mtime  # not rewritten
+
+
+def test_auto_label_without_images(tmp_path):
+    videos = tmp_path / "videos"
+    videos.mkdir()
+    write_synthetic_video(str(videos / "clip.mp4"), frames=10)
+    auto_label(str(videos), str(tmp_path / "labels"), "dummy", save_images=False)
+    assert len(_labels(tmp_path / "labels" / "clip" / "labels.jsonl")) == 10
+    assert not (tmp_path / "labels" / "clip" / "images").exists()
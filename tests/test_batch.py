@@ -0,0 +1,32 @@
+import json
+import os
+
+from examples.make_synthetic_video import write_synthetic_video
+from src.vdt_scoring.pipeline.batch import _out_dirs, collect_videos, run_batch
+
+
+def test_collect_videos_from_dir_glob_and_manifest(tmp_path):
+    for name in ("a.mp4", "b.avi", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "list.txt").write_text("# clips\na.mp4\n\nb.avi\n")
+    expected = [str(tmp_path / "a.mp4"), str(tmp_path / "b.avi")]
+    assert collect_videos(str(tmp_path)) == expected
+    assert collect_videos(str(tmp_path / "*.mp4")) == expected[:1]
+    assert collect_videos(str(tmp_path / "list.txt")) == expected
+
+
+def test_run_batch_writes_results_and_index(tmp_path):
+    videos = [write_synthetic_video(str(tmp_path / f"clip{i}.mp4"), frames=20) for i in range(2)]
+    videos.append(str(tmp_path / "missing.mp4"))
+    index = run_batch(videos, str(tmp_path / "out"), workers=2)
+    assert [e["status"] for e in index["entries"]] == ["ok", "ok", "error"]
+    assert os.path.exists(tmp_path / "out" / "clip1" / "results.json")
+    with open(tmp_path / "out" / "index.json", encoding="utf-8") as f:
+        assert json.load(f)["failed"] == 1
+
+
+def test_out_dirs_never_collide_with_suffixed_names():
+    dirs = _out_dirs(["x/a.mp4", "y/a.mp4", "a_1.mp4", "A.mov"], "out")
+    names = [os.path.basename(d) for d in dirs]
+    assert names == ["a", "a_1", "a_1_1", "A_2"]
+    assert len({n.lower() for n in names}) == len(names)
@@ -0,0 +1,14 @@
+from benchmarks.suite import compare
+
+
+def _report(**metrics):
+    return {"cases": [{"id": "240p/60f/mp4v/default", **metrics}]}
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    base = _report(frames_per_s=100.0, total_s=1.0, peak_rss_mb=200.0, output_bytes=1000)
+    new = _report(frames_per_s=85.0, total_s=0.95, peak_rss_mb=205.0, output_bytes=2000)
+    result = compare(base, new, threshold=0.10)
+    flagged = {r["metric"] for r in result["regressions"]}
+    assert flagged == {"frames_per_s", "output_bytes"}
+    assert len(result["compared"]) == 4
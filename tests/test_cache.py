@@ -0,0 +1,61 @@
+import json
+import os
+
+from examples.make_synthetic_video import write_synthetic_video
+from src.vdt_scoring.config import AppCfg
+from src.vdt_scoring.pipeline.cache import ResultCache, score_with_cache, video_fingerprint
+
+
+def test_cache_hits_for_same_content_and_config(tmp_path):
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=20)
+    copy = tmp_path / "copy.mp4"
+    copy.write_bytes(open(video, "rb").read())
+    assert video_fingerprint(video) == video_fingerprint(str(copy))
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    cfg = AppCfg()
+    cfg.output.format = "jsonl"
+    first, hit = score_with_cache(video, str(tmp_path / "a"), cfg, cache)
+    assert not hit
+    again, hit = score_with_cache(str(copy), str(tmp_path / "b"), cfg, cache)
+    assert hit and again["video_path"] == str(copy)
+    assert again["summary"]["performance"]["cache"] == "hit"
+    assert "validation" not in again["summary"]
+    strip = ("performance", "validation")
+    assert {k: v for k, v in again["summary"].items() if k not in strip} == \
+        {k: v for k, v in first["summary"].items() if k not in strip}
+    # Same records, with heatmap paths under the new out_dir
+    heat_a, heat_b = (os.path.join(str(tmp_path / d), "heatmaps") for d in "ab")
+    assert (tmp_path / "b" / "frames.jsonl").read_text() == \
+        (tmp_path / "a" / "frames.jsonl").read_text().replace(heat_a, heat_b)
+
+    cfg.scoring.w_edge = 0.5
+    _, hit = score_with_cache(video, str(tmp_path / "c"), cfg, cache)
+    assert not hit
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_cache_hit_restores_heatmaps_under_new_out_dir(tmp_path):
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=12)
+    cache = ResultCache(str(tmp_path / "cache"))
+    for fmt in ("json", "jsonl"):
+        cfg = AppCfg()
+        cfg.output.format = fmt
+        cfg.output.save_heatmaps = True
+        cfg.output.anonymize_heatmaps = False
+        first, hit = score_with_cache(video, str(tmp_path / fmt / "a"), cfg, cache)
+        assert not hit
+        out = str(tmp_path / fmt / "b")
+        again, hit = score_with_cache(video, out, cfg, cache)
+        assert hit
+        if fmt == "json":
+            frames = again["frames"]
+        else:
+            with open(os.path.join(out, again["frames_file"]), "rb") as f:
+                frames = [json.loads(line) for line in f]
+        paths = [r["heatmap_path"] for r in frames if r["heatmap_path"]]
+        assert paths
+        for p in paths:
+            assert os.path.dirname(p) == os.path.join(out, "heatmaps")
+            with open(p, "rb") as a, open(p.replace(out, str(tmp_path / fmt / "a")), "rb") as b:
+                assert a.read() == b.read()
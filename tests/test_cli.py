@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from examples.make_synthetic_video import write_synthetic_video
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("cv2", "numpy", "jsonschema", "torch", "torchvision", "clip", "ultralytics")
+# Importing the entry point and building its parser; generous against noise,
+# far below what any of HEAVY costs to import.
+IMPORT_BUDGET_S = 0.15
+
+
+def test_entry_point_imports_no_heavy_modules_within_budget():
+    code = (
+        "import sys, time, json\n"
+        "t = time.perf_counter()\n"
+        "import cli\n"
+        "cli.build_parser().format_help()\n"
+        "dt = time.perf_counter() - t\n"
+        f"print(json.dumps([dt, [m for m in {HEAVY!r} if m in sys.modules]]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    seconds, loaded = json.loads(out.stdout)
+    assert loaded == []
+    assert seconds < IMPORT_BUDGET_S
+
+
+def test_score_subcommand_and_legacy_flags(tmp_path, monkeypatch):
+    import cli
+
+    monkeypatch.chdir(ROOT)
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=20)
+    cli.main(["score", "--video", video, "--out", str(tmp_path / "a")])
+    cli.main(["--video", video, "--out", str(tmp_path / "b")])
+    assert (tmp_path / "a" / "results.json").exists() and (tmp_path / "b" / "results.json").exists()
+
+
+def test_script_subcommands_parse_their_own_arguments():
+    import cli
+
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["extract", "--help"])
+    assert exc.value.code == 0
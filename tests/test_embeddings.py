@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.vdt_scoring.pipeline.embeddings import EmbeddingStore
+
+
+def _frames(tmp_path, n):
+    paths = []
+    for i in range(n):
+        path = tmp_path / f"frame_{i:05d}.jpg"
+        path.write_bytes(bytes([i]) * 100)
+        paths.append(str(path))
+    return paths
+
+
+def _encode(calls):
+    def encode(paths):
+        calls.extend(paths)
+        return np.array([[int(os.path.basename(p)[6:11])] * 4 for p in paths], dtype=np.float32)
+    return encode
+
+
+def test_ensure_encodes_only_missing_and_persists(tmp_path):
+    paths = _frames(tmp_path, 5)
+    calls = []
+    store = EmbeddingStore(str(tmp_path / "store"), dim=4, shard_rows=2)
+    out = store.ensure(paths[:3], _encode(calls))
+    assert out.dtype == np.float16 and out[:, 0].tolist() == [0, 1, 2]
+    store.ensure(paths, _encode(calls))
+    assert calls == paths[:3] + paths[3:]
+
+    reopened = EmbeddingStore(str(tmp_path / "store"), dim=4, shard_rows=2)
+    assert reopened.missing(paths) == []
+    assert reopened.get(paths[::-1])[:, 1].tolist() == [4, 3, 2, 1, 0]
+    row = reopened.get_row(paths[4])
+    assert row[0] == 4 and np.shares_memory(row, reopened.shard("0000-00002.npy"))  # zero-copy
+    with pytest.raises(ValueError):
+        EmbeddingStore(str(tmp_path / "store"), dim=8)
+
+
+def test_changed_frames_are_stale_and_compaction_drops_them(tmp_path):
+    paths = _frames(tmp_path, 4)
+    store = EmbeddingStore(str(tmp_path / "store"), dim=4, shard_rows=3)
+    store.ensure(paths, _encode([]))
+    store.put(paths[:1], np.full((1, 4), 9.0))  # supersedes the first row
+    with open(paths[1], "ab") as f:
+        f.write(b"x")
+    assert store.missing(paths) == [paths[1]]
+    assert store.verify() == {"entries": 4, "bad": [], "stale": 1, "ok": True}
+
+    stats = store.compact()
+    assert stats == {"kept": 3, "removed": 1, "shards": 1}
+    assert sorted(f for f in os.listdir(tmp_path / "store") if f.endswith(".npy")) == ["0001-00000.npy"]
+    reopened = EmbeddingStore(str(tmp_path / "store"), dim=4)
+    assert reopened.get([paths[0], paths[3]])[:, 0].tolist() == [9, 3]
+    reopened.ensure(paths, _encode([]))
+    assert reopened.missing(paths) == []
+
+
+def test_verify_detects_corrupt_rows(tmp_path):
+    paths = _frames(tmp_path, 3)
+    store = EmbeddingStore(str(tmp_path / "store"), dim=4)
+    store.ensure(paths, _encode([]))
+    shard = store.shard("0000-00000.npy")
+    shard[1] = 7.0
+    shard.flush()
+    report = EmbeddingStore(str(tmp_path / "store"), dim=4).verify()
+    assert report["bad"] == [os.path.abspath(paths[1])] and not report["ok"]
+    store.compact()
+    assert store.missing(paths) == [paths[1]]
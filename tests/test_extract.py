@@ -0,0 +1,68 @@
+import csv
+import os
+
+from examples.make_synthetic_video import write_synthetic_video
+import pytest
+
+from scripts.extract_frames import extract_frames, frame_folder_names, process_dataset, sample_indices
+
+
+def test_sample_indices_follow_the_true_frame_rate():
+    it = sample_indices(2, 29.97)
+    indices = [next(it) for _ in range(100)]
+    assert indices[:4] == [0, 15, 30, 45]
+    assert indices[-1] == 1484  # ceil(99 * 14.985); an integer step of 14 would be at 1386
+    it = sample_indices(60, 24.0)
+    assert [next(it) for _ in range(3)] == [0, 1, 2]
+
+
+def test_extract_frames_webp(tmp_path):
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=48, fps=24.0)
+    assert extract_frames(video, str(tmp_path / "out"), fps=4, fmt="webp", quality=80) == 8
+    assert sorted(os.listdir(tmp_path / "out"))[:2] == ["frame_00000.webp", "frame_00001.webp"]
+
+
+def test_process_dataset_resumes_from_manifest(tmp_path):
+    videos = tmp_path / "videos"
+    videos.mkdir()
+    for name in ("a", "b"):
+        write_synthetic_video(str(videos / f"{name}.mp4"), frames=30, fps=10.0)
+    out, index = tmp_path / "frames", tmp_path / "frame_index.csv"
+
+    first = process_dataset(str(videos), str(out), fps=2, csv_path=str(index), workers=2)
+    assert first == {"videos": 2, "extracted": 2, "skipped": 0, "failed": 0, "frames": 12}
+    second = process_dataset(str(videos), str(out), fps=2, csv_path=str(index))
+    assert second["extracted"] == 0 and second["skipped"] == 2
+    third = process_dataset(str(videos), str(out), fps=1, csv_path=str(index))
+    assert third["extracted"] == 2 and len(os.listdir(out / "a")) == 3  # stale frames removed
+
+    with open(index, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows == [["video_name", "frame_folder", "num_frames"],
+                    ["a", str(out / "a"), "3"], ["b", str(out / "b"), "3"]]
+
+
+def test_unreadable_video_is_not_recorded_as_done(tmp_path):
+    videos = tmp_path / "videos"
+    videos.mkdir()
+    (videos / "broken.mp4").write_bytes(b"not a video")
+    with pytest.raises(IOError):
+        extract_frames(str(videos / "broken.mp4"), str(tmp_path / "x"))
+    out, index = tmp_path / "frames", tmp_path / "frame_index.csv"
+    for _ in range(2):  # retried, not skipped, on the next run
+        stats = process_dataset(str(videos), str(out), csv_path=str(index))
+        assert stats["failed"] == 1 and stats["skipped"] == 0 and stats["extracted"] == 0
+    assert not (out / "manifest.jsonl").read_text()
+
+
+def test_same_stem_in_different_folders_gets_distinct_frame_folders(tmp_path):
+    videos = tmp_path / "videos"
+    for sub in ("x", "y"):
+        (videos / sub).mkdir(parents=True)
+        write_synthetic_video(str(videos / sub / "a.mp4"), frames=20, fps=10.0)
+    write_synthetic_video(str(videos / "x__a.mp4"), frames=10, fps=10.0)
+    out = tmp_path / "frames"
+    stats = process_dataset(str(videos), str(out), fps=2, csv_path=str(tmp_path / "i.csv"), workers=3)
+    assert stats["frames"] == 4 + 4 + 2
+    assert sorted(d for d in os.listdir(out) if d != "manifest.jsonl") == ["x__a", "x__a_1", "y__a"]
+    assert frame_folder_names(["v/b.mp4", "v/c.mp4"], "v") == ["b", "c"]
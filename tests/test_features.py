@@ -0,0 +1,63 @@
+import numpy as np
+import cv2
+
+from src.vdt_scoring.scoring import features
+from src.vdt_scoring.scoring.features import FeatureEngine
+from src.vdt_scoring.scoring.heuristics import (
+    HEURISTICS,
+    blur_score,
+    edge_energy,
+    motion_inconsistency,
+    score_stack,
+)
+
+
+def _frames(n=3, h=48, w=64):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (h, w, 3), dtype=np.uint8) for _ in range(n)]
+
+
+def test_engine_matches_standalone_heuristics():
+    engine = FeatureEngine(HEURISTICS)
+    prev = None
+    for frame in _frames():
+        feats, values = engine.process(frame)
+        assert values["edge"] == edge_energy(frame)
+        assert values["blur"] == blur_score(frame)
+        assert values["motion"] == motion_inconsistency(prev, frame)
+        prev = frame
+
+
+def test_engine_converts_each_frame_to_gray_once(monkeypatch):
+    calls = []
+    cvt_color = cv2.cvtColor
+
+    def counting_cvt_color(*args, **kwargs):
+        calls.append(1)
+        return cvt_color(*args, **kwargs)
+
+    monkeypatch.setattr(features.cv2, "cvtColor", counting_cvt_color)
+    engine = FeatureEngine(HEURISTICS)
+    for frame in _frames():
+        feats, _ = engine.process(frame)
+        feats["mag"]  # heatmap reuse must not recompute anything
+    assert len(calls) == 3
+
+
+def test_score_stack_matches_per_frame():
+    frames = _frames(5)
+    grays = np.stack([cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) for f in frames])
+    values = score_stack(grays[1:], prev_gray=grays[0])
+    for i, frame in enumerate(frames[1:]):
+        assert values["edge"][i] == edge_energy(frame)
+        assert values["blur"][i] == blur_score(frame)
+        assert np.isclose(values["motion"][i], motion_inconsistency(frames[i], frame))
+
+
+def test_analysis_max_side_scores_downscaled_gray():
+    assert features.pyramid_levels((1080, 1920), 640) == 2
+    assert features.pyramid_levels((1080, 1920), 0) == 0
+    engine = FeatureEngine(HEURISTICS, max_side=32)
+    kept, values = engine.process_batch(_frames(2), retain=[1])
+    assert kept[1]["mag"].shape == (24, 32)
+    assert values["edge"].shape == (2,)
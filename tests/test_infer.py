@@ -0,0 +1,61 @@
+from examples.make_synthetic_video import write_synthetic_video
+from src.vdt_scoring.config import AppCfg
+from src.vdt_scoring.pipeline.infer import infer_video
+
+
+def _scored(results):
+    # Everything except the run's own timings.
+    summary = {k: v for k, v in results["summary"].items() if k != "performance"}
+    return dict(results, summary=summary)
+
+
+def test_batch_size_does_not_change_results(tmp_path):
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=60)
+    runs = []
+    for batch_size in (1, 4, 16):
+        cfg = AppCfg()
+        cfg.scoring.batch_size = batch_size
+        cfg.output.save_heatmaps = False
+        cfg.runtime.validation = "strict"
+        runs.append(_scored(infer_video(video, str(tmp_path / f"bs{batch_size}"), cfg)))
+    assert runs[0]["summary"]["frames_evaluated"] == 12
+    assert runs[0] == runs[1] == runs[2]
+
+
+def test_pipelined_matches_serial(tmp_path):
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=60)
+    runs = []
+    for pipelined in (False, True):
+        cfg = AppCfg()
+        cfg.scoring.batch_size = 3
+        cfg.runtime.pipelined = pipelined
+        runs.append(_scored(infer_video(video, str(tmp_path / "out"), cfg)))
+    assert runs[0] == runs[1]
+
+
+def test_reduced_resolution_heatmaps_keep_frame_size(tmp_path):
+    import cv2
+
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=10)
+    for full_res in (True, False):
+        cfg = AppCfg()
+        cfg.scoring.analysis_max_side = 100
+        cfg.output.heatmap_full_res = full_res
+        results = infer_video(video, str(tmp_path / f"full{full_res}"), cfg)
+        heat = cv2.imread(results["frames"][0]["heatmap_path"])
+        assert heat.shape == (240, 320, 3)
+
+
+def test_performance_block_and_profile(tmp_path):
+    import pstats
+
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=60)
+    cfg = AppCfg()
+    cfg.scoring.batch_size = 4
+    cfg.runtime.profile_path = str(tmp_path / "run.prof")
+    cfg.output.anonymize_heatmaps = True
+    perf = infer_video(video, str(tmp_path / "out"), cfg)["summary"]["performance"]
+    assert set(perf["stages"]) == {"decode", "score", "anonymize", "heatmaps", "output", "validate", "segment"}
+    assert perf["stages"]["score"]["calls"] == 3 and perf["counters"]["frames"] == 12
+    assert perf["counters"]["heatmaps"] == 3
+    assert pstats.Stats(cfg.runtime.profile_path).total_calls > 0
@@ -0,0 +1,54 @@
+import csv
+import os
+
+from scripts.merge_dataset_for_training import DirIndex, main
+from src.vdt_scoring.pipeline.shards import samples_from_unified
+
+
+def _tree(tmp_path):
+    for root, videos in (("auth", ("a", "b")), ("tamp", ("a__variant_1/frames", "b__variant_1/frames"))):
+        for video in videos:
+            d = tmp_path / root / video
+            d.mkdir(parents=True)
+            for i in range(5):
+                (d / f"frame_{i:05d}.jpg").write_bytes(f"{root}{video}{i}".encode())
+    return ["--auth_root", str(tmp_path / "auth"), "--tamper_root", str(tmp_path / "tamp")]
+
+
+def _files(out, kind):
+    return sorted(f for s in ("train", "val", "test") for f in os.listdir(out / s / kind))
+
+
+def test_hardlink_merge_is_incremental(tmp_path):
+    args = _tree(tmp_path) + ["--out_root", str(tmp_path / "out"), "--mode", "hardlink", "--workers", "4"]
+    assert main(args) == {"hardlink": 20}
+    out = tmp_path / "out"
+    assert len(_files(out, "images")) == 20 and len(_files(out, "labels")) == 20
+    with open(out / "manifest.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    first = rows[0]
+    assert os.path.samefile(out / first["path"], first["source"])
+    with open(out / first["split"] / "labels" / (os.path.splitext(os.path.basename(first["path"]))[0] + ".txt")) as f:
+        assert f.read() == first["label"]
+
+    assert main(args) == {"kept": 20}  # same split, nothing relinked
+    index = DirIndex(out / ".dir_index.json")
+    index.images(tmp_path / "auth")
+    assert index.listed == 0  # every directory answered from the cache
+
+    (tmp_path / "tamp" / "a__variant_1" / "frames" / "frame_00000.jpg").unlink()
+    main(args)
+    assert len(_files(out, "images")) == 18  # balanced again, stale files removed
+
+
+def test_manifest_mode_copies_nothing(tmp_path):
+    args = _tree(tmp_path) + ["--out_root", str(tmp_path / "out"), "--mode", "manifest"]
+    assert main(args) == {}
+    assert sorted(os.listdir(tmp_path / "out")) == [".dir_index.json", "manifest.csv"]
+    with open(tmp_path / "out" / "manifest.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 20 and all(r["path"] == r["source"] for r in rows)
+    assert {r["split"] for r in rows} == {"train", "val", "test"}
+    samples = [s for split in ("train", "val", "test") for s in samples_from_unified(str(tmp_path / "out"), split)]
+    assert len({name for name, _, _ in samples}) == 20  # named by rel_slug, not the frame file name
+    assert all("__" in name for name, _, _ in samples)
@@ -0,0 +1,30 @@
+import numpy as np
+
+from src.vdt_scoring.scoring.multimodal import build_record, frequency_score
+
+
+def _reference_score(gray):
+    # The per-frame score before it moved to rfft2 on a bounded image
+    spectrum = 20 * np.log(np.abs(np.fft.fftshift(np.fft.fft2(gray))) + 1)
+    return 1 - np.mean(spectrum > np.median(spectrum))
+
+
+def test_frequency_score_matches_full_fft_on_unscaled_input():
+    gray = np.random.default_rng(0).integers(0, 256, (96, 128)).astype(np.uint8)
+    assert abs(frequency_score(gray, max_side=0) - _reference_score(gray)) < 0.01
+
+
+def test_frequency_score_bounds_image_size():
+    gray = np.random.default_rng(1).integers(0, 256, (1080, 1920)).astype(np.uint8)
+    score = frequency_score(gray, max_side=256)
+    assert 0.0 <= score <= 1.0
+    assert abs(score - _reference_score(gray)) < 0.05
+
+
+def test_build_record_flags():
+    record = build_record("frame_00001.jpg", trust=0.2, semantic=0.9, freq=0.3)
+    assert record["combined_score"] == round((0.2 + 0.9 + 0.3) / 3, 3)
+    assert record["ethical_flags"] == {
+        "manipulated": "True", "deepfake_artifact": "True",
+        "semantic_inconsistency": "False", "context_loss": "True",
+    }
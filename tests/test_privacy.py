@@ -0,0 +1,84 @@
+import numpy as np
+
+from examples.make_synthetic_video import write_synthetic_video
+from src.vdt_scoring.config import AppCfg
+from src.vdt_scoring.pipeline.infer import infer_video
+from src.vdt_scoring.privacy import face_blur
+from src.vdt_scoring.privacy.face_blur import FaceAnonymizer, blur_faces, load_cascade
+
+
+def _frame(x):
+    rng = np.random.default_rng(0)
+    frame = np.zeros((240, 320, 3), np.uint8)
+    frame[100:160, x:x + 60] = rng.integers(0, 255, (60, 60, 1), dtype=np.uint8)
+    return frame
+
+
+def test_cascade_is_loaded_once():
+    load_cascade.cache_clear()
+    frame = _frame(50)
+    blur_faces(frame)
+    blur_faces(frame)
+    assert load_cascade.cache_info().misses == 1
+
+
+def test_anonymizer_detects_every_k_and_tracks_between():
+    calls = []
+
+    def detector(gray):
+        calls.append(gray.shape)
+        return [(50, 100, 60, 60)] if len(calls) == 1 else []
+
+    anon = FaceAnonymizer(detect_every=3, max_side=0, pad=0.0, detector=detector)
+    assert anon.boxes(_frame(50)) == [(50, 100, 60, 60)]
+    x, y, w, h = anon.boxes(_frame(56))[0]
+    assert abs(x - 56) <= 1 and abs(y - 100) <= 1 and (w, h) == (60, 60)
+    anon.boxes(_frame(62))
+    assert anon.detections == 1
+    assert anon.boxes(_frame(68)) == [] and anon.detections == 2
+
+
+def _face_detector(gray):
+    # The textured square of _frame, wherever it is
+    ys, xs = np.nonzero(gray)
+    return [(int(xs.min()), int(ys.min()), 60, 60)] if len(xs) else []
+
+
+def test_face_appearing_between_detections_is_found_when_forced():
+    anon = FaceAnonymizer(detect_every=5, max_side=0, pad=0.0, detector=_face_detector)
+    blank = np.zeros((240, 320, 3), np.uint8)
+    assert anon.boxes(blank) == [] and anon.detections == 1
+    assert anon.boxes(blank) == []
+    assert anon.boxes(_frame(50)) == []  # tracked frame: the new face is not seen
+    assert anon.boxes(_frame(50), detect=True) == [(50, 100, 60, 60)]
+    assert anon.detections == 2
+
+
+def test_missed_detection_keeps_tracked_box_for_detect_every_frames():
+    found = iter([[(50, 100, 60, 60)], [], []])
+    anon = FaceAnonymizer(detect_every=3, max_side=0, pad=0.0, detector=lambda gray: next(found))
+    anon.boxes(_frame(50))
+    assert len(anon.boxes(_frame(50), detect=True)) == 1  # missed after 1 frame: kept
+    anon.boxes(_frame(50))
+    assert anon.boxes(_frame(50)) == []  # missed again 3 frames after the detection
+
+
+def test_infer_detects_faces_on_every_heatmap_frame(tmp_path, monkeypatch):
+    calls = []
+
+    def detector(gray):
+        calls.append(gray.shape)
+        return [(0, 0, 8, 8)]
+
+    monkeypatch.setattr(face_blur, "detect_faces", detector)
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=20)
+    cfg = AppCfg()
+    cfg.sampler.every_nth = 1
+    cfg.scoring.batch_size = 3
+    cfg.output.save_every_n = 5
+    cfg.output.anonymize_heatmaps = True
+    cfg.output.face_detect_every = 100  # one scheduled detection, on the first frame
+    results = infer_video(video, str(tmp_path / "out"), cfg)
+    heatmaps = [r for r in results["frames"] if r["heatmap_path"]]
+    assert len(heatmaps) == 4 and len(calls) == 4
+    assert results["summary"]["performance"]["counters"]["faces"] == 4
@@ -0,0 +1,35 @@
+from examples.make_synthetic_video import write_synthetic_video
+from src.vdt_scoring.config import AppCfg, SamplerCfg
+from src.vdt_scoring.pipeline.infer import infer_video
+from src.vdt_scoring.pipeline.sampling import AdaptiveSampler
+
+
+def test_adaptive_sampler_densifies_around_injected_events(tmp_path):
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=240)
+    sampler = AdaptiveSampler(video, SamplerCfg(coarse_every=15, fine_every=2))
+    indices = [i for i, _ in sampler]
+    assert indices == sorted(set(indices))
+    assert set(range(0, 240, sampler.stride)) <= set(indices)  # every coarse sample
+    # blur burst in frames 41-59 and the jump after frame 80
+    assert any(s < 59 and e > 41 for s, e in sampler.dense)
+    assert any(s <= 80 < e for s, e in sampler.dense)
+    assert sum(41 <= i <= 59 for i in indices) > 2
+    assert len(indices) < 240 // 5
+
+
+def test_adaptive_sampler_respects_budget_and_spans_video(tmp_path):
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=240)
+    sampler = AdaptiveSampler(video, SamplerCfg(max_frames=20, coarse_every=5))
+    indices = [i for i, _ in sampler]
+    assert len(indices) <= 20 and sampler.stride == 24
+    assert indices[-1] >= 200
+
+
+def test_infer_with_adaptive_sampling(tmp_path):
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=120)
+    cfg = AppCfg()
+    cfg.sampler.adaptive = True
+    cfg.runtime.validation = "strict"
+    results = infer_video(video, str(tmp_path / "out"), cfg)
+    index = [f["index"] for f in results["frames"]]
+    assert index == sorted(index) and results["summary"]["frames_evaluated"] == len(index)
@@ -1,14 +1,27 @@
-import json
-from jsonschema import validate
-import jsonschema
+import pytest
+
+from src.vdt_scoring.schemas.validation import ResultsValidator, ValidationError, validate_results
+
 
 def test_results_schema():
-    from src.vdt_scoring.schemas import results_schema
     sample = {
         "video_path": "x.mp4",
         "summary": {"global_score": 0.5, "frames_evaluated": 1, "flagged_segments": []},
         "frames": [{"index": 0, "score": 0.3, "explanations": [], "heatmap_path": None}],
     }
-    with open(results_schema.__file__.replace("__init__.py", "results_schema.json"), "r", encoding="utf-8") as f:
-        schema = json.load(f)
-    validate(instance=sample, schema=schema)
+    validate_results(sample)
+
+
+def test_sampled_validation_collects_and_strict_raises():
+    records = [{"index": i, "score": 0.5} for i in range(10)]
+    records[4]["score"] = 2.0
+    sampled = ResultsValidator("sampled", sample_every=4)
+    sampled.records(records)
+    assert sampled.checked == 3 and sampled.errors and sampled.errors[0].startswith("frames/4/score")
+
+    strict = ResultsValidator("strict")
+    with pytest.raises(ValidationError):
+        strict.records(records)
+    summary_only = ResultsValidator("summary")
+    summary_only.records(records)
+    assert summary_only.checked == 0 and not summary_only.errors
@@ -0,0 +1,38 @@
+from examples.make_synthetic_video import write_synthetic_video
+from src.vdt_scoring.config import AppCfg, SegmentCfg
+from src.vdt_scoring.pipeline.infer import infer_video
+from src.vdt_scoring.scoring.segments import OnlineSegmenter
+
+
+def _run(scores, **cfg):
+    seg = OnlineSegmenter(SegmentCfg(**cfg))
+    for i, s in enumerate(scores):
+        seg.update(i * 5, s)
+    return seg.finish()
+
+
+def test_hysteresis_and_merging():
+    base = [0.5, 0.51, 0.49, 0.5, 0.5, 0.51, 0.49, 0.5]
+    # enter at 0.6, stay open through 0.53 (above z_exit), close at 0.5
+    assert _run(base + [0.6, 0.53, 0.5, 0.5]) == [[40, 45]]
+    # two bursts one unflagged sample apart merge; further apart they do not
+    assert _run(base + [0.6, 0.5, 0.6, 0.5], merge_gap=1) == [[40, 50]]
+    assert _run(base + [0.6, 0.5, 0.6, 0.5], merge_gap=0) == [[40, 40], [50, 50]]
+    # a segment still open at the end is closed by finish()
+    assert _run(base + [0.7, 0.7]) == [[40, 45]]
+    assert _run(base + [0.7], min_samples=2) == []
+
+
+def test_window_memory_is_bounded():
+    seg = OnlineSegmenter(SegmentCfg(window=8))
+    for i in range(1000):
+        seg.update(i, 0.5)
+    assert len(seg._window) == 8 and seg.finish() == []
+
+
+def test_infer_flags_injected_blur(tmp_path):
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=120)
+    cfg = AppCfg()
+    cfg.output.save_heatmaps = False
+    segments = infer_video(video, str(tmp_path / "out"), cfg)["summary"]["flagged_segments"]
+    assert segments and all(40 <= s <= e <= 60 for s, e in segments)
@@ -0,0 +1,50 @@
+import tarfile
+
+import cv2
+import numpy as np
+
+from src.vdt_scoring.pipeline.shards import ShardDataset, pack_split, samples_from_unified
+
+
+def _unified(tmp_path, n=30):
+    rng = np.random.default_rng(0)
+    root = tmp_path / "unified"
+    (root / "train" / "images").mkdir(parents=True)
+    (root / "train" / "labels").mkdir(parents=True)
+    for i in range(n):
+        cv2.imwrite(str(root / "train" / "images" / f"v__frame_{i:05d}.jpg"),
+                    rng.integers(0, 255, (32, 32, 3), dtype=np.uint8))
+        (root / "train" / "labels" / f"v__frame_{i:05d}.txt").write_text(str(i % 2))
+    return root
+
+
+def test_pack_and_random_access(tmp_path):
+    root = _unified(tmp_path)
+    samples = samples_from_unified(str(root), "train")
+    info = pack_split(samples, str(tmp_path / "packed"), "train", shard_bytes=8 << 10)
+    assert info["samples"] == 30 and len(info["shards"]) > 2
+
+    ds = ShardDataset(str(tmp_path / "packed"), "train")
+    assert len(ds) == 30 and ds.labels.tolist() == [i % 2 for i in range(30)]
+    for i in (0, 17, 29):
+        assert ds[i] == ((root / "train" / "images" / ds.names[i]).read_bytes(), i % 2)
+    frame, label = ShardDataset(str(tmp_path / "packed"), "train", decode=True)[3]
+    assert frame.shape == (32, 32, 3) and label == 1
+    with tarfile.open(tmp_path / "packed" / info["shards"][0]) as tar:  # plain tar
+        assert tar.extractfile(tar.getmembers()[0]).read() == ds[0][0]
+
+
+def test_streams_cover_every_sample_once(tmp_path):
+    root = _unified(tmp_path)
+    pack_split(samples_from_unified(str(root), "train"), str(tmp_path / "packed"), "train", shard_bytes=8 << 10)
+    ds = ShardDataset(str(tmp_path / "packed"), "train")
+    everything = sorted(ds[i][0] for i in range(len(ds)))
+
+    assert [d for d, _ in ds.stream()] == [ds[i][0] for i in range(len(ds))]
+    shuffled = [d for d, _ in ds.stream(shuffle=True, seed=1, buffer_size=8)]
+    assert sorted(shuffled) == everything and shuffled != [ds[i][0] for i in range(len(ds))]
+    assert shuffled == [d for d, _ in ds.stream(shuffle=True, seed=1, buffer_size=8)]
+
+    parts = [[d for d, _ in ds.stream(worker_id=w, num_workers=3)] for w in range(3)]
+    assert sorted(sum(parts, [])) == everything
+    assert sorted(d for d, _ in ds.parallel_stream(num_workers=3, shuffle=True)) == everything
@@ -0,0 +1,30 @@
+import pytest
+
+from src.vdt_scoring.pipeline.stages import run_pipelined
+
+
+def test_run_pipelined_keeps_order():
+    out = []
+    run_pipelined(range(100), lambda x: x * 2, out.append, queue_size=1)
+    assert out == [x * 2 for x in range(100)]
+
+
+@pytest.mark.parametrize("stage", ["source", "transform", "sink"])
+def test_run_pipelined_propagates_errors(stage):
+    def source():
+        for i in range(50):
+            if stage == "source" and i == 10:
+                raise RuntimeError(stage)
+            yield i
+
+    def transform(x):
+        if stage == "transform" and x == 10:
+            raise RuntimeError(stage)
+        return x
+
+    def sink(x):
+        if stage == "sink" and x == 10:
+            raise RuntimeError(stage)
+
+    with pytest.raises(RuntimeError, match=stage):
+        run_pipelined(source(), transform, sink, queue_size=2)
@@ -0,0 +1,49 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+from scripts.randomized_tamper_variants import generate_variants_for_all_videos
+
+META_KEYS = {"variant_of", "variant_id", "created_at", "tamper_spec", "num_input_frames", "num_output_frames",
+             "skipped_frames_count", "crop_box", "jpeg_quality", "failed_frames"}
+
+
+def _frame_root(tmp_path):
+    rng = np.random.default_rng(0)
+    root = tmp_path / "frames"
+    for video in ("a", "b", "c"):
+        (root / video).mkdir(parents=True)
+        for i in range(16):
+            cv2.imwrite(str(root / video / f"frame_{i:05d}.jpg"), rng.integers(0, 255, (48, 64, 3), dtype=np.uint8))
+    return str(root)
+
+
+def _outputs(out_root):
+    files = {}
+    for dirpath, _, names in os.walk(out_root):
+        for name in names:
+            if name.endswith(".jpg"):
+                with open(os.path.join(dirpath, name), "rb") as f:
+                    files[os.path.relpath(os.path.join(dirpath, name), out_root)] = f.read()
+    return files
+
+
+def test_variants_are_reproducible_across_worker_counts(tmp_path):
+    root = _frame_root(tmp_path)
+    serial = generate_variants_for_all_videos(root, str(tmp_path / "s"), n_variants=4, workers=1, encode_threads=1)
+    pooled = generate_variants_for_all_videos(root, str(tmp_path / "p"), n_variants=4, workers=2, encode_threads=3)
+    assert [e["variant"] for e in serial] == [e["variant"] for e in pooled]
+    assert len(serial) == 12 and {e["video"] for e in serial} == {"a", "b", "c"}
+    assert _outputs(tmp_path / "s") == _outputs(tmp_path / "p")
+
+    for entry in serial:
+        meta = entry["metadata"]
+        assert set(meta) == META_KEYS and meta["failed_frames"] == []
+        assert meta["num_output_frames"] == 16 - meta["skipped_frames_count"]
+        assert ("crop_ratio" in meta["tamper_spec"]) == (meta["crop_box"] is not None)
+        folder = tmp_path / "s" / entry["variant"]
+        with open(folder / "metadata.json") as f:
+            assert json.load(f)["tamper_spec"] == meta["tamper_spec"]
+        assert len(os.listdir(folder / "frames")) == meta["num_output_frames"]
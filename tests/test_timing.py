@@ -0,0 +1,26 @@
+import time
+
+from src.vdt_scoring.utils.timing import StageTimers
+
+
+def test_sampled_stage_totals_are_extrapolated():
+    timers = StageTimers(sample_every=4)
+    for _ in range(8):
+        with timers.stage("work"):
+            time.sleep(0.002)
+    for _ in timers.timed(range(5), "source"):
+        pass
+    report = timers.report()
+    work = report["stages"]["work"]
+    assert work["calls"] == 8 and work["timed_calls"] == 2
+    assert work["seconds"] >= 8 * 0.002 * 0.9
+    assert report["stages"]["source"]["calls"] == 5
+
+
+def test_disabled_timing_keeps_counters():
+    timers = StageTimers(sample_every=0)
+    with timers.stage("work"):
+        timers.count("frames", 3)
+    report = timers.report()
+    assert report["stages"]["work"]["seconds"] is None
+    assert report["counters"] == {"frames": 3}
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from src.vdt_scoring.pipeline.embeddings import EmbeddingStore
+from src.vdt_scoring.pipeline.train import FEATURE_DIM, split_features
+from src.vdt_scoring.scoring.multimodal import BACKBONE, backbone_store
+
+
+def _unified(tmp_path):
+    root = tmp_path / "unified"
+    for split, n in (("train", 40), ("val", 10), ("test", 10)):
+        (root / split / "images").mkdir(parents=True)
+        (root / split / "labels").mkdir(parents=True)
+        for i in range(n):
+            (root / split / "images" / f"{split}_{i:03d}.jpg").write_bytes(bytes([i % 2, i]))
+            (root / split / "labels" / f"{split}_{i:03d}.txt").write_text(str(i % 2))
+    return root
+
+
+def _fake_encoder(calls):
+    # Feature 0 carries the label, the rest is noise
+    rng = np.random.default_rng(0)
+
+    def encode(paths):
+        calls.append(len(paths))
+        x = rng.normal(size=(len(paths), FEATURE_DIM)).astype(np.float32)
+        with_label = [open(p, "rb").read()[0] for p in paths]
+        x[:, 0] = np.where(np.array(with_label) == 1, 3.0, -3.0)
+        return x
+    return encode
+
+
+def test_split_features_are_cached(tmp_path):
+    root = _unified(tmp_path)
+    store = EmbeddingStore(str(tmp_path / "features"), FEATURE_DIM)
+    calls = []
+    x, y = split_features(str(root), "train", store, _fake_encoder(calls))
+    assert x.shape == (40, FEATURE_DIM) and y.tolist() == [i % 2 for i in range(40)]
+    again, _ = split_features(str(root), "train", store, _fake_encoder(calls))
+    assert calls == [40] and np.array_equal(x, again)
+
+
+def test_training_features_land_where_the_scorer_reads_them(tmp_path):
+    root = _unified(tmp_path)
+    store = backbone_store(str(tmp_path / "features"))
+    assert store.directory == str(tmp_path / "features" / "resnet18") and store.meta["model"] == BACKBONE
+    calls = []
+    split_features(str(root), "val", store, _fake_encoder(calls))
+    again = backbone_store(str(tmp_path / "features"))  # as MultiModalScorer(feature_store=...) opens it
+    assert not again.missing([str(p) for p in (root / "val" / "images").iterdir()])
+
+
+def test_train_head_checkpoint_loads_for_inference(tmp_path):
+    pytest.importorskip("torch")
+    import torch
+
+    from src.vdt_scoring.pipeline.train import train_from_unified
+    from src.vdt_scoring.scoring.multimodal import load_trust_head
+
+    root = _unified(tmp_path)
+    metrics = train_from_unified(str(root), str(tmp_path / "head.pt"), epochs=15, batch_size=8,
+                                 encode=_fake_encoder([]))
+    assert metrics["samples"] == {"train": 40, "val": 10, "test": 10}
+    assert metrics["test"]["accuracy"] == 1.0
+    head = load_trust_head(str(tmp_path / "head.pt"))
+    x = torch.zeros(2, FEATURE_DIM)
+    x[:, 0] = torch.tensor([3.0, -3.0])
+    assert head(x).squeeze(1).tolist()[0] > 0.5 > head(x).squeeze(1).tolist()[1]
@@ -5,3 +5,15 @@ def test_read_frames_missing():
     import pytest
     with pytest.raises(FileNotFoundError):
         list(read_frames("nope.mp4"))
+
+def test_read_modes_report_source_indices(tmp_path):
+    import numpy as np
+    from examples.make_synthetic_video import write_synthetic_video
+
+    video = write_synthetic_video(str(tmp_path / "clip.mp4"), frames=40)
+    ref = list(read_frames(video, every_nth=7, mode="read"))
+    assert [i for i, _ in ref] == [0, 7, 14, 21, 28, 35]
+    for mode in ("grab", "seek"):
+        out = list(read_frames(video, every_nth=7, mode=mode))
+        assert [i for i, _ in out] == [i for i, _ in ref]
+        assert all(np.array_equal(a, b) for (_, a), (_, b) in zip(out, ref))
@@ -0,0 +1,36 @@
+import json
+
+import numpy as np
+
+from src.vdt_scoring.pipeline.writers import ResultsWriter
+
+SUMMARY = {"global_score": 0.5, "frames_evaluated": 3, "flagged_segments": []}
+
+
+def _records(start, n):
+    idx = list(range(start, start + n))
+    recs = [{"index": i, "score": 0.5, "explanations": [], "heatmap_path": None} for i in idx]
+    cols = {"index": idx, "score": [0.5] * n, "edge": [0.1] * n, "blur": [0.2] * n, "motion": [0.3] * n}
+    return recs, cols
+
+
+def test_jsonl_writer_streams_frames_and_columns(tmp_path):
+    with ResultsWriter(str(tmp_path), "x.mp4", fmt="jsonl", columnar="npz") as w:
+        w.write(*_records(0, 2))
+        w.write(*_records(2, 1))
+        results = w.close(SUMMARY)
+    assert "frames" not in results and results["frames_file"] == "frames.jsonl"
+    with open(tmp_path / "results.json", encoding="utf-8") as f:
+        assert json.load(f) == results
+    with open(tmp_path / "frames.jsonl", encoding="utf-8") as f:
+        assert [json.loads(line)["index"] for line in f] == [0, 1, 2]
+    cols = np.load(tmp_path / "frames.npz")
+    assert cols["index"].tolist() == [0, 1, 2] and cols["motion"].shape == (3,)
+
+
+def test_json_writer_keeps_legacy_layout(tmp_path):
+    with ResultsWriter(str(tmp_path), "x.mp4") as w:
+        w.write(*_records(0, 3))
+        results = w.close(SUMMARY)
+    assert [f["index"] for f in results["frames"]] == [0, 1, 2]
+    assert not (tmp_path / "frames.jsonl").exists()